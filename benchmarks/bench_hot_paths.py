@@ -0,0 +1,215 @@
+"""
+Microbenchmarks for the agent's pre-/post-model hot paths.
+
+    python benchmarks/bench_hot_paths.py --sizes 10,1000,100000 --output bench.json
+    python benchmarks/bench_hot_paths.py --compare bench.json   # exit 1 on regression
+
+Every timing is the best of `--repeat` runs; results are JSON so runs from
+different commits can be diffed.
+"""
+from __future__ import annotations
+
+import argparse, json, platform, subprocess, sys, tempfile, time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from profile_summarizer_agent import ProfileSummarizerAgent, load_config
+
+# ─── record shapes ------------------------------------------------------
+NARROW_KEYS = ["First_Name", "Age", "Gender", "Location"]
+WIDE_EXTRA = 36
+
+
+def make_record(i: int, shape: str) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {
+        "First_Name": f"  Person{i}  ",
+        "Age": 20 + i % 50,
+        "Gender": " female " if i % 2 else " male ",
+        "Location": f" City {i % 97} ",
+    }
+    if shape == "wide":
+        for j in range(WIDE_EXTRA):
+            rec[f"Attr_{j:02d}"] = (
+                [f" item{j}a ", f" item{j}b "] if j % 4 == 0 else f"  value {i}-{j}  "
+            )
+    return rec
+
+
+def make_agent() -> ProfileSummarizerAgent:
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="bench", prompt="Summarise attributes.", backend="fake"
+    )
+    agent._call_model = lambda block: "User attributes:\n...\n\nSummary: ok"  # type: ignore[attr-defined]
+    return agent
+
+
+def best_of(repeat: int, fn: Callable[[], Any], setup: Callable[[], Any] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        setup()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ─── benchmarks ---------------------------------------------------------
+def bench_records(size: int, shape: str, repeat: int) -> List[Dict[str, Any]]:
+    agent = make_agent()
+    raw = [make_record(i, shape) for i in range(size)]
+    normalized = [agent._normalize_record(r, True, True) for r in raw]
+    replies = [
+        f"User attributes:\nname: p{i}\n\nSummary: Person{i} is here." for i in range(size)
+    ]
+
+    def normalize() -> None:
+        norm = agent._normalize_record
+        for r in raw:
+            norm(r, True, True)
+
+    def build() -> None:
+        agent._build_prompt_body(normalized)
+
+    def postprocess() -> None:
+        post = agent._postprocess_summary
+        for r in replies:
+            post(r)
+
+    def refill() -> None:
+        agent.inputs.clear()
+        agent.inputs.extend(normalized)
+
+    out = []
+    for name, fn, setup in (
+        ("normalize_record", normalize, lambda: None),
+        ("build_prompt_body", build, lambda: None),
+        ("postprocess_summary", postprocess, lambda: None),
+        ("process_end_to_end", agent.process, refill),
+    ):
+        seconds = best_of(repeat, fn, setup)
+        out.append({
+            "bench": name,
+            "size": size,
+            "shape": shape,
+            "seconds": seconds,
+            "ns_per_record": seconds / size * 1e9,
+        })
+    return out
+
+
+def bench_load_config(repeat: int, loops: int = 200) -> List[Dict[str, Any]]:
+    out = []
+    with tempfile.TemporaryDirectory() as tmp:
+        d = Path(tmp)
+        (d / "prompt.txt").write_text("You are a benchmark prompt.", encoding="utf-8")
+        prompt = f"@@{(d / 'prompt.txt').as_posix()}"
+        files = {
+            "json": ("config.json", json.dumps({"temp": 0.1, "model_name": "m", "prompt": prompt})),
+            "yaml": ("config.yaml", f"temp: 0.1\nmodel_name: m\nprompt: \"{prompt}\"\n"),
+            "ini": ("config.ini", f"[DEFAULT]\ntemp = 0.1\nmodel_name = m\nprompt = {prompt}\n"),
+            "txt": ("config.txt", f"temp=0.1\nmodel_name=m\nprompt={prompt}\n"),
+            "pointer": ("pointer.json", '"@@config.txt"'),
+        }
+        for fmt, (name, body) in files.items():
+            (d / name).write_text(body, encoding="utf-8")
+        for fmt, (name, _) in files.items():
+            path = d / name
+            try:
+                load_config(path)
+            except ImportError:  # e.g. YAML without pyyaml
+                continue
+
+            def run() -> None:
+                for _ in range(loops):
+                    load_config(path)
+
+            seconds = best_of(repeat, run)
+            out.append({
+                "bench": "load_config",
+                "format": fmt,
+                "seconds": seconds,
+                "ns_per_call": seconds / loops * 1e9,
+            })
+    return out
+
+
+# ─── reporting ----------------------------------------------------------
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(row: Dict[str, Any]) -> str:
+    return "/".join(str(row.get(k, "")) for k in ("bench", "size", "shape", "format"))
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Return one line per benchmark that got slower than `threshold`x."""
+    before = {result_key(r): r["seconds"] for r in old["results"]}
+    regressions = []
+    for row in new["results"]:
+        base = before.get(result_key(row))
+        if base and row["seconds"] > base * threshold:
+            regressions.append(
+                f"{result_key(row)}: {base:.6f}s -> {row['seconds']:.6f}s "
+                f"({row['seconds'] / base:.2f}x)"
+            )
+    return regressions
+
+
+def run(sizes: List[int], shapes: List[str], repeat: int) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for shape in shapes:
+        for size in sizes:
+            results.extend(bench_records(size, shape, repeat))
+    results.extend(bench_load_config(repeat))
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,1000,100000",
+                        help="comma-separated record counts (up to 1000000)")
+    parser.add_argument("--shapes", default="narrow,wide", help="narrow and/or wide")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(
+        [int(s) for s in args.sizes.split(",")],
+        args.shapes.split(","),
+        args.repeat,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(json.loads(Path(args.compare).read_text("utf-8")), report, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
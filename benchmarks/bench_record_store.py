@@ -0,0 +1,85 @@
+"""
+Memory footprint of the queued-profile store: list of dicts vs RecordStore.
+
+    python benchmarks/bench_record_store.py --sizes 10000,100000 --output mem.json
+"""
+from __future__ import annotations
+
+import argparse, gc, json, tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from profile_summarizer.record_store import RecordStore
+from profile_summarizer_agent import normalize_record
+
+OPTIONAL = ("pronouns", "company", "industry", "recent_win")
+
+
+def make_record(i: int, shape: str) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {
+        "First_Name": f" Person{i} ",
+        "Age": 20 + i % 50,
+        "Gender": "female" if i % 2 else "male",
+        "Location": f"City {i % 97}",
+        "Hobbies": ["cycling", "cooking"],
+    }
+    for j, key in enumerate(OPTIONAL):  # sparse: each present on ~1 in (j+2) rows
+        if i % (j + 2) == 0:
+            rec[key] = f"{key} {i}"
+    if shape == "wide":
+        for j in range(30):
+            rec[f"Attr_{j:02d}"] = j * i
+    return rec
+
+
+def measure(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def run(sizes: List[int], shapes: List[str]) -> List[Dict[str, Any]]:
+    out = []
+    for shape in shapes:
+        for size in sizes:
+            # the agent queues normalized records, so measure exactly that
+            def records():
+                return (normalize_record(make_record(i, shape)) for i in range(size))
+
+            as_list = measure(lambda: list(records()))
+            as_store = measure(lambda: RecordStore(records()))
+            out.append({
+                "bench": "record_store_memory",
+                "size": size,
+                "shape": shape,
+                "list_of_dicts_bytes": as_list,
+                "record_store_bytes": as_store,
+                "reduction": 1 - as_store / as_list,
+            })
+    return out
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--shapes", default="narrow,wide")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(
+        {"results": run([int(s) for s in args.sizes.split(",")], args.shapes.split(","))},
+        indent=2,
+    )
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""
+Local load test for the HTTP serving mode against the offline fake backend.
+
+    python benchmarks/load_server.py --clients 64 --requests 20 --latency 0.05
+    python benchmarks/load_server.py --max-batch 1          # coalescing off
+
+Runs the same closed-loop load (each client sends its next request as soon
+as the previous one answers) once without coalescing and once with it, with
+upstream calls capped at `--max-in-flight` like a provider quota, and prints
+requests/sec, latency percentiles and upstream model calls as JSON.
+"""
+from __future__ import annotations
+
+import argparse, asyncio, json, time
+from typing import Any, Dict, List
+
+from profile_summarizer.summary_server import SummaryServer
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+async def _client(port: int, n: int, cid: int, latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i in range(n):
+            body = json.dumps({"first_name": f"C{cid}R{i}", "age": 20 + i}).encode()
+            t0 = time.perf_counter()
+            writer.write(
+                b"POST /summarize HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            length = 0
+            status = await reader.readline()
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            if b" 200 " not in status:
+                raise RuntimeError(status.decode().strip())
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def run_load(
+    *, clients: int, requests: int, latency: float, max_in_flight: int,
+    max_wait_ms: float, max_batch: int,
+) -> Dict[str, Any]:
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="bench", prompt="Summarise attributes.",
+        backend="fake", backend_options={"latency": latency},
+    )
+    server = SummaryServer(agent, port=0, max_wait_ms=max_wait_ms, max_batch=max_batch,
+                           max_in_flight=max_in_flight)
+    await server.start()
+    latencies: List[float] = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(server.port, requests, c, latencies) for c in range(clients)))
+    elapsed = time.perf_counter() - t0
+    stats = server.coalescer.stats()
+    await server.aclose()
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        "max_batch": max_batch,
+        "max_wait_ms": max_wait_ms,
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "upstream_calls": stats["upstream_calls"],
+        "records_per_call": stats["records_per_call"],
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--clients", type=int, default=64)
+    p.add_argument("--requests", type=int, default=20, help="requests per client")
+    p.add_argument("--latency", type=float, default=0.05, help="fake model latency (s)")
+    p.add_argument("--max-in-flight", type=int, default=8, help="upstream concurrency quota")
+    p.add_argument("--max-wait-ms", type=float, default=5.0)
+    p.add_argument("--max-batch", type=int, default=16)
+    args = p.parse_args()
+
+    common = dict(clients=args.clients, requests=args.requests, latency=args.latency,
+                  max_in_flight=args.max_in_flight)
+    runs = [asyncio.run(run_load(**common, max_wait_ms=0.0, max_batch=1))]
+    if args.max_batch > 1:
+        runs.append(asyncio.run(
+            run_load(**common, max_wait_ms=args.max_wait_ms, max_batch=args.max_batch)
+        ))
+    print(json.dumps(runs, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import argparse
-import re
 from pathlib import Path
 
+from profile_summarizer.profile_ingest import load_profile
 from profile_summarizer_agent import ProfileSummarizerAgent
 
 # Config shortcuts
@@ -32,24 +32,8 @@ if suffix == ".json":
     print(agent.process())
     raise SystemExit(0)
 
-if suffix == ".pdf":
-    from pypdf import PdfReader
-    reader = PdfReader(str(file_path))
-    raw_text = "\n".join(page.extract_text() or "" for page in reader.pages)
-else:
-    raw_text = file_path.read_text("utf-8")
-
-# Parse key:value, or fallback to raw prose
-profile = {}
-for line in raw_text.splitlines():
-    m = re.match(r"\s*([^:]+?)\s*:\s*(.+)", line)
-    if m:
-        k, v = m.groups()
-        v = [x.strip() for x in v.split(",")] if "," in v else v.strip()
-        profile[k.strip().lower()] = v
-
-if not profile:
-    profile = {"raw_text": raw_text.strip()[:4_000]}  # safety cap
+# TXT / PDF: key:value lines, or raw prose as a fallback
+profile = load_profile(file_path)
 
 agent.append_input(profile)
 
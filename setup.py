@@ -7,6 +7,13 @@ setup(
     python_requires=">=3.9",
     package_dir={"": "src"},
     py_modules=["profile_summarizer_agent"],
+    packages=["profile_summarizer"],
+    entry_points={
+        "console_scripts": [
+            "profile-summarizer-batch = profile_summarizer.batch_cli:main",
+            "profile-summarizer-serve = profile_summarizer.summary_server:main",
+        ],
+    },
     install_requires=[
         "google-generativeai>=0.4,<1.0",
         "pydantic>=2.8,<3.0",
@@ -14,4 +21,5 @@ setup(
         "tqdm>=4.66,<5.0",
         "python-dotenv>=1.0,<2.0",
     ],
+    extras_require={"columnar": ["pyarrow>=12"]},
 )
@@ -1,2 +1,79 @@
-from .profile_summarizer_agent import ProfileSummarizerAgent, load_config
-__all__ = ["ProfileSummarizerAgent", "load_config"]
+from profile_summarizer.columnar_ingest import (
+    iter_profiles_from_arrow, iter_profiles_from_csv, iter_profiles_from_file,
+)
+from profile_summarizer.job_journal import RunJournal
+from profile_summarizer.metrics import Histogram, Metrics
+from profile_summarizer.near_duplicates import NearDuplicateIndex
+from profile_summarizer.profile_ingest import load_profile, load_profiles
+from profile_summarizer.prompt_template import PromptTemplate
+from profile_summarizer.rate_control import (
+    Backoff, DeadlineExceeded, HedgePolicy, SharedRateLimiter,
+)
+from profile_summarizer.record_store import RecordStore
+from profile_summarizer.result_sinks import CSVSink, NDJSONSink, ResultSink, SQLiteSink, open_sink
+from profile_summarizer.summary_cache import ResponseCache
+from profile_summarizer.summary_manifest import SummaryManifest, record_fingerprint
+from profile_summarizer.summary_validator import SummaryValidator
+from profile_summarizer.token_estimator import TokenEstimator, estimate_tokens, fit_record
+from profile_summarizer_agent import (
+    ConfigWatcher,
+    ProfileSummarizerAgent,
+    ScaffoldStripper,
+    SummaryResult,
+    SummarySplitError,
+    clear_config_cache,
+    iter_profiles_from_json,
+    iter_profiles_from_ndjson,
+    load_config,
+    normalize_record,
+    plan_batches,
+    split_summaries,
+    strip_scaffold,
+)
+from profile_summarizer.batch_cli import run_batch
+from profile_summarizer.summary_server import RequestCoalescer, SummaryServer
+__all__ = [
+    "Backoff",
+    "CSVSink",
+    "HedgePolicy",
+    "Histogram",
+    "ConfigWatcher",
+    "DeadlineExceeded",
+    "Metrics",
+    "NDJSONSink",
+    "NearDuplicateIndex",
+    "ProfileSummarizerAgent",
+    "PromptTemplate",
+    "RecordStore",
+    "RequestCoalescer",
+    "ResponseCache",
+    "ResultSink",
+    "RunJournal",
+    "SQLiteSink",
+    "SharedRateLimiter",
+    "ScaffoldStripper",
+    "SummaryManifest",
+    "SummaryResult",
+    "SummaryServer",
+    "SummaryValidator",
+    "SummarySplitError",
+    "TokenEstimator",
+    "clear_config_cache",
+    "estimate_tokens",
+    "fit_record",
+    "iter_profiles_from_arrow",
+    "iter_profiles_from_csv",
+    "iter_profiles_from_file",
+    "iter_profiles_from_json",
+    "iter_profiles_from_ndjson",
+    "load_config",
+    "load_profile",
+    "load_profiles",
+    "normalize_record",
+    "open_sink",
+    "plan_batches",
+    "record_fingerprint",
+    "run_batch",
+    "split_summaries",
+    "strip_scaffold",
+]
@@ -0,0 +1 @@
+"""Support modules of `profile_summarizer_agent`: backends, rate control, caches, ingest, sinks and CLIs."""
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import argparse, itertools, os, sys, tempfile, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .columnar_ingest import PROFILE_SUFFIXES, iter_profiles_from_file
+from profile_summarizer_agent import ProfileSummarizerAgent, load_config
+from .rate_control import SharedRateLimiter
+
+Record = Dict[str, Any]
+Row = Dict[str, Any]
+
+
+# ────────────────────────── INPUTS ────────────────────────────────────
+def input_files(paths: Iterable[str | Path]) -> List[Path]:
+    """Expand `paths` into input files; directories contribute their profile exports, sorted."""
+    files: List[Path] = []
+    for p in (Path(p).expanduser() for p in paths):
+        if p.is_dir():
+            files += sorted(
+                f for f in p.iterdir() if f.is_file() and f.suffix.lower() in PROFILE_SUFFIXES
+            )
+        elif p.exists():
+            files.append(p)
+        else:
+            raise FileNotFoundError(p)
+    return files
+
+
+def iter_records(files: Iterable[Path]) -> Iterator[Record]:
+    """Every record of `files`, in order, decoded incrementally."""
+    for f in files:
+        yield from iter_profiles_from_file(f)
+
+
+def _chunks(records: Iterable[Record], size: int) -> Iterator[List[Tuple[int, Record]]]:
+    it = enumerate(records)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ────────────────────────── WORKERS ───────────────────────────────────
+_AGENT: Optional[ProfileSummarizerAgent] = None
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def _init_worker(
+    agent_kwargs: Dict[str, Any],
+    limits_path: Optional[str],
+    rpm: Optional[float],
+    tpm: Optional[float],
+    concurrency: int,
+    id_field: Optional[str],
+) -> None:
+    """Build this process's agent on the shared cache and rate budget."""
+    global _AGENT
+    _AGENT = ProfileSummarizerAgent(**agent_kwargs)
+    if limits_path is not None and (rpm or tpm):
+        _AGENT.rate_limiter = SharedRateLimiter(limits_path, rpm, tpm)
+    _WORKER_OPTIONS.update(concurrency=concurrency, id_field=id_field)
+
+
+def _run_chunk(chunk: List[Tuple[int, Record]]) -> List[Row]:
+    """Summarise one shard; rows come back in the shard's input order."""
+    assert _AGENT is not None, "worker not initialised"
+    id_field = _WORKER_OPTIONS["id_field"]
+    results = _AGENT.process_records(
+        [rec for _, rec in chunk], concurrency=_WORKER_OPTIONS["concurrency"]
+    )
+    return [
+        {
+            "id": rec.get(id_field, i) if id_field else i,
+            "index": i,
+            "summary": res.summary,
+            "error": None if res.error is None else repr(res.error),
+        }
+        for (i, rec), res in zip(chunk, results)
+    ]
+
+
+# ────────────────────────── DRIVER ────────────────────────────────────
+def run_batch(
+    config: str | Path,
+    inputs: Sequence[str | Path],
+    output: str | Path,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    concurrency: int = 8,
+    cache: str | Path | None = None,
+    id_field: Optional[str] = "id",
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Summarise every record of `inputs` across `workers` processes into `output`.
+
+    Records are read in order in this process and handed out in shards of
+    `chunk_size`; each worker runs its shard through its own agent with up to
+    `concurrency` requests in flight. All workers share one SQLite response
+    cache (`cache`, else the config's, else a file for this run only) and
+    one RPM/TPM budget. Rows are written to `output` (suffix picks the sink)
+    in input order, with at most two shards per worker outstanding. Returns
+    record / failure counts, elapsed seconds and records per second.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from .result_sinks import open_sink
+
+    workers = workers or os.cpu_count() or 1
+    kwargs = {**load_config(config), **(overrides or {})}
+    rpm, tpm = kwargs.pop("rpm", None), kwargs.pop("tpm", None)
+    files = input_files(inputs)
+    counts = {"records": 0, "failed": 0}
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="psa-batch-") as scratch:
+        kwargs["cache"] = str(cache or kwargs.get("cache") or Path(scratch, "cache.db"))
+        limits = str(Path(scratch, "limits.db")) if (rpm or tpm) else None
+        init = (kwargs, limits, rpm, tpm, concurrency, id_field)
+        with open_sink(output) as sink, ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=init
+        ) as pool:
+            pending: List[Any] = []
+
+            def drain(keep: int) -> None:
+                while len(pending) > keep:
+                    for row in pending.pop(0).result():
+                        sink.write(row)
+                        counts["records"] += 1
+                        counts["failed"] += row["error"] is not None
+
+            for chunk in _chunks(iter_records(files), chunk_size):
+                pending.append(pool.submit(_run_chunk, chunk))
+                drain(2 * workers)
+            drain(0)
+
+    elapsed = time.perf_counter() - started
+    return {
+        **counts,
+        "files": len(files),
+        "workers": workers,
+        "seconds": elapsed,
+        "records_per_second": counts["records"] / elapsed if elapsed else 0.0,
+    }
+
+
+# ────────────────────────── CLI ───────────────────────────────────────
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="profile-summarizer-batch",
+        description="Summarise profile files in parallel worker processes.",
+    )
+    p.add_argument("inputs", nargs="+", help="JSON / NDJSON / CSV / Parquet / Arrow files or directories")
+    p.add_argument("-c", "--config", required=True, help="agent config file")
+    p.add_argument("-o", "--output", required=True, help="result file (.ndjson, .csv, .db)")
+    p.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    p.add_argument("--concurrency", type=int, default=8, help="requests in flight per worker")
+    p.add_argument("--chunk-size", type=int, default=64, help="records per shard")
+    p.add_argument("--cache", help="shared SQLite response cache")
+    p.add_argument("--id-field", default="id", help="record field used as the row id")
+    p.add_argument("--model", help="override model_name from the config")
+    p.add_argument("--backend", help="override the backend ('gemini' or 'fake')")
+    p.add_argument("--rpm", type=float, help="requests per minute, shared by all workers")
+    p.add_argument("--tpm", type=float, help="tokens per minute, shared by all workers")
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    overrides = {
+        k: v
+        for k, v in (
+            ("model_name", args.model), ("backend", args.backend),
+            ("rpm", args.rpm), ("tpm", args.tpm),
+        )
+        if v is not None
+    }
+    stats = run_batch(
+        args.config, args.inputs, args.output,
+        workers=args.workers, chunk_size=args.chunk_size, concurrency=args.concurrency,
+        cache=args.cache, id_field=args.id_field or None, overrides=overrides,
+    )
+    print(
+        f"{stats['records']} records from {stats['files']} file(s) in "
+        f"{stats['seconds']:.2f}s ({stats['records_per_second']:.1f} records/s, "
+        f"{stats['workers']} workers, {stats['failed']} failed) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
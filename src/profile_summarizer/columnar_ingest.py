@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import csv, itertools
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from profile_summarizer_agent import iter_profiles_from_json, iter_profiles_from_ndjson
+
+Record = Dict[str, Any]
+Columns = Union[Sequence[str], Mapping[str, str], None]  # keep these / rename source -> attr
+
+CSV_SUFFIXES = (".csv", ".tsv")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+PROFILE_SUFFIXES = (".json", ".ndjson", ".jsonl") + CSV_SUFFIXES + PARQUET_SUFFIXES + ARROW_SUFFIXES
+
+
+# ────────────────────────── SCHEMA MAPPING ────────────────────────────
+def _schema(
+    names: Sequence[str], columns: Columns, lower_keys: bool
+) -> Tuple[List[str], List[int]]:
+    """Attribute names and source positions of the columns to keep, worked out once."""
+    keys: List[str] = []
+    picks: List[int] = []
+    if columns is None:
+        for i, name in enumerate(names):
+            keys.append(name.lower() if lower_keys else name)
+            picks.append(i)
+        return keys, picks
+    rename = dict(columns) if isinstance(columns, Mapping) else {c: c for c in columns}
+    index = {name: i for i, name in enumerate(names)}
+    for source, attr in rename.items():
+        if source not in index:
+            raise KeyError(f"Column {source!r} not found; have {list(names)}")
+        keys.append(attr.lower() if lower_keys else attr)
+        picks.append(index[source])
+    return keys, picks
+
+
+def _clean(value: Any, strip: bool) -> Any:
+    if strip:
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, list):
+            return [x.strip() if isinstance(x, str) else x for x in value]
+    return value
+
+
+# ────────────────────────── CSV ───────────────────────────────────────
+def iter_profiles_from_csv(
+    path: str | Path,
+    *,
+    lower_keys: bool = True,
+    strip_strings: bool = True,
+    columns: Columns = None,
+    list_sep: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    batch_size: int = 1024,
+    encoding: str = "utf-8-sig",
+) -> Iterator[Record]:
+    """
+    Stream normalized profile records out of a CSV / TSV export.
+
+    The header row names the attributes (cells stripped, lowercased with
+    `lower_keys`; `columns` keeps or renames a subset). Rows are read and
+    normalized `batch_size` at a time against that one schema. Empty cells
+    are nulls and leave the attribute out; with `list_sep` a cell holding
+    the separator becomes a list.
+    """
+    path = Path(path).expanduser()
+    if delimiter is None:
+        delimiter = "\t" if path.suffix.lower() == ".tsv" else ","
+    with path.open("r", encoding=encoding, newline="") as fh:
+        reader = csv.reader(fh, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        keys, picks = _schema([h.strip() for h in header], columns, lower_keys)
+        fields = list(zip(keys, picks))
+        while True:
+            rows = list(itertools.islice(reader, batch_size))
+            if not rows:
+                return
+            batch: List[Record] = []
+            for row in rows:
+                rec: Record = {}
+                width = len(row)
+                for key, i in fields:
+                    v = row[i] if i < width else ""
+                    if strip_strings:
+                        v = v.strip()
+                    if not v:
+                        continue
+                    if list_sep is not None and list_sep in v:
+                        rec[key] = _clean(v.split(list_sep), strip_strings)
+                    else:
+                        rec[key] = v
+                batch.append(rec)
+            yield from batch
+
+
+# ────────────────────────── PARQUET / ARROW ───────────────────────────
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:  # pragma: no cover - depends on env
+        raise ImportError("pip install pyarrow to read Parquet / Arrow profiles") from exc
+    return pyarrow
+
+
+def iter_profiles_from_arrow(
+    source: Any,
+    *,
+    lower_keys: bool = True,
+    strip_strings: bool = True,
+    columns: Columns = None,
+    batch_size: int = 1024,
+) -> Iterator[Record]:
+    """
+    Stream normalized profile records out of Parquet or Arrow data.
+
+    `source` is a `.parquet` file (read batch by batch, only the `columns`
+    asked for), an Arrow IPC file or stream (`.arrow` / `.feather` /
+    `.ipc`, memory-mapped so batches are zero-copy views of the file), or a
+    pyarrow Table / RecordBatch / RecordBatchReader. Each batch is converted
+    a column at a time and zipped into records of at most `batch_size`;
+    nulls leave the attribute out. Needs `pyarrow`.
+    """
+    for batch in _arrow_batches(source, batch_size, columns):
+        keys, picks = _schema(batch.schema.names, columns, lower_keys)
+        cols = [batch.column(i).to_pylist() for i in picks]
+        for values in zip(*cols):
+            yield {
+                k: _clean(v, strip_strings) for k, v in zip(keys, values) if v is not None
+            }
+
+
+def _arrow_batches(source: Any, batch_size: int, columns: Columns) -> Iterator[Any]:
+    pa = _pyarrow()
+    if isinstance(source, (str, Path)):
+        path = Path(source).expanduser()
+        if path.suffix.lower() in PARQUET_SUFFIXES:
+            import pyarrow.parquet as pq
+
+            wanted = list(columns) if columns is not None else None
+            yield from pq.ParquetFile(str(path), memory_map=True).iter_batches(
+                batch_size=batch_size, columns=wanted
+            )
+            return
+        with pa.memory_map(str(path), "r") as mm:
+            try:
+                reader = pa.ipc.open_file(mm)
+                batches: Iterable[Any] = (
+                    reader.get_batch(i) for i in range(reader.num_record_batches)
+                )
+            except pa.ArrowInvalid:  # not the file format: try the stream format
+                mm.seek(0)
+                batches = pa.ipc.open_stream(mm)
+            for batch in batches:
+                yield from _slices(batch, batch_size)
+        return
+    if isinstance(source, pa.Table):
+        batches = source.to_batches(max_chunksize=batch_size)
+    elif isinstance(source, pa.RecordBatch):
+        batches = [source]
+    else:
+        batches = source
+    for batch in batches:
+        yield from _slices(batch, batch_size)
+
+
+def _slices(batch: Any, size: int) -> Iterator[Any]:
+    for offset in range(0, batch.num_rows, size):
+        yield batch.slice(offset, size)  # zero-copy view
+
+
+# ────────────────────────── DISPATCH ──────────────────────────────────
+def iter_profiles_from_file(path: str | Path, **options: Any) -> Iterator[Record]:
+    """Stream records from any supported export, picked by file suffix."""
+    path = Path(path).expanduser()
+    suffix = path.suffix.lower()
+    if suffix in (".ndjson", ".jsonl"):
+        return iter_profiles_from_ndjson(path, **options)
+    if suffix == ".json":
+        return iter_profiles_from_json(path, **options)
+    if suffix in CSV_SUFFIXES:
+        return iter_profiles_from_csv(path, **options)
+    if suffix in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+        return iter_profiles_from_arrow(path, **options)
+    raise ValueError(f"No profile reader for {suffix!r} files")
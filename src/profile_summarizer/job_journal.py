@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json, os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Set
+
+if TYPE_CHECKING:
+    from .result_sinks import ResultSink
+
+Row = Dict[str, Any]
+
+JOURNAL_VERSION = 1
+
+
+# ────────────────────────── RUN JOURNAL ───────────────────────────────
+class RunJournal:
+    """
+    Append-only NDJSON log of the records a job has finished.
+
+    The first line is a header holding `context` (what the summaries were
+    produced under); every other line is one finished record (`index`,
+    `id`, `summary`). Lines are written a whole group at a time and fsynced,
+    so a kill can only ever leave a torn last line, which is cut off the
+    next time the journal is opened. `low_water` is the first input index
+    not yet done: a resumed run starts reading the input there and skips the
+    few records past it in `done`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        context: str,
+        *,
+        restart: bool = False,
+        fsync: bool = True,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.context = context
+        self.fsync = fsync
+        self.done: Set[int] = set()
+        self.low_water = 0
+        if restart or not self.path.exists():
+            self._start()
+        else:
+            self._load()
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    # loading -----------------------------------------------------------
+    def _start(self) -> None:
+        header = {"journal": JOURNAL_VERSION, "context": self.context}
+        self.path.write_text(json.dumps(header) + "\n", "utf-8")
+
+    def _load(self) -> None:
+        with self.path.open("rb+") as fh:
+            data = fh.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):  # torn write from a killed run
+                fh.truncate(end)
+        lines = data[:end].decode("utf-8").splitlines()
+        if not lines:
+            self._start()
+            return
+        header = json.loads(lines[0])
+        if header.get("context") != self.context:
+            raise ValueError(
+                f"{self.path} was written for different model/prompt settings; "
+                "pass restart=True to start over"
+            )
+        done = self.done
+        for line in lines[1:]:
+            if line:
+                done.add(json.loads(line)["index"])
+        low = 0
+        while low in done:
+            low += 1
+        self.low_water = low
+        self.done = {i for i in done if i > low}
+
+    # writing -----------------------------------------------------------
+    def record(self, rows: List[Row]) -> None:
+        """Durably append finished rows (one group)."""
+        if not rows:
+            return
+        self._fh.write(
+            "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in rows)
+        )
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    # reading -----------------------------------------------------------
+    def rows(self) -> Iterator[Row]:
+        """Every finished row once (first entry per index wins), in log order."""
+        self._fh.flush()
+        seen: Set[int] = set()
+        with self.path.open("r", encoding="utf-8") as fh:
+            next(fh, None)
+            for line in fh:
+                if not line.endswith("\n"):
+                    break
+                row = json.loads(line)
+                if row["index"] not in seen:
+                    seen.add(row["index"])
+                    yield row
+
+    def export(self, sink: ResultSink) -> int:
+        """Write the journal's rows into `sink`; returns how many."""
+        n = 0
+        for row in self.rows():
+            sink.write({"error": None, **row})
+            n += 1
+        sink.flush()
+        return n
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import bisect, json, threading, time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# (kind, name, value): kind is "latency", "size" or "counter"
+MetricCallback = Callable[[str, str, float], None]
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144)
+
+
+# ────────────────────────── HISTOGRAM ─────────────────────────────────
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, running = [], 0
+        for bound, n in zip((*map(_fmt, self.bounds), "+Inf"), self.counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(self.cumulative())}
+
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+# ────────────────────────── METRICS REGISTRY ──────────────────────────
+class Metrics:
+    """
+    Per-stage latency histograms, size histograms and counters.
+
+    The agent only touches this when `ProfileSummarizerAgent(metrics=...)`
+    is set, so a disabled run pays one attribute check per stage. Every
+    observation is also passed to the registered callbacks as
+    `(kind, name, value)`; export with `snapshot()` / `to_json()` or, for a
+    scrape endpoint, `prometheus()`.
+    """
+
+    def __init__(
+        self,
+        callbacks: Sequence[MetricCallback] = (),
+        *,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ) -> None:
+        self.callbacks: List[MetricCallback] = list(callbacks)
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.latency: Dict[str, Histogram] = {}
+        self.sizes: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, fn: MetricCallback) -> None:
+        self.callbacks.append(fn)
+
+    # recording ---------------------------------------------------------
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.latency.get(stage)
+            if hist is None:
+                hist = self.latency[stage] = Histogram(self.latency_buckets)
+            hist.observe(seconds)
+        self._emit("latency", stage, seconds)
+
+    def size(self, name: str, value: float) -> None:
+        with self._lock:
+            hist = self.sizes.get(name)
+            if hist is None:
+                hist = self.sizes[name] = Histogram(self.size_buckets)
+            hist.observe(value)
+        self._emit("size", name, value)
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        self._emit("counter", name, value)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def _emit(self, kind: str, name: str, value: float) -> None:
+        for fn in self.callbacks:
+            fn(kind, name, value)
+
+    # export ------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "latency_seconds": {k: h.to_dict() for k, h in self.latency.items()},
+                "sizes": {k: h.to_dict() for k, h in self.sizes.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def prometheus(self, prefix: str = "profile_summarizer") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            if self.latency:
+                name = f"{prefix}_stage_seconds"
+                lines += [f"# HELP {name} Time spent per pipeline stage.",
+                          f"# TYPE {name} histogram"]
+                for stage, hist in sorted(self.latency.items()):
+                    lines += _histogram_lines(name, f'stage="{_label(stage)}"', hist)
+            for metric, hist in sorted(self.sizes.items()):
+                name = f"{prefix}_{metric}"
+                lines += [f"# HELP {name} Distribution of {metric.replace('_', ' ')}.",
+                          f"# TYPE {name} histogram"]
+                lines += _histogram_lines(name, "", hist)
+            for metric, value in sorted(self.counters.items()):
+                name = f"{prefix}_{metric}_total"
+                lines += [f"# TYPE {name} counter", f"{name} {_fmt(value)}"]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.sizes.clear()
+            self.counters.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, hist: Histogram) -> List[str]:
+    sep = "," if labels else ""
+    out = [f'{name}_bucket{{{labels}{sep}le="{le}"}} {n}' for le, n in hist.cumulative()]
+    suffix = f"{{{labels}}}" if labels else ""
+    out.append(f"{name}_sum{suffix} {hist.sum!r}")
+    out.append(f"{name}_count{suffix} {hist.count}")
+    return out
+
+
+def timed(metrics: Optional[Metrics], stage: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """Call `fn(*args)`, timing it under `stage` when `metrics` is set."""
+    if metrics is None:
+        return fn(*args)
+    t0 = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        metrics.observe(stage, time.perf_counter() - t0)
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import hashlib, math, os, random, threading, time
+from typing import (
+    Any, AsyncIterator, Dict, Iterator, List, Optional, Protocol, Tuple, runtime_checkable,
+)
+
+
+# ────────────────────────── BACKEND PROTOCOL ──────────────────────────
+@runtime_checkable
+class ModelBackend(Protocol):
+    """Anything that turns a full prompt into raw model text."""
+
+    def generate(self, prompt: str, *, temperature: float) -> str: ...
+
+    async def agenerate(self, prompt: str, *, temperature: float) -> str: ...
+
+
+@runtime_checkable
+class StreamingBackend(ModelBackend, Protocol):
+    """A backend that can also hand out the response text as it is generated."""
+
+    def stream(self, prompt: str, *, temperature: float) -> Iterator[str]: ...
+
+    def astream(self, prompt: str, *, temperature: float) -> AsyncIterator[str]: ...
+
+
+# ────────────────────────── GEMINI ────────────────────────────────────
+_dotenv_loaded = False
+
+
+def _load_dotenv() -> None:
+    """Load `.env` once, the first time a real backend needs credentials."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:  # python-dotenv is a convenience, not a requirement
+        return
+    load_dotenv()
+
+
+class GeminiBackend:
+    """Google Gemini via `google-generativeai`."""
+
+    def __init__(self, model_name: str, *, api_key: Optional[str] = None) -> None:
+        _load_dotenv()
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise EnvironmentError("GEMINI_API_KEY missing in .env or shell")
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str, *, temperature: float) -> str:
+        response = self._model.generate_content(
+            prompt,
+            generation_config={"temperature": temperature},
+        )
+        return response.text.strip()
+
+    async def agenerate(self, prompt: str, *, temperature: float) -> str:
+        response = await self._model.generate_content_async(
+            prompt,
+            generation_config={"temperature": temperature},
+        )
+        return response.text.strip()
+
+    def stream(self, prompt: str, *, temperature: float) -> Iterator[str]:
+        response = self._model.generate_content(
+            prompt,
+            generation_config={"temperature": temperature},
+            stream=True,
+        )
+        for chunk in response:
+            yield chunk.text
+
+    async def astream(self, prompt: str, *, temperature: float) -> AsyncIterator[str]:
+        response = await self._model.generate_content_async(
+            prompt,
+            generation_config={"temperature": temperature},
+            stream=True,
+        )
+        async for chunk in response:
+            yield chunk.text
+
+
+# ────────────────────────── LOCAL FAKE ────────────────────────────────
+class FakeBackendError(RuntimeError):
+    """Injected failure; looks like a 503 to retry/throttle logic."""
+
+    status_code = 503
+
+
+_NAME_KEYS = ("preferred_name", "first_name", "name")
+_LATENCY_DISTRIBUTIONS = {"constant", "uniform", "exponential", "lognormal"}
+
+
+class FakeBackend:
+    """
+    Deterministic offline stand-in for a real model.
+
+    Each summary is derived from the `key: value` records in the prompt's
+    attribute block (one paragraph per record, starting with the first name),
+    so identical prompts always give identical text. Latency is drawn from
+    `distribution` around `latency` seconds, with an optional heavy tail of
+    `tail_latency` seconds hit with probability `tail_prob`; `error_rate` of
+    calls raise `FakeBackendError`. Draws are seeded from (`seed`, prompt,
+    call count for that prompt), so they do not depend on thread scheduling.
+    `stream` / `astream` hand out the same text in `stream_chunk_chars`
+    pieces, spreading the drawn latency evenly across them.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        distribution: str = "constant",
+        sigma: float = 0.5,
+        tail_prob: float = 0.0,
+        tail_latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        max_chars: int = 120,
+        stream_chunk_chars: int = 16,
+    ) -> None:
+        if distribution not in _LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {distribution!r}")
+        self.latency, self.distribution, self.sigma = latency, distribution, sigma
+        self.tail_prob, self.tail_latency = tail_prob, tail_latency
+        self.error_rate, self.seed, self.max_chars = error_rate, seed, max_chars
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.calls = self.errors = 0
+        self.prompt_tokens = self.completion_tokens = 0
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ModelBackend ------------------------------------------------------
+    def generate(self, prompt: str, *, temperature: float) -> str:
+        delay, fail = self._draw(prompt)
+        if delay:
+            time.sleep(delay)
+        return self._respond(prompt, fail)
+
+    async def agenerate(self, prompt: str, *, temperature: float) -> str:
+        import asyncio
+
+        delay, fail = self._draw(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(prompt, fail)
+
+    def stream(self, prompt: str, *, temperature: float) -> Iterator[str]:
+        delay, fail = self._draw(prompt)
+        if fail:
+            time.sleep(delay)
+        chunks = self._chunks(self._respond(prompt, fail))
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay / len(chunks))
+            yield chunk
+
+    async def astream(self, prompt: str, *, temperature: float) -> AsyncIterator[str]:
+        import asyncio
+
+        delay, fail = self._draw(prompt)
+        if fail:
+            await asyncio.sleep(delay)
+        chunks = self._chunks(self._respond(prompt, fail))
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay / len(chunks))
+            yield chunk
+
+    # accounting --------------------------------------------------------
+    def usage(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+    # helpers -----------------------------------------------------------
+    def _draw(self, prompt: str) -> Tuple[float, bool]:
+        with self._lock:
+            n = self._seen.get(prompt, 0)
+            self._seen[prompt] = n + 1
+            self.calls += 1
+            self.prompt_tokens += len(prompt) // 4 + 1
+        digest = hashlib.sha256(f"{self.seed}:{n}:{prompt}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+
+        mean = self.latency
+        if self.distribution == "uniform":
+            delay = rng.uniform(0, 2 * mean)
+        elif self.distribution == "exponential":
+            delay = rng.expovariate(1 / mean) if mean > 0 else 0.0
+        elif self.distribution == "lognormal":
+            # mu chosen so the distribution's mean equals `latency`
+            delay = (
+                rng.lognormvariate(math.log(mean) - self.sigma**2 / 2, self.sigma)
+                if mean > 0 else 0.0
+            )
+        else:
+            delay = mean
+        if self.tail_prob and rng.random() < self.tail_prob:
+            delay += self.tail_latency
+        return delay, rng.random() < self.error_rate
+
+    def _respond(self, prompt: str, fail: bool) -> str:
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise FakeBackendError("fake backend: injected failure")
+        text = "\n\n".join(self._summarize(rec) for rec in self.parse_records(prompt))
+        with self._lock:
+            self.completion_tokens += len(text) // 4 + 1
+        return text
+
+    def _chunks(self, text: str) -> List[str]:
+        n = self.stream_chunk_chars
+        return [text[i:i + n] for i in range(0, len(text), n)] or [""]
+
+    def _summarize(self, rec: Dict[str, str]) -> str:
+        name = next((rec[k] for k in _NAME_KEYS if rec.get(k)), "This person")
+        facts = [v for k, v in rec.items() if k not in _NAME_KEYS]
+        text = f"{name}: {', '.join(facts)}." if facts else f"{name}."
+        if len(text) > self.max_chars:
+            text = text[: self.max_chars - 3].rstrip(", ") + "..."
+        return text
+
+    @staticmethod
+    def parse_records(prompt: str) -> List[Dict[str, str]]:
+        """Recover the `key: value` records from a composed prompt."""
+        block = prompt
+        _, sep, rest = prompt.rpartition("User attributes:\n")
+        if sep:
+            block = rest
+        block = block.rsplit("\n\nSummary:", 1)[0]
+        records: List[Dict[str, Any]] = []
+        for chunk in block.split("\n\n"):
+            rec: Dict[str, str] = {}
+            for line in chunk.splitlines():
+                k, colon, v = line.partition(": ")
+                if colon:
+                    rec[k.strip()] = v.strip()
+            if rec:
+                records.append(rec)
+        return records
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib, random, re, threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+Record = Dict[str, Any]
+
+NAME_FIELDS = ("preferred_name", "first_name", "last_name", "name")
+
+_WORDS = re.compile(r"\w+")
+_Entry = Tuple[str, FrozenSet[str], Tuple[int, ...], Record, str]
+_PRIME = (1 << 61) - 1
+
+
+# ────────────────────────── SHINGLES & MINHASH ────────────────────────
+def record_shingles(rec: Record, skip: Iterable[str] = ()) -> FrozenSet[str]:
+    """
+    Attribute shingles of a record: `key=word` and `key=word word` pairs.
+
+    Keys are case- and whitespace-folded and values lower-cased and split
+    into words, so records that differ only in casing, spacing, punctuation
+    or key order give the same set. Keys in `skip` are left out.
+    """
+    skipped = {k.strip().lower() for k in skip}
+    out: Set[str] = set()
+    for key, value in rec.items():
+        key = str(key).strip().lower()
+        if key in skipped:
+            continue
+        text = " ".join(map(str, value)) if isinstance(value, list) else str(value)
+        words = _WORDS.findall(text.lower())
+        if not words:
+            out.add(f"{key}=")
+        out.update(f"{key}={w}" for w in words)
+        out.update(f"{key}={a} {b}" for a, b in zip(words, words[1:]))
+    return frozenset(out)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity; two empty sets have nothing in common (0.0)."""
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+class MinHasher:
+    """`num_perm` universal-hash permutations; `signature` is the min of each."""
+
+    def __init__(self, num_perm: int = 64, *, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Iterable[str]) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+            for s in shingles
+        ]
+        if not hashes:
+            return (0,) * self.num_perm
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms)
+
+
+# ────────────────────────── INDEX ─────────────────────────────────────
+class NearDuplicate:
+    """A lookup hit: the reusable summary and how close the match was."""
+
+    __slots__ = ("summary", "similarity", "source")
+
+    def __init__(self, summary: str, similarity: float, source: Record) -> None:
+        self.summary, self.similarity, self.source = summary, similarity, source
+
+    def __repr__(self) -> str:
+        return f"NearDuplicate(similarity={self.similarity:.3f}, summary={self.summary[:40]!r})"
+
+
+class NearDuplicateIndex:
+    """
+    Local MinHash/LSH index of summarized records.
+
+    Signatures are split into `bands` LSH bands; records sharing any band
+    are candidates, and a candidate is a hit when the exact Jaccard
+    similarity of the two shingle sets reaches `threshold` (the best one
+    wins). `ignore_fields` (ids, timestamps, ...) never count. Fields in
+    `template_fields` (names by default) are left out of the comparison too,
+    and their values are swapped in the reused summary, so a profile that
+    matches another in everything but the name gets that summary with its
+    own name. Entries carry the context (model / prompt) they were produced
+    under and only match lookups under the same context. Past `max_entries`
+    the oldest entries are dropped.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        *,
+        num_perm: int = 64,
+        bands: int = 16,
+        ignore_fields: Sequence[str] = ("id",),
+        template_fields: Sequence[str] = NAME_FIELDS,
+        max_entries: Optional[int] = 100_000,
+        seed: int = 1,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands, self.rows = bands, num_perm // bands
+        self.ignore_fields = tuple(f.lower() for f in ignore_fields)
+        self.template_fields = tuple(f.lower() for f in template_fields)
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm, seed=seed)
+        self.lookups = self.hits = 0
+        # id -> (context, shingles, signature, record, summary), oldest first
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    # public API --------------------------------------------------------
+    def shingles(self, rec: Record) -> FrozenSet[str]:
+        return record_shingles(rec, self.ignore_fields + self.template_fields)
+
+    def similarity(self, a: Record, b: Record) -> float:
+        return jaccard(self.shingles(a), self.shingles(b))
+
+    def add(self, rec: Record, summary: str, context: str = "") -> None:
+        """Index `rec` as summarized by `summary` under `context`."""
+        sh = self.shingles(rec)
+        if not sh:  # nothing to compare on
+            return
+        sig = self.hasher.signature(sh)
+        with self._lock:
+            eid, self._next_id = self._next_id, self._next_id + 1
+            self._entries[eid] = (context, sh, sig, dict(rec), summary)
+            for key in self._band_keys(context, sig):
+                self._buckets.setdefault(key, set()).add(eid)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def lookup(self, rec: Record, context: str = "") -> Optional[NearDuplicate]:
+        """Best indexed match for `rec` at or above `threshold`, summary re-templated."""
+        sh = self.shingles(rec)
+        sig = self.hasher.signature(sh)
+        with self._lock:
+            self.lookups += 1
+            candidates: Set[int] = set()
+            for key in self._band_keys(context, sig):
+                candidates |= self._buckets.get(key, set())
+            best: Optional[Tuple[float, int]] = None
+            for eid in candidates:
+                sim = jaccard(sh, self._entries[eid][1])
+                if sim >= self.threshold and (best is None or sim > best[0]):
+                    best = (sim, eid)
+            if best is None:
+                return None
+            self.hits += 1
+            _, _, _, source, summary = self._entries[best[1]]
+        return NearDuplicate(self._retemplate(summary, source, rec), best[0], source)
+
+    def evaluate(self, pairs: Iterable[Tuple[Record, Record, bool]]) -> Dict[str, float]:
+        """
+        Precision / recall of the `threshold` decision on labelled pairs.
+
+        `pairs` holds `(a, b, is_duplicate)`; a pair is predicted duplicate
+        when `similarity(a, b) >= threshold`. Use it to pick a threshold.
+        """
+        tp = fp = fn = tn = 0
+        for a, b, truth in pairs:
+            predicted = self.similarity(a, b) >= self.threshold
+            if predicted and truth:
+                tp += 1
+            elif predicted:
+                fp += 1
+            elif truth:
+                fn += 1
+            else:
+                tn += 1
+        precision = tp / (tp + fp) if tp + fp else 1.0
+        recall = tp / (tp + fn) if tp + fn else 1.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {"precision": precision, "recall": recall, "f1": f1,
+                "true_positives": tp, "false_positives": fp,
+                "false_negatives": fn, "true_negatives": tn}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.lookups - self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # helpers -----------------------------------------------------------
+    def _band_keys(self, context: str, sig: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        r = self.rows
+        return [(context, b, sig[b * r:(b + 1) * r]) for b in range(self.bands)]
+
+    def _drop(self, eid: int) -> None:
+        context, _, sig, _, _ = self._entries.pop(eid)
+        for key in self._band_keys(context, sig):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(eid)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _retemplate(self, summary: str, source: Record, target: Record) -> str:
+        """Swap the source's template-field values for the target's in `summary`."""
+        fields = {str(k).strip().lower(): v for k, v in target.items()}
+        for key, old in source.items():
+            key = str(key).strip().lower()
+            new = fields.get(key)
+            if key not in self.template_fields or new is None:
+                continue
+            old, new = str(old).strip(), str(new).strip()
+            if old and new and old != new:
+                summary = re.sub(rf"(?<!\w){re.escape(old)}(?!\w)", lambda _: new, summary)
+        return summary
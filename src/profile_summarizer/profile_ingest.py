@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os, re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# ────────────────────────── TEXT PARSING ──────────────────────────────
+Record = Dict[str, Any]
+
+RAW_TEXT_CAP = 4_000                      # safety cap for free-text profiles
+DOCUMENT_SUFFIXES = (".txt", ".pdf")      # picked up when scanning directories
+PDF_PAGES_PER_TASK = 8                    # smaller PDFs are read in-process
+
+_KV_LINE = re.compile(r"\s*([^:]+?)\s*:\s*(.+)")
+
+
+def parse_profile_text(raw_text: str) -> Record:
+    """
+    Turn `key: value` lines into a profile dict.
+
+    Comma-separated values become lists and keys are lowercased. Text with no
+    such lines falls back to `{"raw_text": ...}`, capped at `RAW_TEXT_CAP`.
+    """
+    profile: Record = {}
+    match = _KV_LINE.match
+    for line in raw_text.splitlines():
+        m = match(line)
+        if m:
+            k, v = m.groups()
+            profile[k.strip().lower()] = (
+                [x.strip() for x in v.split(",")] if "," in v else v.strip()
+            )
+    if not profile:
+        profile = {"raw_text": raw_text.strip()[:RAW_TEXT_CAP]}
+    return profile
+
+
+# ────────────────────────── PDF EXTRACTION ────────────────────────────
+def _pdf_reader(path: Path):
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:  # pragma: no cover - depends on env
+        raise ImportError("pip install pypdf to read PDF profiles") from exc
+    return PdfReader(str(path))
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Worker: open the PDF independently and extract pages [start, stop)."""
+    pages = _pdf_reader(Path(path)).pages
+    return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_pdf_text(path: str | Path, *, workers: Optional[int] = None) -> str:
+    """
+    Extract a PDF's text, page order preserved.
+
+    PDFs longer than `PDF_PAGES_PER_TASK` pages are split into page ranges
+    and extracted across a process pool of at most `workers` processes.
+    """
+    path = Path(path).expanduser()
+    reader = _pdf_reader(path)
+    n_pages = len(reader.pages)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or n_pages <= PDF_PAGES_PER_TASK:
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    step = max(PDF_PAGES_PER_TASK, -(-n_pages // workers))
+    starts = range(0, n_pages, step)
+    with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+        chunks = pool.map(
+            _extract_page_range,
+            [str(path)] * len(starts),
+            starts,
+            [min(s + step, n_pages) for s in starts],
+        )
+        return "\n".join(text for chunk in chunks for text in chunk)
+
+
+# ────────────────────────── PUBLIC API ────────────────────────────────
+def load_profile(path: str | Path, *, pdf_workers: Optional[int] = 1) -> Record:
+    """
+    Load one TXT / PDF profile into the dict the demo scripts used to build.
+
+    `pdf_workers` > 1 splits a long PDF across processes; the default keeps
+    extraction in-process, which is what `load_profiles` workers want.
+    """
+    path = Path(path).expanduser()
+    if path.suffix.lower() == ".pdf":
+        raw_text = extract_pdf_text(path, workers=pdf_workers)
+    else:
+        raw_text = path.read_text("utf-8")
+    return parse_profile_text(raw_text)
+
+
+def expand_profile_paths(paths: Iterable[str | Path]) -> List[Path]:
+    """Expand directories (recursively, sorted) into their TXT / PDF files."""
+    out: List[Path] = []
+    for p in paths:
+        p = Path(p).expanduser()
+        if p.is_dir():
+            out.extend(
+                sorted(
+                    f for f in p.rglob("*")
+                    if f.is_file() and f.suffix.lower() in DOCUMENT_SUFFIXES
+                )
+            )
+        else:
+            out.append(p)
+    return out
+
+
+def load_profiles(
+    paths: Iterable[str | Path], *, workers: Optional[int] = None
+) -> List[Record]:
+    """
+    Load many profiles (files and/or directories) across a process pool.
+
+    At most `workers` processes are used (default: CPU count); results come
+    back in the order of the expanded path list.
+    """
+    files = expand_profile_paths(paths)
+    workers = min(workers or os.cpu_count() or 1, len(files) or 1)
+    if workers <= 1:
+        return [load_profile(f) for f in files]
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(load_profile, files, chunksize=chunksize))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+Record = Dict[str, Any]
+
+_HEADER = "\n\nUser attributes:\n"
+_FOOTER = "\n\nSummary:"
+
+
+# ────────────────────────── PROMPT TEMPLATE ───────────────────────────
+class PromptTemplate:
+    """
+    Precompiled `base prompt / User attributes / Summary:` scaffold.
+
+    The static prefix and suffix are built once, and each record schema
+    (its tuple of keys) maps to a cached sorted list of `"key: "` labels, so
+    rendering a record is one label + value concatenation per attribute.
+    Output is byte-identical to the original `_build_prompt_body` /
+    `_compose_prompt` pair: records sorted by key, list values joined with
+    ", ", one blank line between records, the block stripped.
+    """
+
+    max_schemas = 4096  # cached key orders; the cache is reset when full
+
+    def __init__(self, base_prompt: str) -> None:
+        self.base_prompt = base_prompt
+        self.prefix = f"{base_prompt}{_HEADER}"
+        self.suffix = _FOOTER
+        self.overhead = len(self.prefix) + len(self.suffix)
+        self._orders: Dict[Tuple[str, ...], Tuple[Tuple[str, str], ...]] = {}
+
+    # single records ----------------------------------------------------
+    def _order(self, rec: Record) -> Tuple[Tuple[str, str], ...]:
+        schema = tuple(rec)
+        order = self._orders.get(schema)
+        if order is None:
+            if len(self._orders) >= self.max_schemas:
+                self._orders.clear()
+            order = self._orders[schema] = tuple((k, f"{k}: ") for k in sorted(rec))
+        return order
+
+    def render_record(self, rec: Record) -> str:
+        """`key: value` lines of one record (unstripped, no trailing newline)."""
+        lines: List[str] = []
+        for key, label in self._order(rec):
+            v = rec[key]
+            if type(v) is str:
+                lines.append(label + v)
+            elif isinstance(v, list):
+                lines.append(label + ", ".join(v))
+            else:
+                lines.append(label + format(v, ""))
+        return "\n".join(lines)
+
+    def measure(self, rec: Record) -> int:
+        """Length of the block this record renders to on its own."""
+        return len(self.render_record(rec).strip())
+
+    # attribute blocks --------------------------------------------------
+    def join_rendered(self, texts: Iterable[str]) -> str:
+        """
+        The attribute block for records already rendered with
+        `render_record`; equal to `render_body` over those records.
+        """
+        out: List[str] = []
+        append = out.append
+        for text in texts:
+            if out:
+                append("\n")
+            if text:
+                append(text)
+                append("\n")
+        return "".join(out).strip()
+
+    def render_body(self, records: Iterable[Record]) -> str:
+        """The attribute block for `records`, rendered in one join."""
+        out: List[str] = []
+        append, orders = out.append, self._orders
+        for rec in records:
+            if out:
+                append("\n")
+            if not rec:
+                continue
+            order = orders.get(tuple(rec)) or self._order(rec)
+            for key, label in order:
+                v = rec[key]
+                if type(v) is str:
+                    append(label + v)
+                elif isinstance(v, list):
+                    append(label + ", ".join(v))
+                else:
+                    append(label + format(v, ""))
+                append("\n")
+        return "".join(out).strip()
+
+    # full prompts ------------------------------------------------------
+    def compose(self, attribute_block: str) -> str:
+        """Wrap an already-rendered block in the static prefix/suffix."""
+        return "".join((self.prefix, attribute_block, self.suffix))
+
+    def render(self, records: Iterable[Record]) -> str:
+        return self.compose(self.render_body(records))
+
@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import random, threading, time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, List, Optional, Protocol, Tuple
+
+if TYPE_CHECKING:
+    import asyncio, sqlite3
+
+
+# ────────────────────────── ERROR CLASSIFICATION ──────────────────────
+class RateLimitError(RuntimeError):
+    """Provider refused the call for quota reasons (HTTP 429)."""
+
+    status_code = 429
+
+
+_THROTTLE_NAMES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "DeadlineExceeded",
+    "RateLimitError",
+}
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """True for rate-limit (429) and server-side (5xx) failures."""
+    if type(exc).__name__ in _THROTTLE_NAMES:
+        return True
+    for attr in ("status_code", "code", "status"):
+        code = getattr(exc, attr, None)
+        code = getattr(code, "value", code)  # grpc / http enums
+        if isinstance(code, int) and (code == 429 or 500 <= code < 600):
+            return True
+    return False
+
+
+# ────────────────────────── TOKEN BUCKETS ─────────────────────────────
+class Bucket(Protocol):
+    """What `RateLimiter` needs of a bucket: in-process or shared."""
+
+    def reserve(self, n: float = 1.0) -> float: ...
+
+    def charge(self, n: float) -> None: ...
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens/second up to `capacity`.
+
+    `reserve(n)` always succeeds and returns how long the caller must wait
+    before proceeding, so waiters queue fairly instead of polling. A request
+    larger than `capacity` is charged in full and simply waits longer.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= n
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def charge(self, n: float) -> None:
+        """Debit tokens after the fact (e.g. response tokens); may go negative."""
+        with self._lock:
+            self._tokens -= n
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget shared by all calls."""
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        *,
+        burst_seconds: float = 1.0,
+    ) -> None:
+        self.rpm, self.tpm = rpm, tpm
+        self._requests: Optional[Bucket] = (
+            TokenBucket(rpm / 60.0, max(1.0, rpm / 60.0 * burst_seconds)) if rpm else None
+        )
+        self._tokens: Optional[Bucket] = (
+            TokenBucket(tpm / 60.0, max(1.0, tpm / 60.0 * burst_seconds)) if tpm else None
+        )
+
+    def _delay(self, tokens: float) -> float:
+        wait = 0.0
+        if self._requests is not None:
+            wait = self._requests.reserve(1)
+        if self._tokens is not None and tokens:
+            wait = max(wait, self._tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: float = 0) -> None:
+        wait = self._delay(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 0) -> None:
+        import asyncio
+
+        wait = self._delay(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def try_acquire(self, tokens: float = 0) -> bool:
+        """Take the budget for one call only if it is there now (no waiting)."""
+        if not self._delay(tokens):
+            return True
+        # hand the reservation back: the caller does not send this call
+        if self._requests is not None:
+            self._requests.charge(-1)
+        if self._tokens is not None and tokens:
+            self._tokens.charge(-tokens)
+        return False
+
+    def charge(self, tokens: float) -> None:
+        if self._tokens is not None and tokens:
+            self._tokens.charge(tokens)
+
+
+class SharedTokenBucket:
+    """
+    `TokenBucket` whose balance lives in a SQLite file.
+
+    Every process that opens the same `path` and `name` draws from one
+    budget: each `reserve` / `charge` is a single `BEGIN IMMEDIATE`
+    transaction, and refill uses wall-clock time so all processes agree on
+    it.
+    """
+
+    def __init__(self, path: str | Path, name: str, rate: float, capacity: float) -> None:
+        import sqlite3
+
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self._lock = threading.Lock()
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db: "sqlite3.Connection" = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " name TEXT PRIMARY KEY, tokens REAL NOT NULL, stamp REAL NOT NULL)"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)", (name, capacity, time.time())
+        )
+
+    def _take(self, n: float, refill: bool) -> float:
+        db = self._db
+        with self._lock:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, stamp = db.execute(
+                    "SELECT tokens, stamp FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                now = time.time()
+                if refill:
+                    tokens = min(self.capacity, tokens + max(0.0, now - stamp) * self.rate)
+                    stamp = now
+                tokens -= n
+                db.execute(
+                    "UPDATE buckets SET tokens = ?, stamp = ? WHERE name = ?",
+                    (tokens, stamp, self.name),
+                )
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        return tokens
+
+    def reserve(self, n: float = 1.0) -> float:
+        tokens = self._take(n, refill=True)
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def charge(self, n: float) -> None:
+        self._take(n, refill=False)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class SharedRateLimiter(RateLimiter):
+    """`RateLimiter` whose budget is shared by every process using `path`."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        *,
+        burst_seconds: float = 1.0,
+    ) -> None:
+        self.rpm, self.tpm = rpm, tpm
+        self.path = Path(path).expanduser()
+        self._requests = (
+            SharedTokenBucket(path, "requests", rpm / 60.0, max(1.0, rpm / 60.0 * burst_seconds))
+            if rpm else None
+        )
+        self._tokens = (
+            SharedTokenBucket(path, "tokens", tpm / 60.0, max(1.0, tpm / 60.0 * burst_seconds))
+            if tpm else None
+        )
+
+
+# ────────────────────────── ADAPTIVE CONCURRENCY ──────────────────────
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight model calls.
+
+    Every success grows the limit by `increase / limit` (about +`increase`
+    per window of successful calls); a throttle error multiplies it by
+    `decrease`, at most once per `cooldown` seconds so a burst of 429s from
+    the same window only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        *,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.limit = float(initial)
+        self.min_limit, self.max_limit = float(min_limit), float(max_limit)
+        self.increase, self.decrease, self.cooldown = increase, decrease, cooldown
+        self.in_flight = 0
+        self.throttled = 0
+        self._last_cut = float("-inf")
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple["asyncio.AbstractEventLoop", "asyncio.Future"]] = []
+
+    def _try_enter(self) -> bool:
+        if self.in_flight < max(1, int(self.limit)):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while not self._try_enter():
+                self._cond.wait()
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free now."""
+        with self._cond:
+            return self._try_enter()
+
+    async def aacquire(self) -> None:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._try_enter():
+                    return
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._wake()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self._wake()
+
+    def _wake(self) -> None:
+        """Wake blocked threads and async waiters (any loop); hold `_cond`."""
+        self._cond.notify_all()
+        waiters, self._waiters = self._waiters, []
+        for loop, fut in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, fut)
+            except RuntimeError:  # that loop is closed
+                pass
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_cut >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._last_cut = now
+
+
+def _resolve(fut: "asyncio.Future") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+# ────────────────────────── DEADLINES & BACKOFF ───────────────────────
+class DeadlineExceeded(TimeoutError):
+    """A model call did not answer within its per-call deadline."""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Worth retrying after a pause: throttling, 5xx, timeouts, dropped connections."""
+    return is_throttle_error(exc) or isinstance(exc, (TimeoutError, ConnectionError))
+
+
+class Backoff:
+    """
+    Exponential backoff with jitter for transient errors.
+
+    Attempt `n` (0-based) waits a random time in `[0, min(max_delay,
+    base * factor**n)]` ("full jitter"), so clients that failed together do
+    not retry together. At most `retries` retries are made.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = 3,
+        base: float = 0.5,
+        factor: float = 2.0,
+        max_delay: float = 30.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.retries, self.base, self.factor, self.max_delay = retries, base, factor, max_delay
+        self._rng = random.Random(seed)
+
+    def delay(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.max_delay, self.base * self.factor ** attempt))
+
+
+# ────────────────────────── HEDGING ───────────────────────────────────
+class HedgePolicy:
+    """
+    When to send a duplicate of a slow request.
+
+    Latencies of successful calls go into a sliding window of `window`
+    samples; once `min_samples` are in, a request still unanswered after the
+    window's `percentile` latency (never less than `min_delay`) gets a
+    hedge, up to `max_hedges` per request. Before that, `initial_delay` is
+    used if set, otherwise nothing is hedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        *,
+        min_delay: float = 0.0,
+        initial_delay: Optional[float] = None,
+        window: int = 256,
+        min_samples: int = 20,
+        max_hedges: int = 1,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.percentile, self.min_delay, self.initial_delay = percentile, min_delay, initial_delay
+        self.min_samples, self.max_hedges = min_samples, max_hedges
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None for no hedge."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[idx])
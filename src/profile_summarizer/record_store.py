@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, overload
+
+Record = Dict[str, Any]
+
+
+# ────────────────────────── COLUMN ────────────────────────────────────
+class _Column:
+    """
+    Values of one attribute across rows.
+
+    `mask is None` means the column is dense: every row has a value and
+    `values[i]` belongs to row i. Once a row lacks the attribute the column
+    switches to a presence mask (one byte per row) and `values` only holds
+    the present cells, in row order.
+    """
+
+    __slots__ = ("values", "mask")
+
+    def __init__(self, missing_rows: int = 0) -> None:
+        self.values: List[Any] = []
+        self.mask: Optional[bytearray] = bytearray(missing_rows) if missing_rows else None
+
+    def push(self, value: Any) -> None:
+        self.values.append(value)
+        if self.mask is not None:
+            self.mask.append(1)
+
+    def skip(self) -> None:
+        if self.mask is None:
+            self.mask = bytearray(b"\x01") * len(self.values)
+        self.mask.append(0)
+
+    def get(self, row: int) -> Any:
+        if self.mask is None:
+            return self.values[row]
+        if not self.mask[row]:
+            return _MISSING
+        return self.values[self.mask.count(1, 0, row)]
+
+
+_MISSING = object()
+
+
+# ────────────────────────── RECORD STORE ──────────────────────────────
+class RecordStore:
+    """
+    Columnar queue of profile records.
+
+    Attribute keys are interned once and each attribute's values live in a
+    per-column list, with a sparse presence mask for optional attributes
+    (`pronouns`, `company`, ...). Reading rows back yields plain dicts, so
+    code that expects a list of dicts (prompt rendering, batch planning)
+    keeps working; those dicts are rebuilt on access, so mutating one does
+    not change the stored row. Keys come back in first-seen column order.
+    """
+
+    __slots__ = ("_columns", "_rows")
+
+    def __init__(self, records: Iterable[Record] = ()) -> None:
+        self._columns: Dict[str, _Column] = {}
+        self._rows = 0
+        self.extend(records)
+
+    # writing -----------------------------------------------------------
+    def append(self, record: Record) -> None:
+        columns, row = self._columns, self._rows
+        seen = 0
+        for key, value in record.items():
+            col = columns.get(key)
+            if col is None:
+                col = columns[sys.intern(key)] = _Column(row)
+            col.push(value)
+            seen += 1
+        if seen != len(columns):
+            for key, col in columns.items():
+                if key not in record:
+                    col.skip()
+        self._rows = row + 1
+
+    def extend(self, records: Iterable[Record]) -> None:
+        for rec in records:
+            self.append(rec)
+
+    def clear(self) -> None:
+        self._columns.clear()
+        self._rows = 0
+
+    # reading -----------------------------------------------------------
+    def __len__(self) -> int:
+        return self._rows
+
+    def __iter__(self) -> Iterator[Record]:
+        cols = [(key, col.values, col.mask) for key, col in self._columns.items()]
+        if cols and all(mask is None for _, _, mask in cols):
+            # every record has every key: rebuild rows straight from the columns
+            keys = [key for key, _, _ in cols]
+            for vals in zip(*(values for _, values, _ in cols)):
+                yield dict(zip(keys, vals))
+            return
+        cursors = [0] * len(cols)
+        for row in range(self._rows):
+            rec: Record = {}
+            for j, (key, values, mask) in enumerate(cols):
+                if mask is None:
+                    rec[key] = values[row]
+                elif mask[row]:
+                    rec[key] = values[cursors[j]]
+                    cursors[j] += 1
+            yield rec
+
+    @overload
+    def __getitem__(self, index: int) -> Record: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Record]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Record, List[Record]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("record index out of range")
+        rec: Record = {}
+        for key, col in self._columns.items():
+            value = col.get(index)
+            if value is not _MISSING:
+                rec[key] = value
+        return rec
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RecordStore):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return len(other) == self._rows and list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RecordStore(rows={self._rows}, columns={list(self._columns)})"
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import csv, json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import sqlite3
+
+Row = Dict[str, Any]
+
+FIELDS = ("id", "index", "summary", "error")
+
+
+# ────────────────────────── BASE SINK ─────────────────────────────────
+class ResultSink:
+    """
+    Destination for per-record results of a batch run.
+
+    `write` buffers one row (`id`, `index`, `summary`, `error`) and hands
+    the buffer to `_write_rows` every `batch_size` rows, so memory stays
+    bounded by the batch size no matter how long the run is. Use as a
+    context manager, or call `close()` to flush the tail.
+    """
+
+    def __init__(self, *, batch_size: int = 500) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer: List[Row] = []
+        self._closed = False
+
+    def write(self, row: Row) -> None:
+        if self._closed:
+            raise ValueError("sink is closed")
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        if not self._closed:
+            self.flush()
+            self._close()
+            self._closed = True
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    # subclass hooks ----------------------------------------------------
+    def _write_rows(self, rows: List[Row]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+
+# ────────────────────────── FILE SINKS ────────────────────────────────
+class NDJSONSink(ResultSink):
+    """One JSON object per line."""
+
+    def __init__(self, path: str | Path, *, batch_size: int = 500, append: bool = False) -> None:
+        super().__init__(batch_size=batch_size)
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a" if append else "w", encoding="utf-8")
+
+    def _write_rows(self, rows: List[Row]) -> None:
+        self._fh.write(
+            "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in rows)
+        )
+        self._fh.flush()
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+class CSVSink(ResultSink):
+    """CSV with an `id,index,summary,error` header."""
+
+    def __init__(self, path: str | Path, *, batch_size: int = 500, append: bool = False) -> None:
+        super().__init__(batch_size=batch_size)
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not (append and self.path.exists() and self.path.stat().st_size)
+        self._fh = self.path.open("a" if append else "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._fh, fieldnames=FIELDS, extrasaction="ignore")
+        if fresh:
+            self._writer.writeheader()
+
+    def _write_rows(self, rows: List[Row]) -> None:
+        self._writer.writerows(rows)
+        self._fh.flush()
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+# ────────────────────────── SQLITE SINK ───────────────────────────────
+class SQLiteSink(ResultSink):
+    """
+    Rows upserted into `table` by input index, one transaction per flushed
+    batch. Ids are a plain column, so records sharing an id keep their own
+    rows; rewriting an index (a rerun) replaces that row.
+    """
+
+    def __init__(
+        self, path: str | Path, *, table: str = "results", batch_size: int = 500
+    ) -> None:
+        import sqlite3
+
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        super().__init__(batch_size=batch_size)
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self._db: Optional["sqlite3.Connection"] = sqlite3.connect(
+            str(self.path), isolation_level=None, timeout=30
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " idx INTEGER PRIMARY KEY, id TEXT, summary TEXT, error TEXT)"
+        )
+
+    def _write_rows(self, rows: List[Row]) -> None:
+        assert self._db is not None
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (id, idx, summary, error)"
+                " VALUES (?, ?, ?, ?)",
+                [(str(r["id"]), r["index"], r["summary"], r["error"]) for r in rows],
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def open_sink(path: str | Path, **options: Any) -> ResultSink:
+    """Pick a sink from the file suffix: .ndjson/.jsonl, .csv, .db/.sqlite."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".ndjson", ".jsonl"):
+        return NDJSONSink(path, **options)
+    if suffix == ".csv":
+        return CSVSink(path, **options)
+    if suffix in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteSink(path, **options)
+    raise ValueError(f"No result sink for {suffix!r} files")
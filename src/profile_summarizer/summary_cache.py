@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib, json, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+# ────────────────────────── RESPONSE CACHE ────────────────────────────
+class ResponseCache:
+    """
+    Content-addressed cache for raw model responses.
+
+    Lookups go through an in-memory LRU first and, when `path` is given, an
+    on-disk SQLite table second (disk hits are promoted to memory). Entries
+    older than `ttl` seconds are treated as missing; each tier is trimmed to
+    its size cap by evicting the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        max_entries: int = 1024,
+        max_disk_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+        self._mem: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional["sqlite3.Connection"] = None
+        if path is not None:
+            import sqlite3
+
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                str(path), check_same_thread=False, isolation_level=None, timeout=30
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)"
+            )
+
+    # keys --------------------------------------------------------------
+    @staticmethod
+    def make_key(
+        model_name: str, temperature: float, base_prompt: str, attribute_block: str
+    ) -> str:
+        """Stable hash of everything that determines the model's answer."""
+        payload = json.dumps(
+            [model_name, temperature, base_prompt, attribute_block],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # public API --------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                value, created = hit
+                if not self._expired(created, now):
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._mem[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created, now):
+                        self._db.execute(
+                            "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                        )
+                        self._remember(key, value, created)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._trim_disk()
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry from both tiers; return how many went."""
+        if self.ttl is None:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            stale = [k for k, (_, created) in self._mem.items() if created < cutoff]
+            for k in stale:
+                del self._mem[k]
+            dropped = len(stale)
+            if self._db is not None:
+                cur = self._db.execute("DELETE FROM responses WHERE created < ?", (cutoff,))
+                dropped += cur.rowcount
+            self.evictions += dropped
+            return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "memory_entries": len(self._mem),
+        }
+
+    def __len__(self) -> int:
+        if self._db is not None:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return len(self._mem)
+
+    # helpers -----------------------------------------------------------
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._mem[key] = (value, created)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            if self._db is None:
+                self.evictions += 1
+
+    def _trim_disk(self) -> None:
+        if self.max_disk_entries is None:
+            return
+        cur = self._db.execute(  # type: ignore[union-attr]
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+        self.evictions += max(cur.rowcount, 0)
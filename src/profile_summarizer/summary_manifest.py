@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib, json, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+Record = Dict[str, Any]
+
+_SQL_VARS = 500  # placeholders per IN (...) query, under SQLite's limit
+
+
+# ────────────────────────── FINGERPRINTS ──────────────────────────────
+def record_fingerprint(rec: Record) -> str:
+    """
+    Stable hash of a normalized record.
+
+    Keys are taken in sorted order, the same order the prompt renders them,
+    so two dicts that produce the same attribute block share a fingerprint
+    regardless of their insertion order.
+    """
+    payload = json.dumps(
+        [[k, rec[k]] for k in sorted(rec)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def context_fingerprint(model_name: str, temperature: float, base_prompt: str) -> str:
+    """Hash of the settings that make an old summary stale when they change."""
+    payload = json.dumps([model_name, temperature, base_prompt], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# ────────────────────────── MANIFEST ──────────────────────────────────
+class SummaryManifest:
+    """
+    Record fingerprint → summary map kept between runs.
+
+    Each entry also stores the context fingerprint (model, temperature,
+    prompt) it was produced under; a lookup under a different context is a
+    miss, and the next write replaces the entry. With `path` the manifest
+    lives in a SQLite file, otherwise in memory for the process lifetime.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._mem: Dict[str, Tuple[str, str]] = {}
+        self._db: Optional["sqlite3.Connection"] = None
+        if path is not None:
+            import sqlite3
+
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                str(path), check_same_thread=False, isolation_level=None, timeout=30
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " fingerprint TEXT PRIMARY KEY, context TEXT NOT NULL,"
+                " summary TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+
+    # public API --------------------------------------------------------
+    def get_many(self, fingerprints: Iterable[str], context: str) -> Dict[str, str]:
+        """Summaries for those of `fingerprints` stored under `context`."""
+        wanted = list(dict.fromkeys(fingerprints))
+        found: Dict[str, str] = {}
+        with self._lock:
+            if self._db is None:
+                for fp in wanted:
+                    hit = self._mem.get(fp)
+                    if hit is not None and hit[0] == context:
+                        found[fp] = hit[1]
+            else:
+                for start in range(0, len(wanted), _SQL_VARS):
+                    chunk = wanted[start:start + _SQL_VARS]
+                    rows = self._db.execute(
+                        "SELECT fingerprint, summary FROM summaries"
+                        f" WHERE context = ? AND fingerprint IN ({','.join('?' * len(chunk))})",
+                        (context, *chunk),
+                    )
+                    found.update(rows)
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def set_many(self, items: Iterable[Tuple[str, str]], context: str) -> None:
+        """Store `(fingerprint, summary)` pairs under `context` in one transaction."""
+        items = list(items)
+        now = time.time()
+        with self._lock:
+            if self._db is None:
+                for fp, summary in items:
+                    self._mem[fp] = (context, summary)
+                return
+            with self._transaction():
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO summaries (fingerprint, context, summary, updated)"
+                    " VALUES (?, ?, ?, ?)",
+                    [(fp, context, summary, now) for fp, summary in items],
+                )
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Drop every entry whose fingerprint is not in `keep`; return how many."""
+        keep = set(keep)
+        with self._lock:
+            if self._db is None:
+                stale = [fp for fp in self._mem if fp not in keep]
+                for fp in stale:
+                    del self._mem[fp]
+                return len(stale)
+            with self._transaction():
+                self._db.execute("CREATE TEMP TABLE IF NOT EXISTS keep (fp TEXT PRIMARY KEY)")
+                self._db.execute("DELETE FROM keep")
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO keep VALUES (?)", ((fp,) for fp in keep)
+                )
+                cur = self._db.execute(
+                    "DELETE FROM summaries WHERE fingerprint NOT IN (SELECT fp FROM keep)"
+                )
+                self._db.execute("DELETE FROM keep")
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM summaries")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def __len__(self) -> int:
+        if self._db is not None:
+            return self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        return len(self._mem)
+
+    # helpers -----------------------------------------------------------
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        db = self._db
+        assert db is not None
+        db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import argparse, json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from profile_summarizer_agent import ProfileSummarizerAgent, load_config
+
+if TYPE_CHECKING:
+    import asyncio
+
+Record = Dict[str, Any]
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 502: "Bad Gateway",
+}
+
+
+# ────────────────────────── REQUEST COALESCING ────────────────────────
+class RequestCoalescer:
+    """
+    Turns concurrent single-record requests into multi-record model calls.
+
+    The first record to arrive opens a window of `max_wait_ms`; everything
+    submitted before it closes (or until `max_batch` records are waiting) is
+    planned into budgeted groups by the agent's `_plan_batches` and each
+    group goes out as one prompt built by `_build_prompt_body`. The split
+    summaries are handed back to their callers; a caller whose record
+    failed gets the error. At most `max_in_flight` groups are sent at
+    once. `max_batch=1` disables coalescing.
+    """
+
+    def __init__(
+        self,
+        agent: ProfileSummarizerAgent,
+        *,
+        max_wait_ms: float = 5.0,
+        max_batch: int = 16,
+        max_in_flight: int = 32,
+    ) -> None:
+        if max_batch < 1 or max_in_flight < 1:
+            raise ValueError("max_batch and max_in_flight must be >= 1")
+        self.agent = agent
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self.requests = self.upstream_calls = self.failed = 0
+        self._pending: List[Tuple[asyncio.Future, Record]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, record: Record) -> str:
+        """Summary for one (normalized) record."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._pending.append((fut, record))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        return await fut
+
+    def flush(self) -> None:
+        """Send everything waiting now, without waiting for the window."""
+        import asyncio
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        try:
+            groups = list(self.agent._plan_batches(batch))
+        except Exception as exc:  # e.g. a prompt over max_prompt_tokens: fail, don't hang
+            self._fail(batch, exc)
+            return
+        for group in groups:
+            task = asyncio.ensure_future(self._send(group))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, group: List[Tuple[asyncio.Future, Record]]) -> None:
+        assert self._slots is not None
+        async with self._slots:
+            self.upstream_calls += 1
+            try:
+                outcomes = await self.agent._asummarize_group(self.agent._group_records(group))
+            except Exception as exc:
+                self._fail(group, exc)
+                return
+        for (fut, rec), res in zip(group, outcomes):
+            if res.error is not None:
+                self._fail([(fut, rec)], res.error)
+            elif not fut.done():  # caller may have gone away
+                fut.set_result(res.summary)
+
+    def _fail(self, group: List[Tuple[asyncio.Future, Record]], exc: BaseException) -> None:
+        self.failed += len(group)
+        for fut, _ in group:
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def aclose(self) -> None:
+        """Send what is waiting and wait for every group in flight."""
+        import asyncio
+
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "records_per_call": self.requests / self.upstream_calls if self.upstream_calls else 0.0,
+            "failed": self.failed,
+            "pending": len(self._pending),
+        }
+
+
+# ────────────────────────── HTTP SERVER ───────────────────────────────
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class SummaryServer:
+    """
+    Minimal asyncio HTTP/1.1 front end for the agent (keep-alive, JSON only).
+
+        POST /summarize   {"first_name": ...}  ->  {"summary": "..."}
+        GET  /stats       coalescer counters (+ the agent's metrics snapshot)
+        GET  /metrics     Prometheus text, when the agent has `metrics`
+        GET  /healthz     {"ok": true}
+
+    Incoming records are normalized like queued inputs and go through a
+    `RequestCoalescer`; model failures come back as 502.
+    """
+
+    def __init__(
+        self,
+        agent: ProfileSummarizerAgent,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_wait_ms: float = 5.0,
+        max_batch: int = 16,
+        max_in_flight: int = 32,
+        max_body: int = 1 << 20,
+    ) -> None:
+        self.agent = agent
+        self.host, self._port = host, port
+        self.max_body = max_body
+        self.coalescer = RequestCoalescer(
+            agent, max_wait_ms=max_wait_ms, max_batch=max_batch, max_in_flight=max_in_flight
+        )
+        self._server: Optional[asyncio.Server] = None
+
+    @property
+    def port(self) -> int:
+        """The bound port (useful after starting on port 0)."""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def start(self) -> "SummaryServer":
+        import asyncio
+
+        self._server = await asyncio.start_server(self._handle, self.host, self._port)
+        return self
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def aclose(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.coalescer.aclose()
+
+    async def __aenter__(self) -> "SummaryServer":
+        return await self.start()
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    # connection handling -----------------------------------------------
+    async def _handle(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter") -> None:
+        import asyncio
+
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _HTTPError as exc:  # unreadable request: answer, then hang up
+                    await _respond(writer, exc.status, *_error(exc), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, ctype, payload = await self._dispatch(method, path, body)
+                except _HTTPError as exc:
+                    status, (ctype, payload) = exc.status, _error(exc)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _respond(writer, status, ctype, payload, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: "asyncio.StreamReader"
+    ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise _HTTPError(400, "malformed request line") from None
+        headers: Dict[str, str] = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise _HTTPError(400, "bad Content-Length") from None
+        if length > self.max_body:
+            raise _HTTPError(413, f"body over {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        if path == "/summarize":
+            if method != "POST":
+                raise _HTTPError(405, "use POST")
+            try:
+                rec = json.loads(body or b"null")
+            except ValueError as exc:
+                raise _HTTPError(400, f"invalid JSON: {exc}") from None
+            if not isinstance(rec, dict):
+                raise _HTTPError(400, "body must be a JSON object")
+            rec = self.agent._normalize_record(rec, True, True)
+            try:
+                summary = await self.coalescer.submit(rec)
+            except Exception as exc:
+                raise _HTTPError(502, f"model call failed: {exc!r}") from None
+            return 200, "application/json", _json({"summary": summary})
+        if method != "GET":
+            raise _HTTPError(405 if path in ("/stats", "/metrics", "/healthz") else 404, path)
+        if path == "/healthz":
+            return 200, "application/json", _json({"ok": True})
+        if path == "/stats":
+            stats: Dict[str, Any] = {"coalescer": self.coalescer.stats()}
+            if self.agent.metrics is not None:
+                stats["metrics"] = self.agent.metrics.snapshot()
+            return 200, "application/json", _json(stats)
+        if path == "/metrics" and self.agent.metrics is not None:
+            return 200, "text/plain; version=0.0.4", self.agent.metrics.prometheus().encode()
+        raise _HTTPError(404, path)
+
+
+def _json(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _error(exc: _HTTPError) -> Tuple[str, bytes]:
+    return "application/json", _json({"error": str(exc)})
+
+
+async def _respond(
+    writer: "asyncio.StreamWriter", status: int, ctype: str, payload: bytes, *, keep_alive: bool
+) -> None:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {ctype}\r\nContent-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + payload)
+    await writer.drain()
+
+
+# ────────────────────────── CLI ───────────────────────────────────────
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="profile-summarizer-serve", description="Serve summaries over HTTP.")
+    p.add_argument("-c", "--config", required=True, help="agent config file")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--max-wait-ms", type=float, default=5.0, help="coalescing window")
+    p.add_argument("--max-batch", type=int, default=16, help="records per coalesced call")
+    p.add_argument("--max-in-flight", type=int, default=32, help="concurrent model calls")
+    p.add_argument("--model", help="override model_name from the config")
+    p.add_argument("--backend", help="override the backend ('gemini' or 'fake')")
+    args = p.parse_args(argv)
+
+    cfg = load_config(args.config)
+    if args.model:
+        cfg["model_name"] = args.model
+    if args.backend:
+        cfg["backend"] = args.backend
+    server = SummaryServer(
+        ProfileSummarizerAgent(**cfg), host=args.host, port=args.port,
+        max_wait_ms=args.max_wait_ms, max_batch=args.max_batch,
+        max_in_flight=args.max_in_flight,
+    )
+    import asyncio
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Record = Dict[str, Any]
+Verdict = Tuple[Optional[str], List[str]]  # (summary or None if missing, violations)
+
+NAME_FIELDS = ("preferred_name", "first_name", "name")
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_FIRST_WORD = re.compile(r"[\W_]*(\w+)")
+_KEY_ECHO = re.compile(r"(?m)^[^\w\n]*([A-Za-z][\w ]{0,40}?)\s*:")
+
+
+# ────────────────────────── VALIDATOR ─────────────────────────────────
+class SummaryValidator:
+    """
+    Checks model output against the prompt's acceptance criteria, per record.
+
+    Rules, each derived from the summary's own input record:
+      • not empty, and a single paragraph;
+      • at most `max_chars` characters (None: no limit);
+      • starts with the record's first name (first of `name_fields` present);
+      • no echoed `key:` lines for the record's attribute keys.
+
+    `check_response` splits a multi-record response in one pass and returns
+    a verdict per record. When the paragraph count is off, paragraphs are
+    matched to records by their leading name (in order) instead of failing
+    the whole response, so only the records left without a paragraph count
+    as missing.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_chars: Optional[int] = 120,
+        name_fields: Sequence[str] = NAME_FIELDS,
+        forbid_key_echo: bool = True,
+    ) -> None:
+        self.max_chars = max_chars
+        self.name_fields = tuple(name_fields)
+        self.forbid_key_echo = forbid_key_echo
+
+    def first_name(self, rec: Record) -> Optional[str]:
+        for field in self.name_fields:
+            value = rec.get(field)
+            if value:
+                m = _FIRST_WORD.match(str(value))
+                if m:
+                    return m.group(1)
+        return None
+
+    def check(self, summary: str, rec: Record) -> List[str]:
+        """Rule violations of one summary (empty list: it passes)."""
+        text = summary.strip()
+        if not text:
+            return ["empty"]
+        problems: List[str] = []
+        if _PARAGRAPH_SPLIT.search(text):
+            problems.append("more than one paragraph")
+        if self.max_chars is not None and len(text) > self.max_chars:
+            problems.append(f"{len(text)} chars > {self.max_chars}")
+        name = self.first_name(rec)
+        if name is not None:
+            m = _FIRST_WORD.match(text)
+            if m is None or m.group(1).casefold() != name.casefold():
+                problems.append(f"does not start with {name!r}")
+        if self.forbid_key_echo:
+            keys = {str(k).strip().lower().replace(" ", "_") for k in rec}
+            for m in _KEY_ECHO.finditer(text):
+                if m.group(1).strip().lower().replace(" ", "_") in keys:
+                    problems.append(f"echoes attribute {m.group(1).strip()!r}")
+                    break
+        return problems
+
+    def check_response(self, text: str, records: Sequence[Record]) -> List[Verdict]:
+        """Split `text` into one summary per record and check each."""
+        text = text.strip()
+        if len(records) == 1:
+            parts = [text]
+        else:
+            parts = [p.strip() for p in _PARAGRAPH_SPLIT.split(text) if p.strip()]
+        if len(parts) == len(records):
+            return [(p, self.check(p, rec)) for p, rec in zip(parts, records)]
+        return self._align(parts, records)
+
+    def _align(self, parts: List[str], records: Sequence[Record]) -> List[Verdict]:
+        verdicts: List[Verdict] = [(None, ["missing"]) for _ in records]
+        names = [self.first_name(rec) for rec in records]
+        start = 0
+        for p in parts:
+            m = _FIRST_WORD.match(p)
+            if m is None:
+                continue
+            lead = m.group(1).casefold()
+            for j in range(start, len(records)):
+                if names[j] is not None and names[j].casefold() == lead:  # type: ignore[union-attr]
+                    verdicts[j] = (p, self.check(p, records[j]))
+                    start = j + 1
+                    break
+        return verdicts
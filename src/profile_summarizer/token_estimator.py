@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import math, re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Record = Dict[str, Any]
+
+NAME_FIELDS = ("preferred_name", "first_name", "last_name", "name")
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+# ────────────────────────── TOKEN ESTIMATOR ───────────────────────────
+class TokenEstimator:
+    """
+    Offline token counter for pre-flight prompt sizing.
+
+    Words are split like a BPE tokenizer would see them: ASCII words cost
+    one token per `chars_per_token` characters, other scripts one token per
+    three UTF-8 bytes, punctuation one token each. `scale` corrects the
+    result against a real tokenizer (see `calibrate`). Counts are memoized
+    per string, since attribute values repeat heavily across records.
+    """
+
+    def __init__(
+        self,
+        *,
+        chars_per_token: float = 4.0,
+        scale: float = 1.0,
+        cache_size: int = 8192,
+    ) -> None:
+        if chars_per_token <= 0 or scale <= 0:
+            raise ValueError("chars_per_token and scale must be positive")
+        self.chars_per_token = chars_per_token
+        self.scale = scale
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    def count(self, text: str) -> int:
+        return self._cached_count(text)
+
+    def count_many(self, *texts: str) -> int:
+        return sum(self._cached_count(t) for t in texts)
+
+    def _raw(self, text: str) -> float:
+        cpt = self.chars_per_token
+        total = 0.0
+        for piece in _PIECES.findall(text):
+            if piece.isascii():
+                total += math.ceil(len(piece) / cpt)
+            else:
+                total += math.ceil(len(piece.encode("utf-8")) / 3)
+        return total
+
+    def _count(self, text: str) -> int:
+        return math.ceil(self._raw(text) * self.scale) if text else 0
+
+    def calibrate(self, samples: Iterable[Tuple[str, int]]) -> float:
+        """Fit `scale` to `(text, true_token_count)` pairs; returns the new scale."""
+        raw = actual = 0.0
+        for text, tokens in samples:
+            raw += self._raw(text)
+            actual += tokens
+        if raw and actual:
+            self.scale = actual / raw
+            self._cached_count.cache_clear()
+        return self.scale
+
+    def truncate(self, text: str, max_tokens: int, *, marker: str = "...") -> str:
+        """Longest prefix of `text` (cut at a word boundary) within `max_tokens`."""
+        if self.count(text) <= max_tokens:
+            return text
+        if max_tokens <= self.count(marker):
+            return ""
+        lo, hi = 0, len(text)
+        while lo < hi:  # binary search on the character cut
+            mid = (lo + hi + 1) // 2
+            if self._count(text[:mid] + marker) <= max_tokens:  # uncached: prefixes
+                lo = mid
+            else:
+                hi = mid - 1
+        cut = text[:lo]
+        space = cut.rfind(" ")
+        if space > lo // 2:
+            cut = cut[:space]
+        return cut.rstrip(" ,;") + marker
+
+
+DEFAULT_ESTIMATOR = TokenEstimator()
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Token estimate for `texts` with the shared default estimator."""
+    return DEFAULT_ESTIMATOR.count_many(*texts)
+
+
+# ────────────────────────── RECORD FITTING ────────────────────────────
+def _drop_order(rec: Record, priority: Sequence[str]) -> List[str]:
+    """
+    Keys in the order they are given up: unlisted attributes longest value
+    first, then listed ones lowest priority first, then unlisted name fields.
+    """
+    rank = {k: i for i, k in enumerate(priority)}
+    names = [k for k in NAME_FIELDS if k in rec and k not in rank]
+    unlisted = sorted(
+        (k for k in rec if k not in rank and k not in names),
+        key=lambda k: (-len(_text(rec[k])), k),
+    )
+    listed = sorted((k for k in rec if k in rank), key=rank.__getitem__, reverse=True)
+    return unlisted + listed + names[::-1]
+
+
+def _text(value: Any) -> str:
+    return ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+
+
+def fit_record(
+    rec: Record,
+    max_tokens: int,
+    *,
+    measure: Callable[[Record], int],
+    estimator: Optional[TokenEstimator] = None,
+    priority: Sequence[str] = (),
+) -> Record:
+    """
+    Shrink `rec` until `measure(rec)` (its token cost) is within `max_tokens`.
+
+    Attributes are dropped while more than one remains: those not in
+    `priority` first (longest value first), then the listed ones lowest
+    priority first. Name fields are kept to the end unless `priority` ranks
+    them. The last one standing has its text truncated. Returns `rec` itself
+    if it already fits.
+    """
+    if measure(rec) <= max_tokens:
+        return rec
+    estimator = estimator or DEFAULT_ESTIMATOR
+    out = dict(rec)
+    for key in _drop_order(rec, priority)[:-1]:
+        del out[key]
+        if measure(out) <= max_tokens:
+            return out
+
+    (key, value), = out.items()
+    text = _text(value)
+    overhead = measure({key: ""})
+    return {key: estimator.truncate(text, max(0, max_tokens - overhead))}
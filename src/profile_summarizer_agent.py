@@ -1,39 +1,121 @@
 from __future__ import annotations
 
-import json, configparser, os
+# Keep module import cheap: asyncio, concurrent.futures, configparser, YAML,
+# the Gemini SDK and .env loading are all deferred to first use.
+import itertools, json, os, re, threading, time
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List,
+    Optional, Sequence, Tuple, TypeVar, Union,
+)
 
-from dotenv import load_dotenv
-load_dotenv()
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-# YAML optional
-try:
-    import yaml  # type: ignore
-except ImportError:
-    yaml = None  # type: ignore
+    from profile_summarizer.job_journal import RunJournal
+    from profile_summarizer.near_duplicates import NearDuplicateIndex
+    from profile_summarizer.result_sinks import ResultSink
+    from profile_summarizer.summary_validator import SummaryValidator
 
-import google.generativeai as genai
+from profile_summarizer.metrics import Metrics, timed
+from profile_summarizer.model_backends import (
+    FakeBackend, GeminiBackend, ModelBackend, StreamingBackend,
+)
+from profile_summarizer.prompt_template import PromptTemplate
+from profile_summarizer.record_store import RecordStore
+from profile_summarizer.rate_control import (
+    AdaptiveConcurrency, Backoff, DeadlineExceeded, HedgePolicy, RateLimiter,
+    is_throttle_error, is_transient_error,
+)
+from profile_summarizer.summary_cache import ResponseCache
+from profile_summarizer.summary_manifest import (
+    SummaryManifest, context_fingerprint, record_fingerprint,
+)
+from profile_summarizer.token_estimator import TokenEstimator, fit_record
 
 # ────────────────────────── CONFIG LOADER ─────────────────────────────
+# resolved config path + cwd -> (stat fingerprint of every file read, config)
+_Fingerprint = Tuple[Tuple[str, int, int], ...]
+_CONFIG_CACHE: Dict[Tuple[Path, str], Tuple[_Fingerprint, Dict[str, Any]]] = {}
+_CONFIG_LOCK = threading.Lock()
+
+
 def load_config(path: str | Path, _depth: int = 0) -> Dict[str, Any]:
-    if _depth > 3:
-        raise RuntimeError("Config indirection loop detected")
+    """
+    Load a JSON / YAML / INI / key=value config, following `@@` pointers.
 
+    Results are memoized per resolved path. A cached entry is reused until
+    the mtime or size of any file in its pointer chain changes, including
+    inlined `@@` value files such as prompts. Each file is stat-ed just
+    before it is read, so an edit racing the read invalidates the entry.
+    Callers get a fresh copy.
+    """
     path = Path(path).expanduser()
     if not path.exists():
         raise FileNotFoundError(path)
 
+    key = (path.resolve(), os.getcwd())
+    with _CONFIG_LOCK:
+        entry = _CONFIG_CACHE.get(key)
+    if entry is not None and _fingerprint(p for p, _, _ in entry[0]) == entry[0]:
+        return dict(entry[1])
+
+    deps: List[Tuple[str, int, int]] = []
+    cfg = _load_config_uncached(path, _depth, deps)
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE[key] = (tuple(deps), cfg)
+    return dict(cfg)
+
+
+def clear_config_cache() -> None:
+    """Forget every memoized config (the next `load_config` re-reads files)."""
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE.clear()
+
+
+def _fingerprint(paths: Iterable[str]) -> _Fingerprint:
+    return tuple(_stat(p) for p in paths)
+
+
+def _stat(p: str) -> Tuple[str, int, int]:
+    try:
+        st = os.stat(p)
+        return (p, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (p, -1, -1)
+
+
+def _load_config_uncached(
+    path: Path, depth: int, deps: List[Tuple[str, int, int]]
+) -> Dict[str, Any]:
+    """Parse `path`, appending the stat of every file read to `deps` before reading it."""
+    if depth > 3:
+        raise RuntimeError("Config indirection loop detected")
+    if not path.exists():
+        raise FileNotFoundError(path)
+    deps.append(_stat(str(path.resolve())))
+
     ext = path.suffix.lower()
     if ext == ".json":
         obj: Any = json.loads(path.read_text("utf-8"))
     elif ext in {".yaml", ".yml"}:
-        if yaml is None:
-            raise ImportError("pip install pyyaml to parse YAML")
-        obj = yaml.safe_load(path.read_text("utf-8"))  # type: ignore
+        try:
+            import yaml  # type: ignore
+        except ImportError:
+            raise ImportError("pip install pyyaml to parse YAML") from None
+        try:
+            obj = yaml.safe_load(path.read_text("utf-8"))
+        except yaml.YAMLError as exc:
+            raise ValueError(f"Invalid YAML in {path}: {exc}") from exc
     elif ext == ".ini":
+        import configparser
+
         cp = configparser.ConfigParser()
-        cp.read(path, encoding="utf-8")
+        try:
+            cp.read(path, encoding="utf-8")
+        except configparser.Error as exc:
+            raise ValueError(f"Invalid INI in {path}: {exc}") from exc
         sect = cp.defaults() or cp["DEFAULT"]
         obj = {k: _infer(sect[k]) for k in sect}
     elif ext == ".txt":
@@ -44,18 +126,89 @@ def load_config(path: str | Path, _depth: int = 0) -> Dict[str, Any]:
     # follow root-level @@ pointer
     if isinstance(obj, str) and obj.startswith("@@"):
         target = (path.parent / obj[2:]).resolve()
-        return load_config(target, _depth + 1)
+        return _load_config_uncached(target, depth + 1, deps)
 
     # expand inline @@ pointers inside dict values
     if isinstance(obj, dict):
         for k, v in obj.items():
             if isinstance(v, str) and v.startswith("@@"):
-                obj[k] = Path(v[2:]).read_text("utf-8")
+                inline = _resolve_inline(v[2:], path.parent)
+                deps.append(_stat(str(inline)))
+                obj[k] = inline.read_text("utf-8")
         return obj
 
     raise ValueError("Config must resolve to a dict")
 
 
+def _resolve_inline(ref: str, config_dir: Path) -> Path:
+    """Inline `@@file`: relative to the working directory, else to the config."""
+    p = Path(ref).expanduser()
+    if not p.is_absolute() and not p.exists() and (config_dir / p).exists():
+        p = config_dir / p
+    return p.resolve()
+
+
+class ConfigWatcher:
+    """
+    Poll a config file (and its whole pointer chain) for changes.
+
+    `check()` performs one poll and calls `on_change(cfg)` when the loaded
+    config differs from the last one seen; `start()` runs it every `interval`
+    seconds on a daemon thread until `stop()`. Unparseable files (JSON / YAML
+    / INI saved half-way) are skipped until the next good write; errors from
+    `on_change` are logged and do not stop the thread.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        on_change: Callable[[Dict[str, Any]], None],
+        *,
+        interval: float = 2.0,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.on_change = on_change
+        self.interval = interval
+        self._last = load_config(self.path)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        try:
+            cfg = load_config(self.path)
+        except (OSError, ValueError, RuntimeError):
+            return False  # mid-write or briefly invalid: keep the old config
+        if cfg == self._last:
+            return False
+        self._last = cfg
+        self.on_change(cfg)
+        return True
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="config-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                import logging
+
+                logging.getLogger(__name__).exception("config reload of %s failed", self.path)
+
+
 def _parse_kv_text(p: Path) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
     for line in p.read_text("utf-8").splitlines():
@@ -78,24 +231,478 @@ def _infer(val: str) -> Any:
     except ValueError:
         return val
 
+# ────────────────────────── RECORD INGESTION ──────────────────────────
+Record = Dict[str, Any]
+
+_JSON_CHUNK = 1 << 16
+
+
+def normalize_record(
+    rec: Record, lower_keys: bool = True, strip_strings: bool = True
+) -> Record:
+    """Normalize keys/values for consistent prompting."""
+    out: Record = {}
+    for k, v in rec.items():
+        key = k.lower() if lower_keys else k
+        if isinstance(v, str) and strip_strings:
+            out[key] = v.strip()
+        elif isinstance(v, list) and strip_strings:
+            out[key] = [x.strip() if isinstance(x, str) else x for x in v]
+        else:
+            out[key] = v
+    return out
+
+
+def _normalized(
+    objs: Iterator[Record], lower_keys: bool, strip_strings: bool
+) -> Iterator[Record]:
+    for obj in objs:
+        yield normalize_record(obj, lower_keys, strip_strings)
+
+
+def iter_profiles_from_json(
+    path: str | Path,
+    *,
+    lower_keys: bool = True,
+    strip_strings: bool = True,
+    chunk_size: int = _JSON_CHUNK,
+) -> Iterator[Record]:
+    """
+    Stream normalized profile records out of a JSON file.
+
+    Accepts a single dict, a top-level list of dicts, or NDJSON / concatenated
+    dicts. The file is decoded `chunk_size` characters at a time, so memory is
+    bounded by the largest single record rather than by the file.
+    """
+    return _normalized(
+        _iter_json_objects(Path(path).expanduser(), chunk_size), lower_keys, strip_strings
+    )
+
+
+def _iter_json_objects(path: Path, chunk_size: int) -> Iterator[Record]:
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as fh:
+        buf, pos, eof = "", 0, False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return buf[pos] if pos < len(buf) else ""
+
+        def decode() -> Any:
+            nonlocal pos
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # a number or literal cut at the chunk edge may still be growing
+                if end == len(buf) and not eof and fill():
+                    continue
+                pos = end
+                return obj
+
+        first = skip_ws()
+        if first == "":
+            raise json.JSONDecodeError("Expecting value", buf, 0)
+
+        if first == "[":
+            pos += 1
+            i = 0
+            if skip_ws() == "]":
+                return
+            while True:
+                item = decode()
+                if not isinstance(item, dict):
+                    raise TypeError(
+                        f"Item #{i} in {path} is {type(item).__name__}, expected dict"
+                    )
+                yield item
+                i += 1
+                sep = skip_ws()
+                pos += 1
+                if sep == "]":
+                    return
+                if sep != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos - 1)
+                skip_ws()
+
+        while first:
+            obj = decode()
+            if not isinstance(obj, dict):
+                raise TypeError(
+                    f"Top-level JSON in {path} must be dict or list[dict], "
+                    f"got {type(obj).__name__}"
+                )
+            yield obj
+            first = skip_ws()
+
+
+def iter_profiles_from_ndjson(
+    path: str | Path,
+    *,
+    lower_keys: bool = True,
+    strip_strings: bool = True,
+    skip: int = 0,
+) -> Iterator[Record]:
+    """
+    Stream normalized records from a newline-delimited JSON file.
+
+    The first `skip` records are passed over without being decoded, which is
+    how a resumed job jumps to its offset.
+    """
+    return _normalized(
+        _iter_ndjson_objects(Path(path).expanduser(), skip), lower_keys, strip_strings
+    )
+
+
+def _iter_ndjson_objects(path: Path, skip: int = 0) -> Iterator[Record]:
+    with path.open("r", encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            if skip:
+                skip -= 1
+                continue
+            obj = json.loads(line)
+            if not isinstance(obj, dict):
+                raise TypeError(
+                    f"Line {lineno} in {path} is {type(obj).__name__}, expected dict"
+                )
+            yield obj
+
+
+# ────────────────────────── BATCH RESULTS ─────────────────────────────
+
+
+class SummaryResult:
+    """
+    Outcome of one model request issued by the batch engine.
+
+    `violations` lists the `validator` rules a summary still breaks after
+    the retry budget ran out; such a summary is kept (`ok`), but flagged.
+    """
+
+    __slots__ = ("index", "records", "summary", "error", "violations")
+
+    def __init__(
+        self,
+        index: int,
+        records: List[Record],
+        summary: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        violations: Sequence[str] = (),
+    ) -> None:
+        self.index = index
+        self.records = records
+        self.summary = summary
+        self.error = error
+        self.violations = list(violations)
+
+    def __repr__(self) -> str:
+        extra = f", violations={self.violations!r}" if self.violations else ""
+        return (
+            f"SummaryResult(index={self.index!r}, records={self.records!r}, "
+            f"summary={self.summary!r}, error={self.error!r}{extra})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _group_results(
+    group: List[Record],
+    summaries: Optional[List[str]] = None,
+    *,
+    error: Optional[BaseException] = None,
+) -> List[SummaryResult]:
+    """One single-record `SummaryResult` per record of `group`, by position."""
+    texts: List[Optional[str]] = list(summaries) if summaries is not None else [None] * len(group)
+    return [SummaryResult(j, [rec], text, error) for j, (rec, text) in enumerate(zip(group, texts))]
+
+
+# ────────────────────────── BATCH PLANNING ────────────────────────────
+T = TypeVar("T")
+
+_RECORD_SEP = "\n\n"                       # blank line between rendered records
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+
+class SummarySplitError(ValueError):
+    """Model output does not contain one paragraph per requested record."""
+
+
+class _PlannedGroup(List[T]):
+    """
+    A group from `_plan_batches`, carrying the attribute block rendered while
+    planning (`None` when it still has to be fitted to `max_prompt_tokens`).
+    """
+
+    __slots__ = ("block",)
+
+    def __init__(self, items: Iterable[T] = (), block: Optional[str] = None) -> None:
+        super().__init__(items)
+        self.block = block
+
+
+def plan_batches(
+    records: Iterable[T],
+    *,
+    measure: Callable[[T], int],
+    max_chars: Optional[int] = None,
+    max_records: Optional[int] = None,
+    count_tokens: Optional[Callable[[T], int]] = None,
+    max_tokens: Optional[int] = None,
+) -> Iterator[List[T]]:
+    """
+    Greedily pack `records` into groups, lazily.
+
+    A group closes once adding the next record would push the rendered
+    attribute block past `max_chars` (record sizes from `measure`, plus the
+    blank-line separators), past `max_tokens` (record costs from
+    `count_tokens`) or past `max_records` records. A record that is larger
+    than the budget on its own still gets a group of its own. `measure` and
+    `count_tokens` are only called for the budgets that are set.
+    """
+    group: List[T] = []
+    used = tokens_used = size = 0
+    for rec in records:
+        if max_chars is not None:
+            size = measure(rec)
+        extra = size + (len(_RECORD_SEP) if group else 0)
+        tokens = count_tokens(rec) if max_tokens is not None and count_tokens else 0
+        full = bool(group) and (
+            (max_records is not None and len(group) >= max_records)
+            or (max_chars is not None and used + extra > max_chars)
+            or (max_tokens is not None and tokens_used + tokens > max_tokens)
+        )
+        if full:
+            yield group
+            group, used, tokens_used, extra = [], 0, 0, size
+        group.append(rec)
+        used += extra
+        tokens_used += tokens
+    if group:
+        yield group
+
+
+def split_summaries(text: str, expected: int) -> List[str]:
+    """Split a multi-record response into one paragraph per record."""
+    if expected == 1:
+        return [text.strip()]
+    parts = [p.strip() for p in _PARAGRAPH_SPLIT.split(text.strip()) if p.strip()]
+    if len(parts) != expected:
+        raise SummarySplitError(
+            f"Expected {expected} summaries, model returned {len(parts)}"
+        )
+    return parts
+
+
+# ────────────────────────── SCAFFOLD STRIPPING ───────────────────────
+_SUMMARY_WORD = "summary"
+_SUMMARY_MARKER = re.compile(r"(?i)summary\s*:\s*")
+_USER_ATTRIBUTES = re.compile(r"(?i)\buser\s+attributes\s*:\s*")
+
+
+def strip_scaffold(text: str) -> str:
+    """
+    Remove echoed scaffolding like 'Summary:' or 'User attributes:'.
+
+    Everything up to the LAST 'Summary:' (case-insensitive, spaces allowed
+    before the colon) is dropped; with no such marker, a 'User attributes:'
+    prefix is dropped instead.
+    """
+    t = text.strip()
+    end = _last_marker_end(t)
+    if end != -1:
+        return t[end:].strip()
+    m = _USER_ATTRIBUTES.search(t)
+    if m:
+        return t[m.end():].strip()
+    return t
+
+
+def _last_marker_end(text: str) -> int:
+    """End offset of the last 'Summary:' marker in `text`, or -1."""
+    end = -1
+    for m in _SUMMARY_MARKER.finditer(text):
+        end = m.end()
+    return end
+
+
+class ScaffoldStripper:
+    """
+    Incremental `strip_scaffold` for streamed responses.
+
+    Echoed scaffolding comes first in a response, so the head is held back
+    until `holdback` characters of real text follow the last marker seen (or
+    the stream ends, in which case the result is exactly `strip_scaffold` of
+    the whole text). After that text passes straight through, keeping back
+    only trailing whitespace and a tail that could still grow into a
+    'Summary:' marker; a marker that shows up this late is dropped, but the
+    text already emitted before it stands.
+    """
+
+    def __init__(self, holdback: int = 64) -> None:
+        self.holdback = holdback
+        self._head: List[str] = []
+        self._pending = ""
+        self._streaming = False
+
+    def feed(self, chunk: str) -> str:
+        """Take the next raw chunk; return the text that is now safe to show."""
+        if self._streaming:
+            return self._release(self._pending + chunk)
+        self._head.append(chunk)
+        head = "".join(self._head)
+        end = _last_marker_end(head)
+        if end == -1 and _USER_ATTRIBUTES.search(head):
+            return ""  # an echoed attribute block: the summary is still to come
+        body = head if end == -1 else head[end:]
+        if len(body.strip()) < self.holdback:
+            return ""
+        self._streaming, self._head = True, []
+        return self._release(body.lstrip())
+
+    def close(self) -> str:
+        """End of stream: return whatever was still held back."""
+        if not self._streaming:
+            return strip_scaffold("".join(self._head))
+        text = self._drop_markers(self._pending)
+        self._pending = ""
+        return text.rstrip()
+
+    @staticmethod
+    def _drop_markers(text: str) -> str:
+        return _SUMMARY_MARKER.sub("", text)
+
+    def _release(self, text: str) -> str:
+        text = self._drop_markers(text)
+        cut = len(text.rstrip())
+        low = text[:cut].lower()
+        for k in range(min(len(_SUMMARY_WORD), cut), 0, -1):
+            if _SUMMARY_WORD.startswith(low[cut - k:]):
+                cut -= k
+                break
+        self._pending = text[cut:]
+        return text[:cut]
+
+
 # ────────────────────────── MAIN AGENT ────────────────────────────────
+# Thread pool of the batch run in progress; used when `_call_model` is
+# overridden (tests, subclasses) and therefore has to run off the event loop.
+_EXECUTOR: ContextVar[Optional["Executor"]] = ContextVar("_EXECUTOR", default=None)
+
+
+def _make_backend(
+    backend: ModelBackend | str | None, model_name: str, options: Dict[str, Any]
+) -> ModelBackend:
+    if backend is None or backend == "gemini":
+        return GeminiBackend(model_name, **options)
+    if backend == "fake":
+        return FakeBackend(**options)
+    if isinstance(backend, str):
+        raise ValueError(f"Unknown backend {backend!r}; use 'gemini' or 'fake'")
+    return backend
+
+
 class ProfileSummarizerAgent:
     @classmethod
-    def from_config_file(cls, path: str | Path) -> "ProfileSummarizerAgent":
-        return cls(**load_config(path))
+    def from_config_file(
+        cls, path: str | Path, *, watch: Optional[float] = None
+    ) -> "ProfileSummarizerAgent":
+        """
+        Build an agent from a config file.
+
+        With `watch` (seconds) the file is polled and prompt / temperature /
+        batching changes are applied in place, without a new model client.
+        """
+        agent = cls(**load_config(path))
+        agent._config_path = Path(path).expanduser()
+        if watch is not None:
+            agent.watch_config(interval=watch)
+        return agent
 
-    def __init__(self, temp: float, model_name: str, prompt: str) -> None:
+    def __init__(
+        self,
+        temp: float,
+        model_name: str,
+        prompt: str,
+        *,
+        max_prompt_chars: Optional[int] = None,
+        max_records_per_request: Optional[int] = None,
+        batch_retries: int = 1,
+        cache: ResponseCache | str | Path | None = None,
+        cache_ttl: Optional[float] = None,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        adaptive_concurrency: Optional[int] = None,
+        backend: ModelBackend | str | None = None,
+        backend_options: Optional[Dict[str, Any]] = None,
+        max_prompt_tokens: Optional[int] = None,
+        attribute_priority: Sequence[str] = (),
+        token_estimator: Optional[TokenEstimator] = None,
+        metrics: Optional[Metrics] = None,
+        request_timeout: Optional[float] = None,
+        hedge: HedgePolicy | float | None = None,
+        backoff: Optional[Backoff] = None,
+        near_duplicates: "NearDuplicateIndex | float | None" = None,
+        validator: Optional["SummaryValidator"] = None,
+    ) -> None:
         self.base_prompt = prompt.strip()
         self.temperature = temp
         self.model_name = model_name
-        self.inputs: List[Dict[str, Any]] = []
-        self._last_summary: str | None = None
+        self.max_prompt_chars = max_prompt_chars
+        self.max_records_per_request = max_records_per_request
+        self.batch_retries = batch_retries
+        self.max_prompt_tokens = max_prompt_tokens
+        self.attribute_priority = tuple(attribute_priority)
+        self.token_estimator = token_estimator or TokenEstimator()
+        self.metrics = metrics
+        self.request_timeout = request_timeout
+        # numbers may come from JSON / YAML as ints; a bool is a config mistake
+        if isinstance(hedge, bool) or isinstance(near_duplicates, bool):
+            raise TypeError("hedge and near_duplicates take a number or an object, not a bool")
+        if isinstance(hedge, (int, float)):
+            hedge = HedgePolicy(hedge)
+        self.hedge: Optional[HedgePolicy] = hedge
+        self.backoff = backoff
+        if isinstance(near_duplicates, (int, float)):
+            from profile_summarizer.near_duplicates import NearDuplicateIndex
 
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise EnvironmentError("GEMINI_API_KEY missing in .env or shell")
-        genai.configure(api_key=api_key)
-        self._model = genai.GenerativeModel(self.model_name)
+            near_duplicates = NearDuplicateIndex(near_duplicates)
+        self.near_duplicates: Optional["NearDuplicateIndex"] = near_duplicates
+        self.validator = validator
+        self._hedge_pool: Optional["Executor"] = None
+        if isinstance(cache, (str, Path)):
+            cache = ResponseCache(cache, ttl=cache_ttl)
+        self.cache: ResponseCache | None = cache
+        self.rate_limiter = RateLimiter(rpm, tpm) if (rpm or tpm) else None
+        self.concurrency_controller = (
+            AdaptiveConcurrency(adaptive_concurrency) if adaptive_concurrency else None
+        )
+        self.inputs = RecordStore()
+        self._last_summary: str | None = None
+        self._template = PromptTemplate(self.base_prompt)
+        self._backend = _make_backend(backend, model_name, backend_options or {})
+        self._config_path: Optional[Path] = None
+        self._config_watcher: Optional[ConfigWatcher] = None
 
     # public API --------------------------------------------------------
     def append_input(self, user_profile: Dict[str, Any]) -> None:
@@ -115,39 +722,498 @@ class ProfileSummarizerAgent:
         The JSON file may be:
           • a dict   -> appended as one record
           • a list   -> each dict item appended as a record
+          • NDJSON   -> each line appended as a record
+        Records are decoded incrementally (see `iter_profiles_from_json`).
         """
-        path = Path(path).expanduser()
-        data = json.loads(path.read_text("utf-8"))
+        objs = _iter_json_objects(Path(path).expanduser(), _JSON_CHUNK)
+        self._ingest(objs, lower_keys, strip_strings)
 
-        if isinstance(data, dict):
-            self.inputs.append(self._normalize_record(data, lower_keys, strip_strings))
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                if not isinstance(item, dict):
-                    raise TypeError(
-                        f"Item #{i} in {path} is {type(item).__name__}, expected dict"
-                    )
-                self.inputs.append(self._normalize_record(item, lower_keys, strip_strings))
-        else:
-            raise TypeError(
-                f"Top-level JSON in {path} must be dict or list[dict], got {type(data).__name__}"
-            )
+    def append_input_from_ndjson(
+        self,
+        path: str | Path,
+        *,
+        lower_keys: bool = True,
+        strip_strings: bool = True,
+    ) -> None:
+        """Queue every record of a newline-delimited JSON file."""
+        self._ingest(_iter_ndjson_objects(Path(path).expanduser()), lower_keys, strip_strings)
+
+    def append_input_from_csv(
+        self,
+        path: str | Path,
+        *,
+        lower_keys: bool = True,
+        strip_strings: bool = True,
+        **options: Any,
+    ) -> None:
+        """Queue every row of a CSV / TSV export (see `iter_profiles_from_csv`)."""
+        from profile_summarizer.columnar_ingest import iter_profiles_from_csv
+
+        records = iter_profiles_from_csv(
+            path, lower_keys=lower_keys, strip_strings=strip_strings, **options
+        )
+        timed(self.metrics, "ingest", self.inputs.extend, records)
+
+    def append_input_from_arrow(
+        self,
+        source: Any,
+        *,
+        lower_keys: bool = True,
+        strip_strings: bool = True,
+        **options: Any,
+    ) -> None:
+        """Queue every row of Parquet / Arrow data (see `iter_profiles_from_arrow`)."""
+        from profile_summarizer.columnar_ingest import iter_profiles_from_arrow
+
+        records = iter_profiles_from_arrow(
+            source, lower_keys=lower_keys, strip_strings=strip_strings, **options
+        )
+        timed(self.metrics, "ingest", self.inputs.extend, records)
 
     def final_result(self) -> str | None:
         return self._last_summary
 
+    # config reload -----------------------------------------------------
+    def reload_config(self) -> None:
+        """Re-read the config this agent came from and apply what changed."""
+        if self._config_path is None:
+            raise ValueError("Agent was not created with from_config_file")
+        self._apply_config(load_config(self._config_path))
+
+    def watch_config(self, *, interval: float = 2.0) -> ConfigWatcher:
+        """Start polling the source config; changes apply between requests."""
+        if self._config_path is None:
+            raise ValueError("Agent was not created with from_config_file")
+        if self._config_watcher is None:
+            self._config_watcher = ConfigWatcher(
+                self._config_path, self._apply_config, interval=interval
+            ).start()
+        return self._config_watcher
+
+    def stop_watching_config(self) -> None:
+        if self._config_watcher is not None:
+            self._config_watcher.stop()
+            self._config_watcher = None
+
+    # lifecycle ---------------------------------------------------------
+    def close(self) -> None:
+        """
+        Stop the config watcher and release the hedging thread pool. Calls
+        abandoned after a deadline or a lost hedge are not waited for.
+        """
+        self.stop_watching_config()
+        pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "ProfileSummarizerAgent":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        pool = getattr(self, "_hedge_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _apply_config(self, cfg: Dict[str, Any]) -> None:
+        if "prompt" in cfg:
+            self.base_prompt = str(cfg["prompt"]).strip()
+        if "temp" in cfg:
+            self.temperature = cfg["temp"]
+        for name in (
+            "max_prompt_chars", "max_records_per_request", "batch_retries", "max_prompt_tokens",
+            "request_timeout",
+        ):
+            if name in cfg:
+                setattr(self, name, cfg[name])
+        if "attribute_priority" in cfg:
+            self.attribute_priority = tuple(cfg["attribute_priority"])
+        model_name = cfg.get("model_name", self.model_name)
+        if model_name != self.model_name:
+            self.model_name = model_name
+            if isinstance(self._backend, GeminiBackend):
+                self._backend = GeminiBackend(model_name)
+
+    async def aprocess_many(
+        self,
+        records: Iterable[Union[Record, Sequence[Record]]],
+        *,
+        concurrency: int = 8,
+    ) -> List[SummaryResult]:
+        """
+        Summarise many records with at most `concurrency` requests in flight.
+
+        Each item of `records` is either a single dict (one request for that
+        record) or a list of dicts (one request for the whole group). Results
+        come back in input order; a failing request only marks its own result.
+        Queued `self.inputs` are left untouched.
+        """
+        results: Dict[int, SummaryResult] = {}
+
+        async def run(unit: Tuple[int, Any]) -> None:
+            i, item = unit
+            group = [item] if isinstance(item, dict) else list(item)
+            res = SummaryResult(index=i, records=group)
+            try:
+                raw = await self._agenerate(self._build_prompt_body(group))
+                res.summary = self._postprocess_summary(raw)
+            except Exception as exc:  # isolate per-request failures
+                res.error = exc
+            results[i] = res
+
+        await self._apool(enumerate(records), run, concurrency)
+        return [results[i] for i in range(len(results))]
+
+    def process_many(
+        self,
+        records: Iterable[Union[Record, Sequence[Record]]],
+        *,
+        concurrency: int = 8,
+    ) -> List[SummaryResult]:
+        """Blocking wrapper around `aprocess_many`."""
+        import asyncio
+
+        return asyncio.run(self.aprocess_many(records, concurrency=concurrency))
+
+    async def aprocess_records(
+        self,
+        records: Iterable[Record],
+        *,
+        concurrency: int = 8,
+    ) -> List[SummaryResult]:
+        """
+        Summarise records individually, packing them into budgeted requests.
+
+        Records are grouped by `plan_batches` under `max_prompt_chars` /
+        `max_records_per_request`, each group is one request, and the response
+        is split back into one `SummaryResult` per record (in input order).
+        A group that fails or returns the wrong number of paragraphs is retried
+        on its own up to `batch_retries` times before its records are marked
+        failed. With a `validator`, only records left without a summary fail,
+        and summaries that still break its rules carry `violations`.
+        """
+        results: Dict[int, SummaryResult] = {}
+
+        async def run(group: List[Tuple[int, Record]]) -> None:
+            outcomes = await self._asummarize_group(self._group_records(group))
+            for (i, _), res in zip(group, outcomes):
+                res.index = i
+                results[i] = res
+
+        await self._apool(self._plan_batches(enumerate(records)), run, concurrency)
+        return [results[i] for i in range(len(results))]
+
+    def process_records(
+        self,
+        records: Iterable[Record],
+        *,
+        concurrency: int = 8,
+    ) -> List[SummaryResult]:
+        """Blocking wrapper around `aprocess_records`."""
+        import asyncio
+
+        return asyncio.run(self.aprocess_records(records, concurrency=concurrency))
+
+    async def aprocess_to_sink(
+        self,
+        records: Iterable[Record],
+        sink: "ResultSink",
+        *,
+        concurrency: int = 8,
+        id_field: Optional[str] = "id",
+    ) -> Dict[str, int]:
+        """
+        `aprocess_records` that streams results into `sink` instead of a list.
+
+        Records are pulled from `records` only as workers free up, and each
+        finished group's rows go straight to the sink, so memory stays flat
+        however large the input is. Rows arrive in completion order and carry
+        the record's `id_field` value (falling back to its input index) plus
+        the index itself. Returns counts of written and failed rows; the sink
+        is flushed but left open.
+        """
+
+        def row(i: int, rec: Record, summary: Optional[str], error: Any) -> Dict[str, Any]:
+            rid = rec.get(id_field, i) if id_field else i
+            return {"id": rid, "index": i, "summary": summary,
+                    "error": None if error is None else repr(error)}
+
+        counts = {"written": 0, "failed": 0}
+
+        async def run(group: List[Tuple[int, Record]]) -> None:
+            outcomes = await self._asummarize_group(self._group_records(group))
+            for (i, rec), res in zip(group, outcomes):
+                sink.write(row(i, rec, res.summary, res.error))
+                counts["failed"] += not res.ok
+            counts["written"] += len(group)
+
+        await self._apool(self._plan_batches(enumerate(records)), run, concurrency)
+        sink.flush()
+        return counts
+
+    def process_to_sink(
+        self,
+        records: Iterable[Record],
+        sink: "ResultSink",
+        *,
+        concurrency: int = 8,
+        id_field: Optional[str] = "id",
+    ) -> Dict[str, int]:
+        """Blocking wrapper around `aprocess_to_sink`."""
+        import asyncio
+
+        return asyncio.run(
+            self.aprocess_to_sink(records, sink, concurrency=concurrency, id_field=id_field)
+        )
+
+    async def aprocess_job(
+        self,
+        source: str | Path | Iterable[Record],
+        journal: "str | Path | RunJournal",
+        *,
+        concurrency: int = 8,
+        id_field: Optional[str] = "id",
+        sink: Optional["ResultSink"] = None,
+        restart: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Checkpointed batch run that can be killed and resumed.
+
+        `source` is a JSON / NDJSON / CSV / Parquet / Arrow file (or any
+        iterable of records, which must yield the same records in the same
+        order on every run). Each
+        finished group is appended to `journal` before the next is taken on;
+        a rerun with the same journal starts reading the input at the
+        journal's low-water offset (NDJSON lines before it are not even
+        decoded) and skips records already done. Failed records are not
+        journaled, so a rerun retries them. With `sink`, every journaled row
+        is exported to it once the run ends.
+        """
+        from profile_summarizer.job_journal import RunJournal
+
+        own = not isinstance(journal, RunJournal)
+        if not isinstance(journal, RunJournal):
+            journal = RunJournal(
+                journal,
+                context_fingerprint(self.model_name, self.temperature, self.base_prompt),
+                restart=restart,
+            )
+        start, done = journal.low_water, journal.done
+        counts = {"skipped": start + len(done), "completed": 0, "failed": 0}
+
+        if isinstance(source, (str, Path)):
+            path = Path(source).expanduser()
+            if path.suffix.lower() in (".ndjson", ".jsonl"):
+                records: Iterator[Record] = iter_profiles_from_ndjson(path, skip=start)
+            else:
+                from profile_summarizer.columnar_ingest import iter_profiles_from_file
+
+                records = itertools.islice(iter_profiles_from_file(path), start, None)
+        else:
+            records = itertools.islice(iter(source), start, None)
+        todo = (
+            (i, rec) for i, rec in enumerate(records, start) if i not in done
+        )
+
+        async def run(group: List[Tuple[int, Record]]) -> None:
+            outcomes = await self._asummarize_group(self._group_records(group))
+            done = [
+                {"index": i, "id": rec.get(id_field, i) if id_field else i, "summary": res.summary}
+                for (i, rec), res in zip(group, outcomes)
+                if res.ok
+            ]
+            if done:
+                journal.record(done)  # type: ignore[union-attr]
+            counts["completed"] += len(done)
+            counts["failed"] += len(group) - len(done)
+
+        try:
+            await self._apool(self._plan_batches(todo), run, concurrency)
+            if sink is not None:
+                journal.export(sink)
+        finally:
+            if own:
+                journal.close()
+        return counts
+
+    def process_job(
+        self,
+        source: str | Path | Iterable[Record],
+        journal: "str | Path | RunJournal",
+        *,
+        concurrency: int = 8,
+        id_field: Optional[str] = "id",
+        sink: Optional["ResultSink"] = None,
+        restart: bool = False,
+    ) -> Dict[str, int]:
+        """Blocking wrapper around `aprocess_job`."""
+        import asyncio
+
+        return asyncio.run(
+            self.aprocess_job(
+                source, journal, concurrency=concurrency, id_field=id_field,
+                sink=sink, restart=restart,
+            )
+        )
+
+    async def aprocess_incremental(
+        self,
+        manifest: SummaryManifest,
+        records: Optional[Iterable[Record]] = None,
+        *,
+        concurrency: int = 8,
+        prune: bool = False,
+    ) -> List[SummaryResult]:
+        """
+        Summarise only records that are new or changed since the last run.
+
+        Each record is fingerprinted (`record_fingerprint`) and looked up in
+        `manifest` under the current model / temperature / prompt; hits are
+        reused, misses (deduplicated by fingerprint) go through
+        `aprocess_records` and successful summaries are written back. The
+        result list still covers every record, in input order. Without
+        `records` the queued inputs are used and then cleared, like `process`.
+        With `prune`, manifest entries for records not in this run are dropped.
+        """
+        queued = records is None
+        recs = list(self.inputs if queued else records)  # type: ignore[arg-type]
+        context = context_fingerprint(self.model_name, self.temperature, self.base_prompt)
+        fps = [record_fingerprint(rec) for rec in recs]
+        known = manifest.get_many(fps, context)
+
+        todo: Dict[str, Record] = {}
+        for fp, rec in zip(fps, recs):
+            if fp not in known and fp not in todo:
+                todo[fp] = rec
+        fresh: Dict[str, SummaryResult] = {}
+        if todo:
+            done = await self.aprocess_records(list(todo.values()), concurrency=concurrency)
+            fresh = dict(zip(todo, done))
+            manifest.set_many(
+                (
+                    (fp, res.summary)
+                    for fp, res in fresh.items()
+                    if res.ok and res.summary is not None and not res.violations
+                ),
+                context,
+            )
+        if prune:
+            manifest.prune(fps)
+
+        results: List[SummaryResult] = []
+        for i, (fp, rec) in enumerate(zip(fps, recs)):
+            res = fresh.get(fp)
+            results.append(
+                SummaryResult(index=i, records=[rec], summary=known[fp])
+                if res is None
+                else SummaryResult(i, [rec], res.summary, res.error, res.violations)
+            )
+        if queued:
+            self.inputs.clear()
+        return results
+
+    def process_incremental(
+        self,
+        manifest: SummaryManifest,
+        records: Optional[Iterable[Record]] = None,
+        *,
+        concurrency: int = 8,
+        prune: bool = False,
+    ) -> List[SummaryResult]:
+        """Blocking wrapper around `aprocess_incremental`."""
+        import asyncio
+
+        return asyncio.run(
+            self.aprocess_incremental(
+                manifest, records, concurrency=concurrency, prune=prune
+            )
+        )
+
     def process(self) -> str:
-        """Build prompt from queued inputs, invoke model once, return summary."""
+        """
+        Build prompt(s) from queued inputs, invoke the model, return summary.
+
+        Without a batch budget this is a single request. With one, each
+        planned group is sent separately (retrying only a failing group) and
+        the summaries are joined with blank lines. With `near_duplicates` or
+        a `validator`, groups are split per record: near-duplicates of
+        earlier records are answered from the index and invalid summaries are
+        re-requested (the first record that still fails raises).
+        """
         if not self.inputs:
             raise ValueError("No inputs queued")
-        body = self._build_prompt_body()
-        raw_text = self._call_model(body)               # may be mocked in tests
-        summary = self._postprocess_summary(raw_text)   # <- always strip here
+        parts: List[str] = []
+        for group in self._plan_batches(self.inputs):
+            if self.near_duplicates is None and self.validator is None:
+                parts.append(self._with_retries(self._summarize_block, group))
+                continue
+            for res in self._summarize_group(group):
+                if res.error is not None:
+                    raise res.error
+                parts.append(res.summary)  # type: ignore[arg-type]
+        summary = "\n\n".join(parts)
         self.inputs.clear()
         self._last_summary = summary
         return summary
 
+    def process_stream(self) -> Iterator[str]:
+        """
+        Streaming `process`: yield the summary text as the model produces it.
+
+        Uses the backend's streaming mode when it has one (otherwise each
+        group arrives as a single piece) and strips echoed scaffolding on the
+        fly with `ScaffoldStripper`. Planned groups are streamed one after
+        another, separated by blank lines. A group is retried (`backoff`,
+        then `batch_retries`) only if it fails before yielding anything.
+        `request_timeout` bounds the wait for each chunk, the first one
+        included. Hedging does not apply: a duplicate stream cannot take over
+        one that has already been shown. With `near_duplicates`, records found
+        in the index are emitted from it and only the rest are streamed.
+        Text is shown as it arrives, so `validator` does not apply here.
+        """
+        if not self.inputs:
+            raise ValueError("No inputs queued")
+        parts: List[str] = []
+        for group in self._plan_batches(self.inputs):
+            sep = "\n\n" if parts else ""
+            for piece in self._stream_group(group):
+                if sep:
+                    parts.append(sep)
+                    yield sep
+                    sep = ""
+                parts.append(piece)
+                yield piece
+        self.inputs.clear()
+        self._last_summary = "".join(parts)
+
+    async def aprocess_stream(self) -> AsyncIterator[str]:
+        """Async twin of `process_stream`."""
+        if not self.inputs:
+            raise ValueError("No inputs queued")
+        parts: List[str] = []
+        for group in self._plan_batches(self.inputs):
+            sep = "\n\n" if parts else ""
+            async for piece in self._astream_group(group):
+                if sep:
+                    parts.append(sep)
+                    yield sep
+                    sep = ""
+                parts.append(piece)
+                yield piece
+        self.inputs.clear()
+        self._last_summary = "".join(parts)
+
     # helpers -----------------------------------------------------------
+    def _ingest(self, objs: Iterator[Record], lower_keys: bool, strip_strings: bool) -> None:
+        """Normalize and queue decoded records; with metrics, each normalization is timed."""
+        if self.metrics is None:
+            records = _normalized(objs, lower_keys, strip_strings)
+        else:
+            records = (self._normalize_record(o, lower_keys, strip_strings) for o in objs)
+        timed(self.metrics, "ingest", self.inputs.extend, records)
+
     def _normalize_record(
         self,
         rec: Dict[str, Any],
@@ -155,40 +1221,1017 @@ class ProfileSummarizerAgent:
         strip_strings: bool,
     ) -> Dict[str, Any]:
         """Normalize keys/values for consistent prompting."""
-        out: Dict[str, Any] = {}
-        for k, v in rec.items():
-            key = k.lower() if lower_keys else k
-            if isinstance(v, str) and strip_strings:
-                out[key] = v.strip()
-            elif isinstance(v, list) and strip_strings:
-                out[key] = [x.strip() if isinstance(x, str) else x for x in v]
+        return timed(self.metrics, "normalize", normalize_record, rec, lower_keys, strip_strings)
+
+    @property
+    def prompt_template(self) -> PromptTemplate:
+        """Compiled scaffold for `base_prompt`; rebuilt if the prompt changes."""
+        if self._template.base_prompt is not self.base_prompt:
+            self._template = PromptTemplate(self.base_prompt)
+        return self._template
+
+    def _build_prompt_body(self, records: Optional[Iterable[Record]] = None) -> str:
+        """Render queued (or given) dicts into deterministic 'key: value' lines."""
+        m = self.metrics
+        t0 = time.perf_counter() if m is not None else 0.0
+        records = self.inputs if records is None else records
+        block = getattr(records, "block", None)  # rendered by the planner
+        if block is None:
+            block = self._render_block(records)
+        if m is not None:
+            m.observe("build_prompt", time.perf_counter() - t0)
+        return block
+
+    def _token_budget(self) -> Optional[int]:
+        """Tokens left for the attribute block under `max_prompt_tokens`."""
+        if self.max_prompt_tokens is None:
+            return None
+        template = self.prompt_template
+        budget = self.max_prompt_tokens - self.token_estimator.count_many(
+            template.prefix, template.suffix
+        )
+        if budget <= 0:
+            raise ValueError(
+                f"max_prompt_tokens={self.max_prompt_tokens} does not cover the prompt itself"
+            )
+        return budget
+
+    def _record_tokens(self, rec: Record) -> int:
+        return self.token_estimator.count(self.prompt_template.render_record(rec))
+
+    def _render_block(self, records: Iterable[Record]) -> str:
+        """
+        Attribute block for records the planner has not rendered, checked
+        against `max_prompt_tokens` (each record is rendered once when it fits).
+        """
+        template = self.prompt_template
+        budget = self._token_budget()
+        if budget is None:
+            return template.render_body(records)
+        records = list(records)
+        texts = [template.render_record(rec) for rec in records]
+        if sum(map(self.token_estimator.count, texts)) <= budget:
+            return template.join_rendered(texts)
+        return template.render_body(self._fit_records(records, budget))
+
+    def _fit_records(self, records: List[Record], budget: int) -> List[Record]:
+        """
+        Shrink records that overflow the `max_prompt_tokens` block `budget`.
+
+        Planned groups already fit unless a single record is too large; that
+        record (or, for an unplanned group, each record to an equal share of
+        the budget) loses its lowest-priority attributes, then gets truncated.
+        """
+        share = max(1, budget // max(1, len(records)))
+        return [
+            fit_record(
+                rec,
+                share,
+                measure=self._record_tokens,
+                estimator=self.token_estimator,
+                priority=self.attribute_priority,
+            )
+            for rec in records
+        ]
+
+    def _plan_batches(self, records: Iterable[T]) -> Iterator[List[T]]:
+        """
+        Group records (or `(index, record)` pairs) under the batch budget.
+        Without any budget everything is one group and nothing is measured;
+        otherwise each record is rendered once and its text serves the char
+        measure, the token count and the group's attribute block.
+        """
+        max_tokens = self._token_budget()
+        if self.max_prompt_chars is None and self.max_records_per_request is None \
+                and max_tokens is None:
+            group = list(records)
+            return iter([group] if group else [])
+        budget = self.max_prompt_chars
+        if budget is not None:
+            budget -= self.prompt_template.overhead
+        return self._planned_groups(records, budget, max_tokens)
+
+    def _planned_groups(
+        self, records: Iterable[T], max_chars: Optional[int], max_tokens: Optional[int]
+    ) -> Iterator[List[T]]:
+        template, estimator = self.prompt_template, self.token_estimator
+
+        def rendered(items: Iterable[Any]) -> Iterator[Tuple[Any, str, int]]:
+            for item in items:
+                text = template.render_record(item[1] if isinstance(item, tuple) else item)
+                yield item, text, estimator.count(text) if max_tokens is not None else 0
+
+        for planned in plan_batches(
+            rendered(records),
+            measure=lambda p: len(p[1].strip()),
+            max_chars=max_chars,
+            max_records=self.max_records_per_request,
+            count_tokens=lambda p: p[2],
+            max_tokens=max_tokens,
+        ):
+            fits = max_tokens is None or sum(p[2] for p in planned) <= max_tokens
+            block = template.join_rendered([p[1] for p in planned]) if fits else None
+            yield _PlannedGroup((p[0] for p in planned), block)
+
+    @staticmethod
+    def _group_records(group: List[Tuple[Any, Record]]) -> List[Record]:
+        """The records of a planned `(key, record)` group, keeping its rendered block."""
+        return _PlannedGroup((rec for _, rec in group), getattr(group, "block", None))
+
+    def _retryable(self, exc: Exception) -> bool:
+        """
+        Worth re-sending a group: a response that did not split, or a
+        transient error that `backoff` has not already retried. Anything else
+        (auth, bad config, ...) fails at once.
+        """
+        if isinstance(exc, SummarySplitError):
+            return True
+        return self.backoff is None and is_transient_error(exc)
+
+    def _with_retries(self, fn: Callable[[List[Record], bool], T], group: List[Record]) -> T:
+        """
+        Run `fn(group, fresh)`, retrying just this group up to `batch_retries`
+        times; `fresh` is set on retries so they bypass the response cache.
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn(group, attempt > 0)
+            except Exception as exc:
+                if attempt >= self.batch_retries or not self._retryable(exc):
+                    raise
+                attempt += 1
+                if self.metrics is not None:
+                    self.metrics.inc("retries")
+
+    def _summarize_block(self, group: List[Record], fresh: bool = False) -> str:
+        """One request for `group`, scaffolding stripped."""
+        raw = self._generate(self._build_prompt_body(group), fresh=fresh)
+        return self._postprocess_summary(raw)
+
+    def _split_block(self, group: List[Record], fresh: bool = False) -> List[str]:
+        """
+        One request for `group`, split into one summary per record. The
+        response is cached only once it has split cleanly.
+        """
+        block = self._build_prompt_body(group)
+        raw = self._generate(block, store=False, fresh=fresh)
+        summaries = split_summaries(self._postprocess_summary(raw), len(group))
+        self._cache_put(block, raw)
+        return summaries
+
+    def _summarize_group(self, group: List[Record]) -> List[SummaryResult]:
+        """
+        Summarise `group` into one result per record (indexed by position in
+        the group). Near-duplicates found in the index are not sent; a failed
+        request marks only the records it was for.
+        """
+        if self.near_duplicates is None:
+            return self._summarize_group_uncached(group)
+        reused, todo, context = self._reuse_near_duplicates(group)
+        fresh = self._summarize_group_uncached(todo) if todo else []
+        return self._merge_near_duplicates(group, reused, fresh, context)
+
+    def _summarize_group_uncached(self, group: List[Record]) -> List[SummaryResult]:
+        if self.validator is not None:
+            return self._validated_group(group)
+        try:
+            summaries = self._with_retries(self._split_block, group)
+        except Exception as exc:
+            return _group_results(group, error=exc)
+        return _group_results(group, summaries)
+
+    def _validated_group(self, group: List[Record]) -> List[SummaryResult]:
+        """
+        Request `group`, then re-request only the records whose summaries
+        fail `validator`, up to `batch_retries` more times.
+        """
+        results = _group_results(group)
+        todo, attempt = list(range(len(group))), 0
+        while True:
+            final = attempt >= self.batch_retries
+            block = self._build_prompt_body(
+                group if len(todo) == len(group) else [group[i] for i in todo]
+            )
+            try:
+                raw = self._generate(block, store=False, fresh=attempt > 0)
+            except Exception as exc:
+                if final or not self._retryable(exc):
+                    return self._fail_remaining(results, todo, exc)
             else:
-                out[key] = v
+                todo = self._accept_valid(results, todo, block, raw, final)
+                if not todo:
+                    return results
+            attempt += 1
+            if self.metrics is not None:
+                self.metrics.inc("retries")
+
+    def _accept_valid(
+        self,
+        results: List[SummaryResult],
+        todo: List[int],
+        block: str,
+        raw: str,
+        final: bool,
+    ) -> List[int]:
+        """
+        Store the summaries in `raw` that pass; return the indices still to
+        request. On the `final` attempt nothing is left to request: present
+        summaries are kept with their `violations`, and records with none (or
+        an empty one) are marked failed. The response is cached only if every summary passed.
+        """
+        assert self.validator is not None
+        text = self._postprocess_summary(raw)
+        verdicts = self.validator.check_response(text, [results[i].records[0] for i in todo])
+        if not any(problems for _, problems in verdicts):
+            self._cache_put(block, raw)
+        retry: List[int] = []
+        for i, (summary, problems) in zip(todo, verdicts):
+            res = results[i]
+            if summary and (not problems or final):
+                res.summary, res.violations = summary, problems
+            elif final:
+                res.error = SummarySplitError("no summary for this record after retries")
+            else:
+                retry.append(i)
+        if self.metrics is not None:
+            failed = sum(1 for _, problems in verdicts if problems)
+            if failed:
+                self.metrics.inc("validation_failures", failed)
+        return retry
+
+    @staticmethod
+    def _fail_remaining(
+        results: List[SummaryResult], todo: List[int], exc: BaseException
+    ) -> List[SummaryResult]:
+        for i in todo:
+            results[i].error = exc
+        return results
+
+    def _reuse_near_duplicates(
+        self, group: List[Record]
+    ) -> Tuple[List[Optional[str]], List[Record], str]:
+        index = self.near_duplicates
+        assert index is not None
+        context = context_fingerprint(self.model_name, self.temperature, self.base_prompt)
+        reused: List[Optional[str]] = []
+        for rec in group:
+            hit = index.lookup(rec, context)
+            reused.append(None if hit is None else hit.summary)
+        if self.metrics is not None:
+            hits = sum(s is not None for s in reused)
+            self.metrics.inc("near_duplicate_hits", hits)
+            self.metrics.inc("near_duplicate_misses", len(group) - hits)
+        todo = [rec for rec, s in zip(group, reused) if s is None]
+        return reused, group if len(todo) == len(group) else todo, context
+
+    def _merge_near_duplicates(
+        self,
+        group: List[Record],
+        reused: List[Optional[str]],
+        fresh: List[SummaryResult],
+        context: str,
+    ) -> List[SummaryResult]:
+        """Index the fresh summaries that passed, then interleave them with the reused ones."""
+        index = self.near_duplicates
+        assert index is not None
+        for res in fresh:
+            if res.ok and not res.violations:
+                index.add(res.records[0], res.summary, context)  # type: ignore[arg-type]
+        it = iter(fresh)
+        out: List[SummaryResult] = []
+        for j, (rec, summary) in enumerate(zip(group, reused)):
+            res = next(it) if summary is None else SummaryResult(j, [rec], summary)
+            res.index = j
+            out.append(res)
         return out
 
-    def _build_prompt_body(self) -> str:
-        """Render queued dicts into deterministic 'key: value' lines."""
-        lines: List[str] = []
-        for rec in self.inputs:
-            for k in sorted(rec):
-                v = rec[k]
-                v = ", ".join(v) if isinstance(v, list) else v
-                lines.append(f"{k}: {v}")
-            lines.append("")
-        return "\n".join(lines).strip()
+    def _near_duplicate_runs(
+        self, group: List[Record]
+    ) -> Tuple[List[Tuple[Optional[str], List[Record]]], str]:
+        """
+        `group` cut into consecutive pieces, in order: `(summary, [rec])` for
+        an index hit, `(None, records)` for a run of records still to send.
+        """
+        reused, _, context = self._reuse_near_duplicates(group)
+        runs: List[Tuple[Optional[str], List[Record]]] = []
+        for rec, summary in zip(group, reused):
+            if summary is None and runs and runs[-1][0] is None:
+                runs[-1][1].append(rec)
+            else:
+                runs.append((summary, [rec]))
+        return runs, context
+
+    def _index_streamed(self, run: List[Record], text: str, context: str) -> None:
+        """Add a streamed run to the index, if it splits one paragraph per record."""
+        index = self.near_duplicates
+        assert index is not None
+        try:
+            summaries = split_summaries(text, len(run))
+        except SummarySplitError:
+            return
+        for rec, summary in zip(run, summaries):
+            index.add(rec, summary, context)
+
+    async def _awith_retries(
+        self, fn: Callable[[List[Record], bool], Awaitable[T]], group: List[Record]
+    ) -> T:
+        attempt = 0
+        while True:
+            try:
+                return await fn(group, attempt > 0)
+            except Exception as exc:
+                if attempt >= self.batch_retries or not self._retryable(exc):
+                    raise
+                attempt += 1
+                if self.metrics is not None:
+                    self.metrics.inc("retries")
+
+    async def _asplit_block(self, group: List[Record], fresh: bool = False) -> List[str]:
+        block = self._build_prompt_body(group)
+        raw = await self._agenerate(block, store=False, fresh=fresh)
+        summaries = split_summaries(self._postprocess_summary(raw), len(group))
+        self._cache_put(block, raw)
+        return summaries
+
+    async def _asummarize_group(self, group: List[Record]) -> List[SummaryResult]:
+        """Async twin of `_summarize_group`."""
+        if self.near_duplicates is None:
+            return await self._asummarize_group_uncached(group)
+        reused, todo, context = self._reuse_near_duplicates(group)
+        fresh = await self._asummarize_group_uncached(todo) if todo else []
+        return self._merge_near_duplicates(group, reused, fresh, context)
+
+    async def _asummarize_group_uncached(self, group: List[Record]) -> List[SummaryResult]:
+        if self.validator is not None:
+            return await self._avalidated_group(group)
+        try:
+            summaries = await self._awith_retries(self._asplit_block, group)
+        except Exception as exc:
+            return _group_results(group, error=exc)
+        return _group_results(group, summaries)
+
+    async def _avalidated_group(self, group: List[Record]) -> List[SummaryResult]:
+        """Async twin of `_validated_group`."""
+        results = _group_results(group)
+        todo, attempt = list(range(len(group))), 0
+        while True:
+            final = attempt >= self.batch_retries
+            block = self._build_prompt_body(
+                group if len(todo) == len(group) else [group[i] for i in todo]
+            )
+            try:
+                raw = await self._agenerate(block, store=False, fresh=attempt > 0)
+            except Exception as exc:
+                if final or not self._retryable(exc):
+                    return self._fail_remaining(results, todo, exc)
+            else:
+                todo = self._accept_valid(results, todo, block, raw, final)
+                if not todo:
+                    return results
+            attempt += 1
+            if self.metrics is not None:
+                self.metrics.inc("retries")
+
+    def _stream_group(self, group: List[Record]) -> Iterator[str]:
+        """Stream one planned group, answering near-duplicates from the index."""
+        if self.near_duplicates is None:
+            yield from self._stream_block(self._build_prompt_body(group))
+            return
+        runs, context = self._near_duplicate_runs(group)
+        for k, (summary, run) in enumerate(runs):
+            if k:
+                yield "\n\n"
+            if summary is not None:
+                yield summary
+                continue
+            pieces: List[str] = []
+            for piece in self._stream_block(self._build_prompt_body(run)):
+                pieces.append(piece)
+                yield piece
+            self._index_streamed(run, "".join(pieces), context)
+
+    async def _astream_group(self, group: List[Record]) -> AsyncIterator[str]:
+        """Async twin of `_stream_group`."""
+        if self.near_duplicates is None:
+            async for piece in self._astream_block(self._build_prompt_body(group)):
+                yield piece
+            return
+        runs, context = self._near_duplicate_runs(group)
+        for k, (summary, run) in enumerate(runs):
+            if k:
+                yield "\n\n"
+            if summary is not None:
+                yield summary
+                continue
+            pieces: List[str] = []
+            async for piece in self._astream_block(self._build_prompt_body(run)):
+                pieces.append(piece)
+                yield piece
+            self._index_streamed(run, "".join(pieces), context)
+
+    def _stream_block(self, attribute_block: str) -> Iterator[str]:
+        """
+        Stream one request's text, scaffolding stripped incrementally.
+
+        A request that fails before yielding anything is retried: after a
+        `backoff` pause for transient errors while that budget lasts, then
+        under `batch_retries`.
+        """
+        attempt = backoff_attempt = 0
+        while True:
+            stripper, emitted = ScaffoldStripper(), False
+            try:
+                for raw in self._stream_raw(attribute_block):
+                    text = stripper.feed(raw)
+                    if text:
+                        emitted = True
+                        yield text
+                break
+            except Exception as exc:
+                if emitted:
+                    raise
+                if self._should_back_off(exc, backoff_attempt):
+                    time.sleep(self.backoff.delay(backoff_attempt))  # type: ignore[union-attr]
+                    backoff_attempt += 1
+                    continue
+                if attempt >= self.batch_retries or not self._retryable(exc):
+                    raise
+                attempt += 1
+        tail = stripper.close()
+        if tail:
+            yield tail
+
+    async def _astream_block(self, attribute_block: str) -> AsyncIterator[str]:
+        """Async twin of `_stream_block`."""
+        import asyncio
+
+        attempt = backoff_attempt = 0
+        while True:
+            stripper, emitted = ScaffoldStripper(), False
+            try:
+                async for raw in self._astream_raw(attribute_block):
+                    text = stripper.feed(raw)
+                    if text:
+                        emitted = True
+                        yield text
+                break
+            except Exception as exc:
+                if emitted:
+                    raise
+                if self._should_back_off(exc, backoff_attempt):
+                    delay = self.backoff.delay(backoff_attempt)  # type: ignore[union-attr]
+                    await asyncio.sleep(delay)
+                    backoff_attempt += 1
+                    continue
+                if attempt >= self.batch_retries or not self._retryable(exc):
+                    raise
+                attempt += 1
+        tail = stripper.close()
+        if tail:
+            yield tail
+
+    def _can_stream(self) -> bool:
+        return (
+            isinstance(self._backend, StreamingBackend)
+            and getattr(self._call_model, "__func__", None) is ProfileSummarizerAgent._call_model
+        )
+
+    def _stream_raw(self, attribute_block: str) -> Iterator[str]:
+        """
+        Raw chunks for one request, with the same cache, rate-control and
+        metrics bookkeeping as `_generate` (`model_call` runs from the
+        request to the last chunk). Without a streaming backend (or with a
+        stubbed `_call_model`) the whole response is one chunk.
+        """
+        if not self._can_stream():
+            yield self._generate(attribute_block)
+            return
+        if self.cache is not None:
+            text = self._cache_get(attribute_block)
+            if text is not None:
+                yield text
+                return
+
+        self._admit(attribute_block)
+        t0 = self._start_stream(attribute_block)
+        chunks: List[str] = []
+        try:
+            stream = self._backend.stream(  # type: ignore[attr-defined]
+                self._compose_prompt(attribute_block), temperature=self.temperature
+            )
+            for chunk in self._chunks_within_deadline(stream):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as exc:
+            self._end_stream(attribute_block, t0, exc=exc)
+            raise
+        except BaseException:  # abandoned by the consumer
+            self._end_stream(attribute_block, t0)
+            raise
+        self._end_stream(attribute_block, t0, text="".join(chunks).strip())
+
+    async def _astream_raw(self, attribute_block: str) -> AsyncIterator[str]:
+        """Async twin of `_stream_raw`."""
+        if not self._can_stream():
+            yield await self._agenerate(attribute_block)
+            return
+        if self.cache is not None:
+            text = self._cache_get(attribute_block)
+            if text is not None:
+                yield text
+                return
+
+        await self._aadmit(attribute_block)
+        t0 = self._start_stream(attribute_block)
+        chunks: List[str] = []
+        try:
+            stream = self._backend.astream(  # type: ignore[attr-defined]
+                self._compose_prompt(attribute_block), temperature=self.temperature
+            )
+            async for chunk in self._achunks_within_deadline(stream):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as exc:
+            self._end_stream(attribute_block, t0, exc=exc)
+            raise
+        except BaseException:
+            self._end_stream(attribute_block, t0)
+            raise
+        self._end_stream(attribute_block, t0, text="".join(chunks).strip())
+
+    def _chunks_within_deadline(self, stream: Iterator[str]) -> Iterator[str]:
+        """
+        `stream`, failing with `DeadlineExceeded` when the next chunk (the
+        first one included) takes longer than `request_timeout`.
+        """
+        timeout = self.request_timeout
+        if timeout is None:
+            yield from stream
+            return
+        from concurrent.futures import TimeoutError as FutureTimeout
+
+        it, pool = iter(stream), self._call_pool()
+        while True:
+            try:
+                chunk: Optional[str] = pool.submit(next, it, None).result(timeout=timeout)
+            except FutureTimeout:
+                raise self._stream_timeout() from None
+            if chunk is None:
+                return
+            yield chunk
+
+    async def _achunks_within_deadline(self, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Async twin of `_chunks_within_deadline`."""
+        timeout = self.request_timeout
+        if timeout is None:
+            async for chunk in stream:
+                yield chunk
+            return
+        import asyncio
+
+        it = stream.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(it.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                raise self._stream_timeout() from None
+            yield chunk
+
+    def _stream_timeout(self) -> DeadlineExceeded:
+        if self.metrics is not None:
+            self.metrics.inc("timeouts")
+        return DeadlineExceeded(f"no stream chunk within {self.request_timeout}s")
+
+    def _start_stream(self, attribute_block: str) -> float:
+        if self.metrics is not None:
+            self._record_request(self.metrics, attribute_block)
+        return time.perf_counter()
+
+    def _end_stream(
+        self,
+        attribute_block: str,
+        t0: float,
+        *,
+        exc: Optional[Exception] = None,
+        text: Optional[str] = None,
+    ) -> None:
+        """
+        Bookkeeping once an admitted stream ends: read to the end (`text`),
+        failed (`exc`), or abandoned by its consumer (neither).
+        """
+        m = self.metrics
+        if m is not None:
+            m.observe("model_call", time.perf_counter() - t0)
+            if exc is not None:
+                self._record_error(m, exc)
+            elif text is not None:
+                self._record_response(m, text)
+        if self.concurrency_controller is not None:
+            self.concurrency_controller.release()
+        if exc is not None:
+            self._settle(exc)
+        elif text is not None:
+            self._settle(text=text)
+            self._cache_put(attribute_block, text)
+
+    @staticmethod
+    async def _apool(
+        units: Iterable[T],
+        run: Callable[[T], Awaitable[None]],
+        concurrency: int,
+    ) -> None:
+        """Drain `units` lazily with `concurrency` workers."""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        it = iter(units)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            token = _EXECUTOR.set(pool)
+            try:
+                async def worker() -> None:
+                    for unit in it:
+                        await run(unit)
+
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            finally:
+                _EXECUTOR.reset(token)
+
+    def _generate(self, attribute_block: str, *, store: bool = True, fresh: bool = False) -> str:
+        """
+        Cache-aware model call: cache hits never reach `_call_model`.
+
+        With `fresh` the cache is not consulted (a retry must reach the
+        model). With `store=False` the response is not cached; the caller
+        does that with `_cache_put` once the response has been checked.
+        """
+        if self.cache is None:
+            return self._policy_call(attribute_block)
+        text = None if fresh else self._cache_get(attribute_block)
+        if text is None:
+            text = self._policy_call(attribute_block)
+            if store:
+                self._cache_put(attribute_block, text)
+        return text
+
+    def _cache_key(self, attribute_block: str) -> str:
+        return ResponseCache.make_key(
+            self.model_name, self.temperature, self.base_prompt, attribute_block
+        )
+
+    def _cache_get(self, attribute_block: str) -> Optional[str]:
+        assert self.cache is not None
+        text = self.cache.get(self._cache_key(attribute_block))
+        if self.metrics is not None:
+            self.metrics.inc("cache_misses" if text is None else "cache_hits")
+        return text
+
+    def _cache_put(self, attribute_block: str, text: str) -> None:
+        if self.cache is not None:
+            self.cache.set(self._cache_key(attribute_block), text)
+
+    # rate control: every upstream request, retries and hedges included ----
+    def _admit(self, attribute_block: str, *, wait: bool = True) -> bool:
+        """
+        Take one request's RPM/TPM budget and AIMD slot. Without `wait` they
+        are taken only if free right now (hedges never queue for them).
+        """
+        limiter, ctl = self.rate_limiter, self.concurrency_controller
+        tokens = self._estimate_tokens(self.base_prompt, attribute_block) if limiter else 0
+        if wait:
+            if limiter is not None:
+                limiter.acquire(tokens)
+            if ctl is not None:
+                ctl.acquire()
+            return True
+        if ctl is not None and not ctl.try_acquire():
+            return False
+        if limiter is not None and not limiter.try_acquire(tokens):
+            if ctl is not None:
+                ctl.release()
+            return False
+        return True
+
+    async def _aadmit(self, attribute_block: str) -> None:
+        """Async twin of `_admit` (waiting)."""
+        limiter, ctl = self.rate_limiter, self.concurrency_controller
+        if limiter is not None:
+            await limiter.aacquire(self._estimate_tokens(self.base_prompt, attribute_block))
+        if ctl is not None:
+            await ctl.aacquire()
+
+    def _settle(self, exc: Optional[Exception] = None, text: str = "") -> None:
+        """Feed one upstream request's outcome to the AIMD limit and TPM budget."""
+        ctl, limiter = self.concurrency_controller, self.rate_limiter
+        if exc is not None:
+            if ctl is not None and is_throttle_error(exc):
+                ctl.on_throttle()
+            return
+        if ctl is not None:
+            ctl.on_success()
+        if limiter is not None:
+            limiter.charge(self._estimate_tokens(text))
+
+    def _throttled_call(self, attribute_block: str, *, admitted: bool = False) -> str:
+        """
+        One upstream request under the RPM/TPM budget and the AIMD in-flight
+        limit (taken here unless the caller `admitted` it already).
+        """
+        if self.rate_limiter is None and self.concurrency_controller is None:
+            return self._measured_call(attribute_block)
+        if not admitted:
+            self._admit(attribute_block)
+        try:
+            text = self._measured_call(attribute_block)
+        except Exception as exc:
+            self._settle(exc)
+            raise
+        finally:
+            if self.concurrency_controller is not None:
+                self.concurrency_controller.release()
+        self._settle(text=text)
+        return text
+
+    async def _agenerate(
+        self, attribute_block: str, *, store: bool = True, fresh: bool = False
+    ) -> str:
+        """Async twin of `_generate`."""
+        if self.cache is None:
+            return await self._apolicy_call(attribute_block)
+        text = None if fresh else self._cache_get(attribute_block)
+        if text is None:
+            text = await self._apolicy_call(attribute_block)
+            if store:
+                self._cache_put(attribute_block, text)
+        return text
+
+    async def _athrottled_call(self, attribute_block: str, *, admitted: bool = False) -> str:
+        """Async twin of `_throttled_call`."""
+        if self.rate_limiter is None and self.concurrency_controller is None:
+            return await self._ameasured_call(attribute_block)
+        if not admitted:
+            await self._aadmit(attribute_block)
+        try:
+            text = await self._ameasured_call(attribute_block)
+        except Exception as exc:
+            self._settle(exc)
+            raise
+        finally:
+            if self.concurrency_controller is not None:
+                self.concurrency_controller.release()
+        self._settle(text=text)
+        return text
+
+    def _measured_call(self, attribute_block: str) -> str:
+        """`_call_model`, plus latency / size / error metrics when enabled."""
+        m = self.metrics
+        if m is None:
+            return self._call_model(attribute_block)
+        self._record_request(m, attribute_block)
+        t0 = time.perf_counter()
+        try:
+            text = self._call_model(attribute_block)
+        except Exception as exc:
+            self._record_error(m, exc)
+            raise
+        finally:
+            m.observe("model_call", time.perf_counter() - t0)
+        self._record_response(m, text)
+        return text
+
+    async def _ameasured_call(self, attribute_block: str) -> str:
+        m = self.metrics
+        if m is None:
+            return await self._acall_model(attribute_block)
+        self._record_request(m, attribute_block)
+        t0 = time.perf_counter()
+        try:
+            text = await self._acall_model(attribute_block)
+        except Exception as exc:
+            self._record_error(m, exc)
+            raise
+        finally:
+            m.observe("model_call", time.perf_counter() - t0)
+        self._record_response(m, text)
+        return text
+
+    # tail latency: deadlines, hedging, backoff ---------------------------
+    def _policy_call(self, attribute_block: str) -> str:
+        """
+        One logical call under the per-call deadline, hedging and backoff
+        policy. Every attempt and every hedge is a separate upstream request
+        through `_throttled_call`, so each takes its own rate-limit budget
+        and reports its throttling to the AIMD limit.
+
+        Transient failures (throttling, 5xx, timeouts) are retried after a
+        jittered exponential pause when `backoff` is set; everything else
+        propagates at once.
+        """
+        if self.request_timeout is None and self.hedge is None and self.backoff is None:
+            return self._throttled_call(attribute_block)
+        attempt = 0
+        while True:
+            try:
+                return self._hedged_call(attribute_block)
+            except Exception as exc:
+                if not self._should_back_off(exc, attempt):
+                    raise
+                time.sleep(self.backoff.delay(attempt))  # type: ignore[union-attr]
+                attempt += 1
+
+    async def _apolicy_call(self, attribute_block: str) -> str:
+        if self.request_timeout is None and self.hedge is None and self.backoff is None:
+            return await self._athrottled_call(attribute_block)
+        import asyncio
+
+        attempt = 0
+        while True:
+            try:
+                return await self._ahedged_call(attribute_block)
+            except Exception as exc:
+                if not self._should_back_off(exc, attempt):
+                    raise
+                await asyncio.sleep(self.backoff.delay(attempt))  # type: ignore[union-attr]
+                attempt += 1
+
+    def _call_pool(self) -> "Executor":
+        """Threads for hedged and deadline-bound blocking calls (see `close`)."""
+        if self._hedge_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._hedge_pool = ThreadPoolExecutor(thread_name_prefix="psa-hedge")
+        return self._hedge_pool
+
+    def _should_back_off(self, exc: Exception, attempt: int) -> bool:
+        backoff = self.backoff
+        if backoff is None or attempt >= backoff.retries or not is_transient_error(exc):
+            return False
+        if self.metrics is not None:
+            self.metrics.inc("backoff_retries")
+        return True
+
+    def _hedged_call(self, attribute_block: str) -> str:
+        """
+        One attempt: the original request plus up to `max_hedges` duplicates
+        sent once it is slower than the hedge threshold. The original waits
+        for its rate-limit budget before the clock starts; a hedge is sent
+        only if budget and an in-flight slot are free at that moment. The
+        first success wins; a blocking call that loses (or misses the
+        deadline) finishes in the background and is ignored.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pool, hedge, m = self._call_pool(), self.hedge, self.metrics
+        self._admit(attribute_block)
+        start = time.monotonic()
+        deadline = start + self.request_timeout if self.request_timeout is not None else None
+        threshold = hedge.delay() if hedge is not None else None
+        hedges_left = hedge.max_hedges if hedge is not None and threshold is not None else 0
+        hedge_delay = step = threshold or 0.0
+
+        pending = {pool.submit(self._throttled_call, attribute_block, admitted=True)}
+        error: Optional[BaseException] = None
+        while True:
+            now = time.monotonic()
+            waits = []
+            if deadline is not None:
+                waits.append(deadline - now)
+            if hedges_left:
+                waits.append(start + hedge_delay - now)
+            done, pending = wait(
+                pending, timeout=max(0.0, min(waits)) if waits else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for fut in done:
+                if fut.exception() is None:
+                    for loser in pending:
+                        if loser.cancel() and self.concurrency_controller is not None:
+                            self.concurrency_controller.release()  # admitted, never ran
+                    if hedge is not None:
+                        hedge.record(time.monotonic() - start)
+                    return fut.result()
+                error = fut.exception()
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                if m is not None:
+                    m.inc("timeouts")
+                raise DeadlineExceeded(f"no response within {self.request_timeout}s")
+            if not pending:
+                raise error  # type: ignore[misc]
+            if hedges_left and now >= start + hedge_delay:
+                hedges_left -= 1
+                hedge_delay += step  # a further hedge waits one more threshold
+                if self._admit(attribute_block, wait=False):
+                    pending.add(pool.submit(self._throttled_call, attribute_block, admitted=True))
+                    if m is not None:
+                        m.inc("hedges")
+                elif m is not None:
+                    m.inc("hedges_skipped")
+
+    async def _ahedged_call(self, attribute_block: str) -> str:
+        """Async twin of `_hedged_call`; losing requests are cancelled."""
+        import asyncio
+
+        hedge, m = self.hedge, self.metrics
+        loop = asyncio.get_running_loop()
+        await self._aadmit(attribute_block)
+        start = loop.time()
+        deadline = start + self.request_timeout if self.request_timeout is not None else None
+        threshold = hedge.delay() if hedge is not None else None
+        hedges_left = hedge.max_hedges if hedge is not None and threshold is not None else 0
+        hedge_delay = step = threshold or 0.0
+
+        pending = {asyncio.ensure_future(self._athrottled_call(attribute_block, admitted=True))}
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                now = loop.time()
+                waits = []
+                if deadline is not None:
+                    waits.append(deadline - now)
+                if hedges_left:
+                    waits.append(start + hedge_delay - now)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, min(waits)) if waits else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if hedge is not None:
+                            hedge.record(loop.time() - start)
+                        return task.result()
+                    error = task.exception()
+                now = loop.time()
+                if deadline is not None and now >= deadline:
+                    if m is not None:
+                        m.inc("timeouts")
+                    raise DeadlineExceeded(f"no response within {self.request_timeout}s")
+                if not pending:
+                    raise error  # type: ignore[misc]
+                if hedges_left and now >= start + hedge_delay:
+                    hedges_left -= 1
+                    hedge_delay += step
+                    if self._admit(attribute_block, wait=False):
+                        pending.add(asyncio.ensure_future(
+                            self._athrottled_call(attribute_block, admitted=True)
+                        ))
+                        if m is not None:
+                            m.inc("hedges")
+                    elif m is not None:
+                        m.inc("hedges_skipped")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_request(self, m: Metrics, attribute_block: str) -> None:
+        m.inc("requests")
+        m.size("prompt_chars", len(attribute_block) + self.prompt_template.overhead)
+        m.size("prompt_tokens", self._estimate_tokens(self.base_prompt, attribute_block))
+
+    def _record_response(self, m: Metrics, text: str) -> None:
+        if isinstance(text, str):
+            m.size("response_chars", len(text))
+            m.size("response_tokens", self._estimate_tokens(text))
+
+    @staticmethod
+    def _record_error(m: Metrics, exc: BaseException) -> None:
+        m.inc("errors")
+        if is_throttle_error(exc):
+            m.inc("throttled")
+
+    def _estimate_tokens(self, *texts: str) -> int:
+        """Token count used for TPM accounting (see `TokenEstimator`)."""
+        return self.token_estimator.count_many(*texts)
+
+    def _compose_prompt(self, attribute_block: str) -> str:
+        return self.prompt_template.compose(attribute_block)
 
     def _call_model(self, attribute_block: str) -> str:
-        """Compose final prompt → call Gemini → return raw text (no stripping)."""
-        prompt = (
-            f"{self.base_prompt}\n\n"
-            f"User attributes:\n{attribute_block}\n\n"
-            "Summary:"
+        """Compose final prompt → call the backend → return raw text (no stripping)."""
+        return self._backend.generate(
+            self._compose_prompt(attribute_block), temperature=self.temperature
         )
-        response = self._model.generate_content(
-            prompt,
-            generation_config={"temperature": self.temperature},
+
+    async def _acall_model(self, attribute_block: str) -> str:
+        """
+        Async twin of `_call_model`.
+
+        If `_call_model` has been replaced (tests stub it, subclasses override
+        it) that version runs on the batch run's thread pool instead, so the
+        async engine honours the stub.
+        """
+        if getattr(self._call_model, "__func__", None) is not ProfileSummarizerAgent._call_model:
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_EXECUTOR.get(), self._call_model, attribute_block)
+        return await self._backend.agenerate(
+            self._compose_prompt(attribute_block), temperature=self.temperature
         )
-        return response.text.strip()
 
     def _postprocess_summary(self, text: str) -> str:
         """
@@ -197,20 +2240,4 @@ class ProfileSummarizerAgent:
         """
         if not isinstance(text, str):
             return text
-        t = text.strip()
-
-        # Prefer the LAST 'Summary:' occurrence (case-insensitive)
-        low = t.lower()
-        needle = "summary:"
-        idx = low.rfind(needle)
-        if idx != -1:
-            return t[idx + len(needle):].strip()
-
-        # Fallback: if 'User attributes:' exists but no 'Summary:', drop that prefix
-        import re
-        ua = re.compile(r'(?i)\buser\s+attributes\s*:\s*')
-        m = ua.search(t)
-        if m:
-            return t[m.end():].strip()
-
-        return t
+        return timed(self.metrics, "postprocess", strip_scaffold, text)
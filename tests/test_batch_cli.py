@@ -0,0 +1,73 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from profile_summarizer.batch_cli import input_files, main, run_batch
+from profile_summarizer.rate_control import SharedRateLimiter
+
+
+def _write_inputs(root: Path) -> Path:
+    data = root / "in"
+    data.mkdir()
+    (data / "a.ndjson").write_text(
+        "".join(json.dumps({"id": f"a{i}", "first_name": f"A{i}"}) + "\n" for i in range(7)),
+        "utf-8",
+    )
+    (data / "b.json").write_text(
+        json.dumps([{"id": f"b{i}", "first_name": f"B{i}"} for i in range(5)]), "utf-8"
+    )
+    (data / "notes.txt").write_text("ignored", "utf-8")
+    return data
+
+
+def _config(root: Path) -> Path:
+    cfg = root / "config.json"
+    cfg.write_text(json.dumps(
+        {"temp": 0.0, "model_name": "fake", "prompt": "Summarise attributes.", "backend": "fake"}
+    ), "utf-8")
+    return cfg
+
+
+def test_input_files_expands_directories(tmp_path: Path):
+    data = _write_inputs(tmp_path)
+    assert [f.name for f in input_files([data])] == ["a.ndjson", "b.json"]
+    with pytest.raises(FileNotFoundError):
+        input_files([tmp_path / "missing.json"])
+
+
+def test_run_batch_merges_shards_in_order(tmp_path: Path):
+    data = _write_inputs(tmp_path)
+    out, cache = tmp_path / "out.ndjson", tmp_path / "cache.db"
+    stats = run_batch(_config(tmp_path), [data], out, workers=2, chunk_size=3, cache=cache)
+
+    rows = [json.loads(line) for line in out.read_text("utf-8").splitlines()]
+    assert [r["id"] for r in rows] == [f"a{i}" for i in range(7)] + [f"b{i}" for i in range(5)]
+    assert [r["index"] for r in rows] == list(range(12))
+    assert all(r["error"] is None and r["summary"].startswith(r["id"].upper()) for r in rows)
+    assert stats["records"] == 12 and stats["failed"] == 0 and stats["files"] == 2
+    assert stats["records_per_second"] > 0
+
+    # every shard is one request, cached in the one shared file
+    with sqlite3.connect(cache) as db:
+        assert db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 4
+
+
+def test_main_reports_throughput(tmp_path: Path, capsys):
+    data = _write_inputs(tmp_path)
+    out = tmp_path / "out.csv"
+    code = main([str(data / "b.json"), "-c", str(_config(tmp_path)), "-o", str(out),
+                 "-w", "1", "--rpm", "6000"])
+    assert code == 0
+    assert "5 records from 1 file(s)" in capsys.readouterr().err
+    assert len(out.read_text("utf-8").splitlines()) == 6
+
+
+def test_shared_rate_limiter_spans_instances(tmp_path: Path):
+    path = tmp_path / "limits.db"
+    a = SharedRateLimiter(path, rpm=60)  # 1 request/second, burst of 1
+    b = SharedRateLimiter(path, rpm=60)
+    assert a._delay(0) == 0.0
+    assert b._delay(0) == pytest.approx(1.0, abs=0.1)  # b sees a's spend
+    assert a._delay(0) == pytest.approx(2.0, abs=0.1)
@@ -0,0 +1,73 @@
+import os
+import time
+
+import pytest
+
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def _make_agent():
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    return ProfileSummarizerAgent(
+        temp=0.0,
+        model_name="models/gemini-1.5-flash-latest",
+        prompt="Summarise attributes. Return ONLY the final paragraph.",
+    )
+
+
+def _slow_echo(latency: float):
+    """Fake `_call_model`: sleeps, then echoes the first attribute line."""
+    def call(block: str) -> str:
+        time.sleep(latency)
+        if "boom" in block:
+            raise RuntimeError("upstream failure")
+        return "Summary: " + block.splitlines()[0]
+    return call
+
+
+def test_process_many_preserves_order_and_groups():
+    agent = _make_agent()
+    agent._call_model = _slow_echo(0.0)  # type: ignore[attr-defined]
+
+    records = [{"name": f"p{i}"} for i in range(5)]
+    records.append([{"name": "g1"}, {"name": "g2"}])  # one request for a group
+
+    results = agent.process_many(records, concurrency=3)
+    assert [r.index for r in results] == list(range(6))
+    assert [r.summary for r in results[:5]] == [f"name: p{i}" for i in range(5)]
+    assert results[5].summary == "name: g1"
+    assert len(results[5].records) == 2
+
+
+def test_process_many_isolates_failures():
+    agent = _make_agent()
+    agent._call_model = _slow_echo(0.0)  # type: ignore[attr-defined]
+
+    results = agent.process_many(
+        [{"name": "a"}, {"name": "boom"}, {"name": "c"}], concurrency=2
+    )
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, RuntimeError)
+    assert results[2].summary == "name: c"
+
+
+def test_process_many_throughput_scales_with_concurrency():
+    agent = _make_agent()
+    agent._call_model = _slow_echo(0.05)  # type: ignore[attr-defined]
+    records = [{"name": f"p{i}"} for i in range(16)]
+
+    t0 = time.perf_counter()
+    agent.process_many(records, concurrency=1)
+    serial = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    agent.process_many(records, concurrency=8)
+    parallel = time.perf_counter() - t0
+
+    assert parallel * 3 < serial
+
+
+def test_process_many_rejects_bad_concurrency():
+    agent = _make_agent()
+    with pytest.raises(ValueError):
+        agent.process_many([{"a": 1}], concurrency=0)
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from profile_summarizer_agent import (
+    ProfileSummarizerAgent,
+    SummarySplitError,
+    plan_batches,
+    split_summaries,
+)
+
+
+def _make_agent(**kw):
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    return ProfileSummarizerAgent(
+        temp=0.0,
+        model_name="models/gemini-1.5-flash-latest",
+        prompt="Summarise attributes.",
+        **kw,
+    )
+
+
+def _echo_names(block: str) -> str:
+    """Fake model: one paragraph per record, built from its `name:` line."""
+    names = [ln.split(": ", 1)[1] for ln in block.splitlines() if ln.startswith("name:")]
+    return "Summary:\n" + "\n\n".join(f"{n} is great." for n in names)
+
+
+# ---------- planner -----------------------------------------------------
+
+def test_plan_batches_respects_max_records():
+    groups = list(plan_batches(range(7), measure=lambda _: 1, max_records=3))
+    assert groups == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_plan_batches_respects_char_budget():
+    # sizes 4 + 2 (separator) + 4 = 10 fits; a third record would not
+    groups = list(plan_batches(["aaaa"] * 5, measure=len, max_chars=10))
+    assert [len(g) for g in groups] == [2, 2, 1]
+
+
+def test_plan_batches_oversized_record_gets_own_group():
+    groups = list(plan_batches(["a", "x" * 50, "b"], measure=len, max_chars=10))
+    assert groups == [["a"], ["x" * 50], ["b"]]
+
+
+def test_plan_batches_only_measures_for_a_char_budget():
+    def measure(_):
+        raise AssertionError("measured without a char budget")
+
+    assert list(plan_batches(range(5), measure=measure, max_records=2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_no_budget_is_one_group_without_rendering(monkeypatch):
+    agent = _make_agent()
+    monkeypatch.setattr(agent.prompt_template, "measure", None)
+    monkeypatch.setattr(agent, "_record_tokens", None)
+    assert list(agent._plan_batches([{"a": 1}, {"b": 2}])) == [[{"a": 1}, {"b": 2}]]
+    assert list(agent._plan_batches([])) == []
+
+
+def test_split_summaries_counts_paragraphs():
+    assert split_summaries("A one.\n\n  \nB two.", 2) == ["A one.", "B two."]
+    assert split_summaries("Only one\n\nparagraph pair", 1) == ["Only one\n\nparagraph pair"]
+    with pytest.raises(SummarySplitError):
+        split_summaries("A one.", 2)
+
+
+# ---------- agent integration -------------------------------------------
+
+def test_process_sends_one_request_per_group():
+    agent = _make_agent(max_records_per_request=2)
+    calls = []
+
+    def fake(block):
+        calls.append(block)
+        return _echo_names(block)
+
+    agent._call_model = fake  # type: ignore[attr-defined]
+    for n in ["A", "B", "C"]:
+        agent.append_input({"name": n})
+
+    out = agent.process()
+    assert len(calls) == 2
+    assert out == "A is great.\n\nB is great.\n\nC is great."
+
+
+def test_process_records_splits_per_record_and_retries_failed_group():
+    agent = _make_agent(max_records_per_request=2, batch_retries=1)
+    attempts = {}
+
+    def flaky(block):
+        attempts[block] = attempts.get(block, 0) + 1
+        if "name: C" in block and attempts[block] == 1:
+            return "C and D squashed into one paragraph."
+        return _echo_names(block)
+
+    agent._call_model = flaky  # type: ignore[attr-defined]
+    results = agent.process_records(
+        [{"name": n} for n in "ABCDE"], concurrency=2
+    )
+    assert [r.summary for r in results] == [f"{n} is great." for n in "ABCDE"]
+    # only the C/D group was re-requested
+    assert sorted(attempts.values()) == [1, 1, 2]
+
+
+def test_process_records_marks_group_failed_after_retry_budget():
+    agent = _make_agent(max_records_per_request=2, batch_retries=0)
+    agent._call_model = lambda block: "one paragraph only"  # type: ignore[attr-defined]
+    results = agent.process_records([{"name": "A"}, {"name": "B"}, {"name": "C"}])
+    assert [r.ok for r in results] == [False, False, True]
+    assert isinstance(results[0].error, SummarySplitError)
+
+
+def test_group_retries_skip_permanent_errors():
+    agent = _make_agent(max_records_per_request=2, batch_retries=2)
+    calls = []
+
+    def denied(block):
+        calls.append(block)
+        raise PermissionError("API key not valid")
+
+    agent._call_model = denied  # type: ignore[attr-defined]
+    results = agent.process_records([{"name": "A"}, {"name": "B"}])
+    assert [r.ok for r in results] == [False, False]
+    assert len(calls) == 1  # not re-sent: retrying cannot fix it
@@ -0,0 +1,32 @@
+import importlib.util
+import json
+from pathlib import Path
+
+BENCH = Path(__file__).parent.parent / "benchmarks" / "bench_hot_paths.py"
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench_hot_paths", BENCH)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_bench_smoke_emits_json_and_compares(tmp_path: Path):
+    bench = _load_bench()
+    out = tmp_path / "bench.json"
+    assert bench.main(["--sizes", "5", "--repeat", "1", "--output", str(out)]) == 0
+
+    report = json.loads(out.read_text("utf-8"))
+    names = {r["bench"] for r in report["results"]}
+    assert names >= {
+        "normalize_record", "build_prompt_body", "postprocess_summary",
+        "process_end_to_end", "load_config",
+    }
+    assert {r["shape"] for r in report["results"] if "shape" in r} == {"narrow", "wide"}
+
+    slower = json.loads(json.dumps(report))
+    for row in slower["results"]:
+        row["seconds"] *= 10
+    assert bench.compare(report, slower, 1.25)
+    assert not bench.compare(slower, report, 1.25)
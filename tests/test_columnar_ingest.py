@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+from profile_summarizer.batch_cli import input_files
+from profile_summarizer.columnar_ingest import (
+    iter_profiles_from_arrow, iter_profiles_from_csv, iter_profiles_from_file,
+)
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+CSV = (
+    "﻿ First_Name ,Age,Hobbies,Notes\n"
+    "  Layla ,28, kickboxing | food blogging ,\n"
+    "Kai,34,bouldering,\" likes, commas \"\n"
+    "Ana,,\n"
+)
+
+
+def _agent() -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake"
+    )
+
+
+def test_csv_rows_normalized_against_header(tmp_path: Path):
+    path = tmp_path / "export.csv"
+    path.write_text(CSV, "utf-8")
+    assert list(iter_profiles_from_csv(path, list_sep="|")) == [
+        {"first_name": "Layla", "age": "28", "hobbies": ["kickboxing", "food blogging"]},
+        {"first_name": "Kai", "age": "34", "hobbies": "bouldering", "notes": "likes, commas"},
+        {"first_name": "Ana"},
+    ]
+    renamed = iter_profiles_from_csv(path, columns={"First_Name": "Name", "Age": "age"})
+    assert next(renamed) == {"name": "Layla", "age": "28"}
+    with pytest.raises(KeyError):
+        next(iter_profiles_from_csv(path, columns=["missing"]))
+
+
+def test_csv_is_read_lazily_in_batches(tmp_path: Path):
+    path = tmp_path / "big.tsv"
+    path.write_text("name\trole\n" + "".join(f"p{i}\tdev\n" for i in range(10)), "utf-8")
+    it = iter_profiles_from_csv(path, batch_size=3)
+    assert next(it) == {"name": "p0", "role": "dev"}
+    assert sum(1 for _ in it) == 9
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", "utf-8")
+    assert list(iter_profiles_from_csv(empty)) == []
+
+
+def test_dispatch_and_pipeline_integration(tmp_path: Path):
+    path = tmp_path / "export.csv"
+    path.write_text(CSV, "utf-8")
+    (tmp_path / "skip.txt").write_text("x", "utf-8")
+    assert input_files([tmp_path]) == [path]
+    assert len(list(iter_profiles_from_file(path))) == 3
+    with pytest.raises(ValueError):
+        iter_profiles_from_file(tmp_path / "skip.txt")
+
+    agent = _agent()
+    agent.append_input_from_csv(path)
+    assert len(agent.inputs) == 3
+
+    counts = _agent().process_job(path, tmp_path / "run.journal")
+    assert counts == {"skipped": 0, "completed": 3, "failed": 0}
+    again = _agent().process_job(path, tmp_path / "run.journal")
+    assert again == {"skipped": 3, "completed": 0, "failed": 0}
+
+
+def test_parquet_and_arrow_readers(tmp_path: Path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table({
+        "First_Name": [" Layla ", "Kai", None],
+        "Age": [28, None, 40],
+        "Hobbies": [[" kickboxing "], ["bouldering"], []],
+    })
+    expected = [
+        {"first_name": "Layla", "age": 28, "hobbies": ["kickboxing"]},
+        {"first_name": "Kai", "hobbies": ["bouldering"]},
+        {"age": 40, "hobbies": []},
+    ]
+    pq.write_table(table, tmp_path / "p.parquet", row_group_size=2)
+    with pa.OSFile(str(tmp_path / "t.arrow"), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    assert list(iter_profiles_from_arrow(tmp_path / "p.parquet", batch_size=1)) == expected
+    assert list(iter_profiles_from_arrow(tmp_path / "t.arrow")) == expected
+    assert list(iter_profiles_from_arrow(table, batch_size=2)) == expected
+    assert list(iter_profiles_from_arrow(tmp_path / "p.parquet", columns=["Age"])) == [
+        {"age": 28}, {}, {"age": 40},
+    ]
@@ -0,0 +1,146 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import profile_summarizer_agent as psa
+from profile_summarizer_agent import ConfigWatcher, ProfileSummarizerAgent, load_config
+
+
+def _bump(path: Path, text: str) -> None:
+    """Rewrite `path` and make sure its mtime visibly moves forward."""
+    st = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def chain(tmp_path: Path):
+    (tmp_path / "prompt.txt").write_text("PROMPT v1", encoding="utf-8")
+    (tmp_path / "config.txt").write_text(
+        "temp=0.1\nmodel_name=fake\nprompt=@@prompt.txt\nbackend=fake", encoding="utf-8"
+    )
+    (tmp_path / "config.json").write_text('"@@config.txt"', encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    calls = []
+    real = psa._load_config_uncached
+
+    def counting(path, depth, deps):
+        if depth == 0:  # count top-level parses, not pointer hops
+            calls.append(path)
+        return real(path, depth, deps)
+
+    monkeypatch.setattr(psa, "_load_config_uncached", counting)
+    return calls
+
+
+def test_repeat_loads_are_memoized(chain, count_parses):
+    first = load_config(chain / "config.json")
+    second = load_config(chain / "config.json")
+    assert first == second and first is not second  # callers get copies
+    assert len(count_parses) == 1
+
+    second["temp"] = 99  # mutating a copy does not poison the cache
+    assert load_config(chain / "config.json")["temp"] == 0.1
+
+
+@pytest.mark.parametrize("changed", ["prompt.txt", "config.txt", "config.json"])
+def test_any_file_in_chain_invalidates(chain, count_parses, changed):
+    load_config(chain / "config.json")
+    target = chain / changed
+    if changed == "prompt.txt":
+        _bump(target, "PROMPT v2")
+    elif changed == "config.txt":
+        _bump(target, target.read_text("utf-8").replace("temp=0.1", "temp=0.7"))
+    else:
+        _bump(target, '"@@config.txt" ')
+    cfg = load_config(chain / "config.json")
+    assert len(count_parses) == 2
+    if changed == "prompt.txt":
+        assert cfg["prompt"] == "PROMPT v2"
+    if changed == "config.txt":
+        assert cfg["temp"] == 0.7
+
+
+def test_watcher_check_reports_changes(chain):
+    seen = []
+    watcher = ConfigWatcher(chain / "config.json", seen.append)
+    assert watcher.check() is False
+    _bump(chain / "prompt.txt", "PROMPT v2")
+    assert watcher.check() is True
+    assert seen[-1]["prompt"] == "PROMPT v2"
+
+
+def test_agent_hot_reload_keeps_model_client(chain):
+    agent = ProfileSummarizerAgent.from_config_file(chain / "config.json", watch=0.01)
+    backend = agent._backend
+    try:
+        _bump(chain / "prompt.txt", "PROMPT v2")
+        _bump(chain / "config.txt", "temp=0.5\nmodel_name=fake\nprompt=@@prompt.txt\nbackend=fake")
+        deadline = time.monotonic() + 2
+        while agent.base_prompt != "PROMPT v2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert agent.base_prompt == "PROMPT v2"
+        assert agent.temperature == 0.5
+        assert agent._backend is backend
+    finally:
+        agent.stop_watching_config()
+
+
+def test_reload_requires_config_origin(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    agent = ProfileSummarizerAgent(temp=0, model_name="m", prompt="p", backend="fake")
+    with pytest.raises(ValueError):
+        agent.reload_config()
+
+
+def test_edit_racing_the_read_is_not_cached_as_current(chain, monkeypatch):
+    real = Path.read_text
+
+    def edited_mid_read(self, *args, **kwargs):
+        text = real(self, *args, **kwargs)
+        if self.name == "prompt.txt" and text == "PROMPT v1":
+            _bump(self, "PROMPT v2")  # lands after the read, before any later stat
+        return text
+
+    monkeypatch.setattr(Path, "read_text", edited_mid_read)
+    assert load_config(chain / "config.json")["prompt"] == "PROMPT v1"
+    monkeypatch.setattr(Path, "read_text", real)
+    assert load_config(chain / "config.json")["prompt"] == "PROMPT v2"
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return cond()
+
+
+def test_watcher_survives_half_written_yaml_and_failing_callback(tmp_path):
+    pytest.importorskip("yaml")
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text("temp: 0.1\nmodel_name: fake\n", encoding="utf-8")
+    seen = []
+
+    def on_change(new):
+        seen.append(new)
+        if new["temp"] == 0.2:
+            raise RuntimeError("callback failed")
+
+    watcher = ConfigWatcher(cfg, on_change, interval=0.01).start()
+    try:
+        _bump(cfg, "temp: [0.1\nmodel_name: fake\n")  # saved half-way
+        time.sleep(0.05)
+        assert watcher._thread.is_alive() and seen == []
+        _bump(cfg, "temp: 0.2\nmodel_name: fake\n")
+        assert _wait_for(lambda: len(seen) == 1)
+        _bump(cfg, "temp: 0.3\nmodel_name: fake\n")
+        assert _wait_for(lambda: len(seen) == 2)
+        assert watcher._thread.is_alive() and seen[-1]["temp"] == 0.3
+    finally:
+        watcher.stop()
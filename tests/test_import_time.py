@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+# Modules that must not be imported just by importing the agent module.
+DEFERRED = ("google", "yaml", "pypdf", "dotenv", "asyncio", "sqlite3", "configparser")
+
+# Cumulative import budget for `profile_summarizer_agent`, in microseconds.
+# Best-of-5 measures 10-14 ms on the reference box; the budget leaves ~1.5x
+# headroom, so a regression of a few ms fails. Slower CI boxes set the env var.
+BUDGET_US = int(os.environ.get("PSA_IMPORT_BUDGET_US", "20000"))
+
+
+def _importtime(module: str, pycache: str):
+    # Measure with bytecode cached, as an installed package would be, even when
+    # the environment sets PYTHONDONTWRITEBYTECODE: compile once, then time.
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    cmd = [sys.executable, "-X", f"pycache_prefix={pycache}", "-X", "importtime",
+           "-c", f"import {module}"]
+    subprocess.run(cmd, capture_output=True, check=True, env=env)
+    proc = subprocess.run(cmd, capture_output=True, text=True, check=True, env=env)
+    rows = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            rows[name.strip()] = int(cumulative)
+    return rows
+
+
+def test_heavy_dependencies_are_deferred(tmp_path):
+    rows = _importtime("profile_summarizer_agent", str(tmp_path))
+    eager = sorted(n for n in rows if n.split(".")[0] in DEFERRED)
+    assert eager == []
+
+
+def test_cold_import_within_budget(tmp_path):
+    best = min(_importtime("profile_summarizer_agent", str(tmp_path))["profile_summarizer_agent"]
+               for _ in range(5))
+    assert best < BUDGET_US, f"cold import took {best} us (budget {BUDGET_US} us)"
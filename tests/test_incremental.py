@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import List
+
+from profile_summarizer.summary_manifest import (
+    SummaryManifest, context_fingerprint, record_fingerprint,
+)
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def _agent(**kw) -> ProfileSummarizerAgent:
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake", **kw
+    )
+    agent.sent = []  # type: ignore[attr-defined]
+    call = agent._call_model
+
+    def spy(block: str) -> str:
+        agent.sent.append(block)  # type: ignore[attr-defined]
+        return call(block)
+
+    agent._call_model = spy  # type: ignore[method-assign]
+    return agent
+
+
+def _records(n: int) -> List[dict]:
+    return [{"first_name": f"P{i}", "city": f"C{i % 3}"} for i in range(n)]
+
+
+def test_fingerprint_ignores_key_order_but_not_values():
+    a = {"first_name": "Ana", "age": 31}
+    assert record_fingerprint(a) == record_fingerprint({"age": 31, "first_name": "Ana"})
+    assert record_fingerprint(a) != record_fingerprint({"first_name": "Ana", "age": 32})
+    assert context_fingerprint("m", 0.0, "p") != context_fingerprint("m", 0.0, "q")
+
+
+def test_only_new_or_changed_records_are_sent(tmp_path: Path):
+    manifest = SummaryManifest(tmp_path / "manifest.db")
+    agent = _agent()
+    first = agent.process_incremental(manifest, _records(10))
+    assert all(r.ok for r in first) and len(agent.sent) == 1
+
+    changed = _records(11)
+    changed[4]["city"] = "Moved"
+    agent.sent.clear()
+    second = agent.process_incremental(manifest, changed)
+
+    assert [r.index for r in second] == list(range(11))
+    assert "first_name: P4" in agent.sent[0] and "first_name: P10" in agent.sent[0]
+    assert "first_name: P3" not in "".join(agent.sent)
+    assert [r.summary for r in second[:4]] == [r.summary for r in first[:4]]
+    assert "Moved" in second[4].summary
+    assert manifest.stats()["hits"] == 9
+
+    reopened = SummaryManifest(tmp_path / "manifest.db")
+    assert len(reopened) == 12
+
+
+def test_duplicates_sent_once_and_failures_not_stored():
+    manifest = SummaryManifest()
+    agent = _agent()
+    recs = [{"first_name": "Ana"}, {"first_name": "Ana"}, {"first_name": "Bo"}]
+    out = agent.process_incremental(manifest, recs, concurrency=1)
+    assert len(agent.sent) == 1 and agent.sent[0].count("Ana") == 1
+    assert out[0].summary == out[1].summary
+
+    def boom(block: str) -> str:
+        raise RuntimeError("down")
+
+    agent._call_model = boom  # type: ignore[method-assign]
+    agent.batch_retries = 0
+    failed = agent.process_incremental(manifest, [{"first_name": "Cy"}])
+    assert not failed[0].ok and len(manifest) == 2
+
+
+def test_prompt_change_invalidates_and_prune_trims(tmp_path: Path):
+    manifest = SummaryManifest(tmp_path / "m.db")
+    agent = _agent()
+    agent.process_incremental(manifest, _records(3))
+
+    agent.base_prompt = "Different prompt."
+    agent.sent.clear()
+    agent.process_incremental(manifest, _records(2), prune=True)
+    assert len(agent.sent) == 1 and len(manifest) == 2
+
+
+def test_queued_inputs_are_used_and_cleared():
+    agent = _agent()
+    for rec in _records(2):
+        agent.append_input(rec)
+    out = agent.process_incremental(SummaryManifest())
+    assert len(out) == 2 and not agent.inputs
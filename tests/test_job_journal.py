@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from profile_summarizer.job_journal import RunJournal
+from profile_summarizer.result_sinks import NDJSONSink
+from profile_summarizer_agent import ProfileSummarizerAgent, iter_profiles_from_ndjson
+
+
+class Crash(BaseException):
+    """Stands in for the process being killed mid-run."""
+
+
+def _write_source(path: Path, n: int) -> Path:
+    path.write_text(
+        "\n".join(json.dumps({"id": f"c{i}", "First_Name": f" P{i} "}) for i in range(n)) + "\n",
+        "utf-8",
+    )
+    return path
+
+
+def _agent(crash_after=None) -> ProfileSummarizerAgent:
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake",
+        max_records_per_request=3,
+    )
+    agent.calls = 0  # type: ignore[attr-defined]
+    call = agent._call_model
+
+    def counted(block: str) -> str:
+        if crash_after is not None and agent.calls >= crash_after:
+            raise Crash()
+        agent.calls += 1
+        return call(block)
+
+    agent._call_model = counted  # type: ignore[method-assign]
+    return agent
+
+
+def _rows(path: Path):
+    return [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+
+
+def test_killed_run_resumes_without_loss_or_duplicates(tmp_path: Path):
+    src = _write_source(tmp_path / "crm.ndjson", 30)
+    journal = tmp_path / "job.journal"
+
+    with pytest.raises(Crash):
+        _agent(crash_after=4).process_job(src, journal, concurrency=1)
+    with journal.open("a", encoding="utf-8") as fh:
+        fh.write('{"index": 99, "summ')  # torn final write
+
+    agent = _agent()
+    out = tmp_path / "out.ndjson"
+    with NDJSONSink(out) as sink:
+        counts = agent.process_job(src, journal, concurrency=2, sink=sink)
+
+    assert counts == {"skipped": 12, "completed": 18, "failed": 0}
+    assert agent.calls == 6
+    rows = _rows(out)
+    assert sorted(r["index"] for r in rows) == list(range(30))
+    assert all(r["id"] == f"c{r['index']}" and r["summary"].startswith(f"P{r['index']}")
+               for r in rows)
+
+    again = _agent()
+    assert again.process_job(src, journal)["completed"] == 0 and again.calls == 0
+
+
+def test_failed_groups_are_retried_on_the_next_run(tmp_path: Path):
+    src = [{"id": i, "first_name": f"P{i}"} for i in range(6)]
+    journal = tmp_path / "job.journal"
+    agent = _agent()
+    agent.batch_retries = 0
+    real = agent._call_model
+
+    def flaky(block: str) -> str:
+        if "P4" in block:
+            raise RuntimeError("429")
+        return real(block)
+
+    agent._call_model = flaky  # type: ignore[method-assign]
+    assert agent.process_job(src, journal, concurrency=1) == {
+        "skipped": 0, "completed": 3, "failed": 3,
+    }
+
+    with RunJournal(journal, _context(agent)) as j:
+        assert j.low_water == 3 and j.done == set()
+    assert _agent().process_job(src, journal)["completed"] == 3
+
+
+def _context(agent: ProfileSummarizerAgent) -> str:
+    from profile_summarizer.summary_manifest import context_fingerprint
+
+    return context_fingerprint(agent.model_name, agent.temperature, agent.base_prompt)
+
+
+def test_out_of_order_completion_and_context_check(tmp_path: Path):
+    path = tmp_path / "j"
+    with RunJournal(path, "ctx") as j:
+        j.record([{"index": 0, "id": 0, "summary": "a"}, {"index": 2, "id": 2, "summary": "c"}])
+        j.record([{"index": 5, "id": 5, "summary": "f"}])
+    with RunJournal(path, "ctx") as j:
+        assert j.low_water == 1 and j.done == {2, 5}
+        assert [r["index"] for r in j.rows()] == [0, 2, 5]
+    with pytest.raises(ValueError, match="restart=True"):
+        RunJournal(path, "other")
+    with RunJournal(path, "other", restart=True) as j:
+        assert j.low_water == 0 and list(j.rows()) == []
+
+
+def test_ndjson_skip_does_not_decode_skipped_lines(tmp_path: Path):
+    path = tmp_path / "x.ndjson"
+    path.write_text('not json at all\n\n{"A": 1}\n', "utf-8")
+    assert list(iter_profiles_from_ndjson(path, skip=1)) == [{"a": 1}]
+
+
+def test_package_facade_shares_classes_with_modules(tmp_path: Path):
+    import src
+
+    assert src.RunJournal is RunJournal
+    assert src.ProfileSummarizerAgent is ProfileSummarizerAgent
+    journal = src.RunJournal(tmp_path / "run.journal", "ctx")
+    try:
+        counts = _agent().process_job([{"first_name": "Ana"}], journal)
+    finally:
+        journal.close()
+    assert counts["completed"] == 1
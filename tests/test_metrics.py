@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from profile_summarizer.metrics import Histogram, Metrics
+from profile_summarizer.summary_cache import ResponseCache
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram([1, 5])
+    for v in (0.5, 1, 3, 10):
+        h.observe(v)
+    assert h.cumulative() == [("1", 2), ("5", 3), ("+Inf", 4)]
+    assert h.to_dict()["sum"] == 14.5
+
+
+def test_callbacks_snapshot_and_prometheus():
+    events = []
+    m = Metrics([lambda *e: events.append(e)], latency_buckets=[0.1, 1.0])
+    m.observe("model_call", 0.05)
+    m.size("prompt_chars", 300)
+    m.inc("cache_hits")
+    m.inc("cache_hits")
+    with m.timer("postprocess"):
+        pass
+
+    assert events[:3] == [
+        ("latency", "model_call", 0.05), ("size", "prompt_chars", 300), ("counter", "cache_hits", 1),
+    ]
+    snap = json.loads(m.to_json())
+    assert snap["counters"] == {"cache_hits": 2}
+    assert snap["latency_seconds"]["model_call"]["buckets"] == {"0.1": 1, "1": 1, "+Inf": 1}
+
+    text = m.prometheus(prefix="psa")
+    assert "# TYPE psa_stage_seconds histogram" in text
+    assert 'psa_stage_seconds_bucket{stage="model_call",le="0.1"} 1' in text
+    assert 'psa_stage_seconds_count{stage="postprocess"} 1' in text
+    assert 'psa_prompt_chars_bucket{le="+Inf"} 1' in text
+    assert "psa_cache_hits_total 2" in text
+    m.reset()
+    assert m.prometheus() == ""
+
+
+def _agent(**kw) -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake", **kw
+    )
+
+
+def test_agent_records_every_stage(tmp_path):
+    src = tmp_path / "p.json"
+    src.write_text(json.dumps([{"First_Name": "Ana"}, {"First_Name": "Bo"}]), "utf-8")
+    m = Metrics()
+    agent = _agent(metrics=m, cache=ResponseCache())
+    agent.append_input_from_json(src)
+    agent.process()
+    agent.append_input_from_json(src)
+    agent.process()
+
+    snap = m.snapshot()
+    stages = {"ingest", "normalize", "build_prompt", "model_call", "postprocess"}
+    assert stages <= set(snap["latency_seconds"])
+    assert snap["latency_seconds"]["normalize"]["count"] == 4  # per record, both loads
+    assert snap["latency_seconds"]["model_call"]["count"] == 1
+    assert snap["counters"] == {"requests": 1, "cache_misses": 1, "cache_hits": 1}
+    assert {"prompt_chars", "prompt_tokens", "response_chars", "response_tokens"} <= set(
+        snap["sizes"]
+    )
+
+
+def test_streaming_goes_through_the_same_bookkeeping():
+    m = Metrics()
+    agent = _agent(metrics=m, cache=ResponseCache(), backend_options={"stream_chunk_chars": 4})
+    for _ in range(2):
+        agent.append_input({"first_name": "Ana", "role": "PM"})
+        "".join(agent.process_stream())
+
+    snap = m.snapshot()
+    assert snap["counters"] == {"requests": 1, "cache_misses": 1, "cache_hits": 1}
+    assert snap["latency_seconds"]["model_call"]["count"] == 1
+    assert snap["sizes"]["response_chars"]["count"] == 1
+
+
+def test_agent_counts_errors_and_retries():
+    m = Metrics()
+    agent = _agent(metrics=m, batch_retries=1)
+
+    def boom(block):
+        raise ConnectionError("connection reset")
+
+    agent._call_model = boom
+    agent.append_input({"first_name": "Ana"})
+    with pytest.raises(ConnectionError):
+        agent.process()
+    assert m.counters == {"requests": 2, "errors": 2, "retries": 1}
+
+
+def test_disabled_metrics_leave_no_trace():
+    agent = _agent()
+    agent.append_input({"first_name": "Ana"})
+    assert agent.process() and agent.metrics is None
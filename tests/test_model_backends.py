@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from profile_summarizer.model_backends import FakeBackend, FakeBackendError, ModelBackend
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def _fake_agent(monkeypatch, **backend_options):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)  # fake needs no key
+    return ProfileSummarizerAgent(
+        temp=0.0,
+        model_name="fake",
+        prompt="Summarise attributes.",
+        backend="fake",
+        backend_options=backend_options,
+    )
+
+
+def test_fake_backend_is_a_model_backend():
+    assert isinstance(FakeBackend(), ModelBackend)
+
+
+def test_fake_backend_is_deterministic_per_record():
+    fb = FakeBackend()
+    prompt = (
+        "P\n\nUser attributes:\nage: 28\nfirst_name: Layla\n\n"
+        "first_name: Kai\nrole: PM\n\nSummary:"
+    )
+    out = fb.generate(prompt, temperature=0)
+    assert out == fb.generate(prompt, temperature=0)
+    assert out.split("\n\n") == ["Layla: 28.", "Kai: PM."]
+    usage = fb.usage()
+    assert usage["calls"] == 2 and usage["prompt_tokens"] > 0
+    assert usage["completion_tokens"] > 0
+
+
+def test_fake_backend_error_rate_and_latency_are_seeded():
+    a = FakeBackend(error_rate=0.3, seed=7)
+    b = FakeBackend(error_rate=0.3, seed=7)
+
+    def outcomes(fb):
+        out = []
+        for i in range(40):
+            try:
+                fb.generate(f"first_name: p{i}", temperature=0)
+                out.append(True)
+            except FakeBackendError:
+                out.append(False)
+        return out
+
+    first = outcomes(a)
+    assert first == outcomes(b)
+    assert 0 < first.count(False) < 40
+    assert a.usage()["errors"] == first.count(False)
+
+
+def test_fake_backend_lognormal_mean_close_to_latency():
+    fb = FakeBackend(latency=0.1, distribution="lognormal", sigma=0.5)
+    delays = [fb._draw(f"p{i}")[0] for i in range(2000)]
+    assert abs(sum(delays) / len(delays) - 0.1) < 0.01
+
+
+def test_fake_backend_rejects_unknown_distribution():
+    with pytest.raises(ValueError):
+        FakeBackend(distribution="cauchy")
+
+
+def test_agent_runs_offline_on_fake_backend(monkeypatch):
+    agent = _fake_agent(monkeypatch)
+    agent.append_input({"first_name": "Layla", "role": "Engineer"})
+    assert agent.process() == "Layla: Engineer."
+
+
+def test_async_engine_awaits_backend_without_threads(monkeypatch):
+    agent = _fake_agent(monkeypatch, latency=0.05)
+    records = [{"first_name": f"p{i}"} for i in range(40)]
+
+    # no budget -> one group, one call
+    results = agent.process_records(records, concurrency=20)
+    assert [r.summary for r in results] == [f"p{i}." for i in range(40)]
+
+    agent.max_records_per_request = 1
+    t0 = time.perf_counter()
+    results = agent.process_records(records, concurrency=20)
+    elapsed = time.perf_counter() - t0
+    assert all(r.ok for r in results)
+    assert elapsed < 0.05 * 40 / 4  # well below the serial 2 s
+
+
+def test_agent_accepts_backend_instance(monkeypatch):
+    class Upper:
+        def generate(self, prompt, *, temperature):
+            return "SUMMARY: " + prompt.splitlines()[-3].upper()
+
+        async def agenerate(self, prompt, *, temperature):
+            return self.generate(prompt, temperature=temperature)
+
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    agent = ProfileSummarizerAgent(temp=0, model_name="x", prompt="p", backend=Upper())
+    assert agent.process_many([{"name": "kai"}])[0].summary == "NAME: KAI"
+
+
+def test_unknown_backend_name_raises(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        ProfileSummarizerAgent(temp=0, model_name="x", prompt="p", backend="nope")
@@ -0,0 +1,131 @@
+import pytest
+
+from profile_summarizer.metrics import Metrics
+from profile_summarizer.near_duplicates import NearDuplicateIndex, jaccard, record_shingles
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+BASE = {
+    "first_name": "Layla", "role": "Sr. Front-End Engineer", "company": "FinTechX",
+    "location": "Dubai, UAE", "hobbies": ["kickboxing", "food blogging"],
+    "goals": "lead a cross-functional UI guild",
+}
+
+
+def test_shingles_ignore_casing_spacing_and_order():
+    messy = {k.upper(): v for k, v in BASE.items() if k != "goals"}
+    messy[" Goals "] = "Lead a  cross-functional UI guild."
+    assert record_shingles(messy) == record_shingles(BASE)
+    assert jaccard(frozenset(), frozenset()) == 0.0
+
+
+def test_lookup_reuses_and_retemplates_summary():
+    index = NearDuplicateIndex(0.8)
+    index.add(BASE, "Layla is a front-end engineer at FinTechX. Layla boxes.", "ctx")
+
+    twin = {**BASE, "first_name": "Omar", "id": 42}
+    hit = index.lookup(twin, "ctx")
+    assert hit is not None and hit.similarity == 1.0
+    assert hit.summary == "Omar is a front-end engineer at FinTechX. Omar boxes."
+
+    assert index.lookup(twin, "other-prompt") is None  # context must match
+    different = {**BASE, "role": "Chef", "company": "Noma", "goals": "open a bistro"}
+    assert index.lookup(different, "ctx") is None
+    assert index.stats() == {"lookups": 3, "hits": 1, "misses": 2, "hit_rate": 1 / 3, "entries": 1}
+
+
+def test_max_entries_evicts_oldest():
+    index = NearDuplicateIndex(0.9, max_entries=2)
+    for i in range(3):
+        index.add({"role": f"role{i} engineer", "city": f"city{i}"}, f"s{i}")
+    assert len(index) == 2
+    assert index.lookup({"role": "role0 engineer", "city": "city0"}) is None
+    assert index.lookup({"role": "role2 engineer", "city": "city2"}).summary == "s2"
+
+
+def test_evaluate_reports_precision_and_recall():
+    index = NearDuplicateIndex(0.7)
+    pairs = [
+        (BASE, {**BASE, "first_name": "Kai"}, True),
+        (BASE, {**BASE, "hobbies": ["kickboxing"]}, True),
+        (BASE, {**BASE, "role": "Chef", "company": "Noma", "goals": "open a bistro"}, False),
+        (BASE, {"first_name": "Zed", "role": "Pilot"}, False),
+    ]
+    report = index.evaluate(pairs)
+    assert report["precision"] == 1.0 and report["recall"] == 1.0
+    strict = NearDuplicateIndex(0.99).evaluate(pairs)
+    assert strict["recall"] == 0.5 and strict["false_negatives"] == 1
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(0.9, num_perm=64, bands=10)
+
+
+def test_agent_skips_model_for_near_duplicates():
+    m = Metrics()
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake",
+        near_duplicates=0.85, metrics=m,
+    )
+    calls = []
+    real = agent._backend.agenerate
+
+    async def counting(prompt, *, temperature):
+        calls.append(prompt)
+        return await real(prompt, temperature=temperature)
+
+    agent._backend.agenerate = counting
+    first = agent.process_records([BASE])
+    again = agent.process_records([{**BASE, "first_name": "Omar", "id": 7}, {"first_name": "Zed"}])
+    assert len(calls) == 2  # the twin never reached the model; Zed did
+    assert again[0].summary == first[0].summary.replace("Layla", "Omar")
+    assert m.counters["near_duplicate_hits"] == 1
+    assert m.counters["near_duplicate_misses"] == 2
+
+
+def test_integer_thresholds_from_config_build_the_index_and_policy():
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake",
+        near_duplicates=1,
+    )
+    assert isinstance(agent.near_duplicates, NearDuplicateIndex)
+    assert agent.near_duplicates.threshold == 1
+    agent.append_input(BASE)
+    agent.process()
+    agent.append_input(dict(BASE))
+    agent.process()
+    assert agent.near_duplicates.stats()["hits"] == 1
+    with pytest.raises(TypeError):
+        ProfileSummarizerAgent(
+            temp=0.0, model_name="fake", prompt="p", backend="fake", near_duplicates=True
+        )
+    with pytest.raises(ValueError):  # an int hedge is a percentile too: checked, not stored
+        ProfileSummarizerAgent(temp=0.0, model_name="fake", prompt="p", backend="fake", hedge=1)
+
+
+def _counting_agent(**kw):
+    m = Metrics()
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake",
+        near_duplicates=0.85, metrics=m, **kw,
+    )
+    return agent, m.counters
+
+
+def test_process_answers_near_duplicates_from_the_index():
+    agent, calls = _counting_agent()
+    agent.append_input(BASE)
+    first = agent.process()
+    agent.append_input({**BASE, "first_name": "Omar"})
+    assert agent.process() == first.replace("Layla", "Omar")
+    assert calls["requests"] == 1 and agent.near_duplicates.stats()["hits"] == 1
+
+
+def test_process_stream_sends_only_the_misses_in_order():
+    agent, calls = _counting_agent(max_records_per_request=4)
+    agent.append_input(BASE)
+    layla = agent.process()
+    for rec in ({"first_name": "Zed", "role": "chef"}, {**BASE, "first_name": "Omar"},
+                {"first_name": "Kai", "role": "pilot"}):
+        agent.append_input(rec)
+    parts = "".join(agent.process_stream()).split("\n\n")
+    assert [p.split()[0].strip(",.:") for p in parts] == ["Zed", "Omar", "Kai"]
+    assert parts[1] == layla.replace("Layla", "Omar")
+    assert calls["requests"] == 3  # Layla, then Zed and Kai; Omar came from the index
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+
+from profile_summarizer import profile_ingest
+from profile_summarizer.profile_ingest import (
+    extract_pdf_text,
+    load_profile,
+    load_profiles,
+    parse_profile_text,
+)
+
+
+def _write_pdf(path: Path, pages):
+    """Hand-roll a minimal PDF with one line of Helvetica text per page."""
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objs))
+        )
+        kids.append(len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def test_parse_profile_text_kv_and_lists():
+    text = "First Name: Layla\n  Hobbies : kickboxing, food blogging\nno colon here"
+    assert parse_profile_text(text) == {
+        "first name": "Layla",
+        "hobbies": ["kickboxing", "food blogging"],
+    }
+
+
+def test_parse_profile_text_raw_fallback_is_capped():
+    out = parse_profile_text("  " + "x" * 5000)
+    assert out == {"raw_text": "x" * profile_ingest.RAW_TEXT_CAP}
+
+
+def test_load_profile_matches_sample():
+    sample = Path(__file__).parent.parent / "samples" / "layla_profile.txt"
+    prof = load_profile(sample)
+    assert prof == parse_profile_text(sample.read_text("utf-8"))
+    assert prof
+
+
+def test_load_profiles_directory_in_order(tmp_path: Path):
+    for i in range(6):
+        (tmp_path / f"p{i}.txt").write_text(f"name: P{i}\nage: {20 + i}", encoding="utf-8")
+    (tmp_path / "ignore.json").write_text("{}", encoding="utf-8")
+
+    serial = load_profiles([tmp_path], workers=1)
+    parallel = load_profiles([tmp_path], workers=3)
+    assert serial == parallel
+    assert [p["name"] for p in parallel] == [f"P{i}" for i in range(6)]
+
+
+def test_pdf_extraction_parallel_matches_serial(tmp_path: Path, monkeypatch):
+    pytest.importorskip("pypdf")
+    pdf = tmp_path / "cv.pdf"
+    _write_pdf(pdf, [f"role: Engineer {i}" for i in range(6)])
+    monkeypatch.setattr(profile_ingest, "PDF_PAGES_PER_TASK", 2)
+
+    serial = extract_pdf_text(pdf, workers=1)
+    parallel = extract_pdf_text(pdf, workers=3)
+    assert serial == parallel
+    assert "Engineer 0" in serial and "Engineer 5" in serial
+    assert load_profile(pdf)["role"] == "Engineer 5"  # last key wins, as in the demo
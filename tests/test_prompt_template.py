@@ -0,0 +1,92 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from profile_summarizer.prompt_template import PromptTemplate
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def reference_body(records: List[Dict[str, Any]]) -> str:
+    """The pre-template renderer, kept verbatim as the parity oracle."""
+    lines: List[str] = []
+    for rec in records:
+        for k in sorted(rec):
+            v = rec[k]
+            v = ", ".join(v) if isinstance(v, list) else v
+            lines.append(f"{k}: {v}")
+        lines.append("")
+    return "\n".join(lines).strip()
+
+
+class Label(str):
+    pass
+
+
+CASES = [
+    [],
+    [{}],
+    [{}, {"name": "Ana"}, {}],
+    [{"name": "Ana", "age": 31, "hobbies": ["chess", "go"]}],
+    [{"b": "2", "a": "1"}, {"a": "x", "b": "y"}, {"zeta": 1.5, "alpha": None}],
+    [{" padded": "  spaces  "}, {"k": "trailing\n\n"}],
+    [{"name": Label("sub"), "flag": True, "empty": []}],
+]
+
+
+@pytest.mark.parametrize("records", CASES)
+def test_body_matches_reference(records):
+    t = PromptTemplate("Base.")
+    assert t.render_body(records) == reference_body(records)
+    assert t.join_rendered(map(t.render_record, records)) == reference_body(records)
+
+
+def test_full_prompt_matches_old_scaffold():
+    t = PromptTemplate("Summarise attributes.")
+    block = reference_body(CASES[4])
+    expected = f"Summarise attributes.\n\nUser attributes:\n{block}\n\nSummary:"
+    assert t.render(CASES[4]) == expected
+    assert t.overhead == len(expected) - len(block)
+
+
+def test_measure_and_schema_cache():
+    t = PromptTemplate("p")
+    rec = {"b": "2", "a": "1"}
+    assert t.measure(rec) == len(reference_body([rec]))
+    t.render_body([rec, {"b": "3", "a": "4"}, {"a": "5", "b": "6"}])
+    assert len(t._orders) == 2
+
+    t.max_schemas = 1
+    t.render_record({"only": 1})
+    assert list(t._orders) == [("only",)]
+
+
+def test_planner_renders_each_record_once():
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="p", backend="fake",
+        max_prompt_chars=10_000, max_prompt_tokens=10_000,
+    )
+    records = [{"name": f"n{i}", "tags": ["a", "b"]} for i in range(5)]
+    t = agent.prompt_template
+    calls = []
+    render = t.render_record
+    t.render_record = lambda rec: calls.append(rec) or render(rec)
+    t.render_body = None  # planned groups never re-render
+    (group,) = agent._plan_batches(enumerate(records))
+    assert len(calls) == 5
+    body = agent._build_prompt_body(agent._group_records(group))
+    assert body == reference_body(records) and len(calls) == 5
+
+
+def test_agent_uses_and_refreshes_template():
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="  First.  ", backend="fake"
+    )
+    agent.append_input({"Name": " Ana ", "Tags": ["a", "b"]})
+    block = agent._build_prompt_body()
+    assert block == reference_body(list(agent.inputs))
+    assert agent._compose_prompt(block).startswith("First.\n\nUser attributes:\n")
+
+    agent.base_prompt = "Second."
+    assert agent._compose_prompt(block) == (
+        f"Second.\n\nUser attributes:\n{block}\n\nSummary:"
+    )
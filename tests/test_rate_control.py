@@ -0,0 +1,155 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from profile_summarizer.rate_control import (
+    AdaptiveConcurrency,
+    RateLimitError,
+    RateLimiter,
+    TokenBucket,
+    is_throttle_error,
+)
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def _make_agent(**kw):
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    return ProfileSummarizerAgent(
+        temp=0.0,
+        model_name="models/gemini-1.5-flash-latest",
+        prompt="Summarise attributes.",
+        **kw,
+    )
+
+
+class QuotaBackend:
+    """Local fake: allows `limit` calls per sliding `window`, else raises 429."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit, self.window = limit, window
+        self.stamps = deque()
+        self.ok = self.rejected = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, block: str) -> str:
+        with self.lock:
+            now = time.monotonic()
+            while self.stamps and now - self.stamps[0] > self.window:
+                self.stamps.popleft()
+            if len(self.stamps) >= self.limit:
+                self.rejected += 1
+                raise RateLimitError("429 quota exceeded")
+            self.stamps.append(now)
+            self.ok += 1
+        return "fine"
+
+
+def test_token_bucket_reserve_reports_wait():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    wait = bucket.reserve()
+    assert 0.05 < wait <= 0.1
+
+
+def test_token_bucket_charges_requests_larger_than_capacity():
+    limiter = RateLimiter(tpm=60_000)  # 1000 tokens/second, burst of 1000
+    waits = [limiter._delay(5000) for _ in range(5)]
+    assert waits[0] == pytest.approx(4.0, abs=0.05)
+    assert waits[-1] == pytest.approx(24.0, abs=0.05)  # 25k tokens at 1k/s, 1k banked
+
+
+def test_aimd_async_waiter_wakes_on_release():
+    ctl = AdaptiveConcurrency(1)
+    ctl.acquire()
+
+    async def main():
+        waiter = asyncio.ensure_future(ctl.aacquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done() and len(ctl._waiters) == 1
+        threading.Timer(0.02, ctl.release).start()  # released from another thread
+        await asyncio.wait_for(waiter, 1.0)
+
+    asyncio.run(main())
+    assert ctl.in_flight == 1 and not ctl._waiters
+
+
+def test_is_throttle_error_classification():
+    class Http(Exception):
+        def __init__(self, code):
+            self.status_code = code
+
+    assert is_throttle_error(RateLimitError())
+    assert is_throttle_error(Http(503))
+    assert not is_throttle_error(Http(400))
+    assert not is_throttle_error(ValueError("bad input"))
+
+
+def test_aimd_backs_off_once_per_cooldown_and_ramps_up():
+    ctl = AdaptiveConcurrency(8, cooldown=10)
+    ctl.on_throttle()
+    ctl.on_throttle()  # same window: ignored
+    assert ctl.limit == 4
+    assert ctl.throttled == 2
+    for _ in range(8):
+        ctl.on_success()
+    assert 5 < ctl.limit < 6
+
+
+def test_aimd_caps_in_flight_calls():
+    ctl = AdaptiveConcurrency(2)
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal peak
+        ctl.acquire()
+        with lock:
+            peak = max(peak, ctl.in_flight)
+        time.sleep(0.01)
+        ctl.release()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak <= 2
+
+
+def test_limiter_avoids_429_storm_against_quota():
+    records = [{"name": f"p{i}"} for i in range(30)]
+
+    unlimited = _make_agent(batch_retries=0, max_records_per_request=1)
+    quota = QuotaBackend(limit=10, window=0.5)
+    unlimited._call_model = quota  # type: ignore[attr-defined]
+    unlimited.process_records(records, concurrency=8)
+    assert quota.rejected > 0
+
+    # quota is 20 rps over a 0.5 s window; a bucket admits burst + rate * window,
+    # so run at 16 rps with a 0.1 s burst to stay under it
+    limited = _make_agent(
+        batch_retries=0, max_records_per_request=1, rpm=16 * 60, adaptive_concurrency=4
+    )
+    limited.rate_limiter = RateLimiter(rpm=16 * 60, burst_seconds=0.1)
+    quota = QuotaBackend(limit=10, window=0.5)
+    limited._call_model = quota  # type: ignore[attr-defined]
+    t0 = time.perf_counter()
+    results = limited.process_records(records, concurrency=8)
+    elapsed = time.perf_counter() - t0
+
+    assert quota.rejected == 0
+    assert all(r.ok for r in results)
+    assert len(records) / elapsed > 12  # sustained throughput near the quota
+
+
+def test_limiter_charges_tpm_budget():
+    limiter = RateLimiter(tpm=600)  # 10 tokens/s, burst of 10
+    limiter.acquire(10)
+    t0 = time.perf_counter()
+    limiter.acquire(5)
+    assert time.perf_counter() - t0 >= 0.4
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from profile_summarizer.record_store import RecordStore
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+ROWS = [
+    {"first_name": "Layla", "age": 28, "company": "FinTechX"},
+    {"first_name": "Kai", "age": 34, "pronouns": "they/them"},
+    {"first_name": "María", "hobbies": ["cycling", "salsa"]},
+]
+
+
+def test_roundtrip_with_sparse_columns():
+    store = RecordStore(ROWS)
+    assert len(store) == 3
+    assert list(store) == ROWS
+    assert store == ROWS
+    assert [store[i] for i in range(3)] == ROWS
+    assert store[-1] == ROWS[-1]
+    assert store[1:] == ROWS[1:]
+    assert store.columns == ["first_name", "age", "company", "pronouns", "hobbies"]
+
+
+def test_dense_columns_have_no_mask_and_keys_are_interned():
+    store = RecordStore()
+    for i in range(3):
+        store.append({"".join(["first", "_name"]): f"p{i}", "age": i})
+    assert all(col.mask is None for col in store._columns.values())
+    assert store._columns["age"].values == [0, 1, 2]
+    key = next(iter(store[0]))
+    assert key is next(iter(store[2]))
+
+
+def test_dense_and_keyless_rows_iterate_back():
+    dense = [{"first_name": f"p{i}", "age": i} for i in range(3)]
+    assert list(RecordStore(dense)) == dense
+    assert list(RecordStore([{}, {}])) == [{}, {}]
+
+
+def test_index_errors_and_clear():
+    store = RecordStore(ROWS)
+    with pytest.raises(IndexError):
+        store[3]
+    store.clear()
+    assert store == [] and len(store) == 0 and not store
+
+
+def test_agent_queue_is_record_store():
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    agent = ProfileSummarizerAgent(temp=0.0, model_name="m", prompt="p")
+    for rec in ROWS:
+        agent.append_input(rec)
+    assert isinstance(agent.inputs, RecordStore)
+    assert agent._build_prompt_body() == agent._build_prompt_body(ROWS)
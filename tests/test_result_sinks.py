@@ -0,0 +1,123 @@
+import csv
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from profile_summarizer.result_sinks import CSVSink, NDJSONSink, SQLiteSink, open_sink
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+ROWS = [
+    {"id": f"u{i}", "index": i, "summary": f"Person {i}, \"quoted\"\nline", "error": None}
+    for i in range(5)
+]
+
+
+def _read(path: Path):
+    if path.suffix == ".ndjson":
+        return [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    if path.suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as fh:
+            return list(csv.DictReader(fh))
+    con = sqlite3.connect(path)
+    try:
+        return con.execute("SELECT id, idx, summary, error FROM results ORDER BY idx").fetchall()
+    finally:
+        con.close()
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.csv", "out.db"])
+def test_sinks_flush_in_batches(tmp_path: Path, name):
+    path = tmp_path / name
+    sink = open_sink(path, batch_size=2)
+    for row in ROWS[:3]:
+        sink.write(row)
+    assert sink.written == 2 and len(_read(path)) == 2  # third row still buffered
+    sink.close()
+    assert len(_read(path)) == 3
+
+    with open_sink(path, batch_size=10) as sink:
+        for row in ROWS:
+            sink.write(row)
+    rows = _read(path)
+    assert len(rows) == 5
+    if name.endswith(".csv"):
+        assert rows[0]["summary"] == ROWS[0]["summary"] and rows[0]["error"] == ""
+    elif name.endswith(".db"):
+        assert rows[4] == ("u4", 4, ROWS[4]["summary"], None)
+    else:
+        assert rows == ROWS
+
+
+def test_append_mode_and_bad_options(tmp_path: Path):
+    path = tmp_path / "out.csv"
+    with CSVSink(path) as sink:
+        sink.write(ROWS[0])
+    with CSVSink(path, append=True) as sink:
+        sink.write(ROWS[1])
+    assert [r["id"] for r in _read(path)] == ["u0", "u1"]
+
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "out.parquet")
+    with pytest.raises(ValueError):
+        SQLiteSink(tmp_path / "x.db", table="bad name")
+    sink = NDJSONSink(tmp_path / "y.ndjson")
+    sink.close()
+    with pytest.raises(ValueError):
+        sink.write(ROWS[0])
+
+
+def _agent(**kw) -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake", **kw
+    )
+
+
+def test_process_to_sink_streams_lazily(tmp_path: Path):
+    pulled = []
+
+    def records():
+        for i in range(40):
+            pulled.append(i)
+            yield {"id": f"user-{i}", "first_name": f"P{i}"}
+
+    sink = NDJSONSink(tmp_path / "out.ndjson", batch_size=1)
+    agent = _agent(max_records_per_request=4)
+    writes_seen = []
+    write = sink.write
+    sink.write = lambda row: (writes_seen.append(len(pulled)), write(row))  # type: ignore
+
+    counts = agent.process_to_sink(records(), sink, concurrency=2)
+    sink.close()
+
+    assert counts == {"written": 40, "failed": 0}
+    assert writes_seen[0] < 40  # first rows landed before the input was drained
+    rows = _read(tmp_path / "out.ndjson")
+    assert sorted(r["index"] for r in rows) == list(range(40))
+    assert all(r["id"] == f"user-{r['index']}" and r["summary"].startswith(f"P{r['index']}")
+               for r in rows)
+
+
+def test_process_to_sink_records_failures(tmp_path: Path):
+    agent = _agent(batch_retries=0)
+
+    def boom(block: str) -> str:
+        raise RuntimeError("down")
+
+    agent._call_model = boom  # type: ignore[method-assign]
+    with SQLiteSink(tmp_path / "out.db") as sink:
+        counts = agent.process_to_sink([{"first_name": "A"}], sink, id_field=None)
+    assert counts == {"written": 1, "failed": 1}
+    (row,) = _read(tmp_path / "out.db")
+    assert row[0] == "0" and row[2] is None and "down" in row[3]
+
+
+def test_sqlite_sink_keeps_rows_with_repeated_ids(tmp_path: Path):
+    path = tmp_path / "out.db"
+    with SQLiteSink(path) as sink:
+        sink.write({"id": "dup", "index": 0, "summary": "first", "error": None})
+        sink.write({"id": "dup", "index": 1, "summary": "second", "error": None})
+    with SQLiteSink(path) as sink:  # a rerun overwrites by index
+        sink.write({"id": "dup", "index": 1, "summary": "again", "error": None})
+    assert [r[2] for r in _read(path)] == ["first", "again"]
@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+import pytest
+
+from profile_summarizer.model_backends import FakeBackend, StreamingBackend
+from profile_summarizer.rate_control import Backoff, DeadlineExceeded, RateLimitError
+from profile_summarizer.summary_cache import ResponseCache
+from profile_summarizer_agent import ProfileSummarizerAgent, ScaffoldStripper, strip_scaffold
+
+LONG = "Layla is a 28-year-old product designer in Lisbon who enjoys climbing and film photography."
+
+TEXTS = [
+    "Already clean text.",
+    "Header\nSummary: keep?\nNoise\nSUMMARY:\nThis is final.",
+    "User Attributes: Preamble only, no summary.",
+    f"P\n\nUser attributes:\nname: Layla\n\nSummary: {LONG}",
+    f"  {LONG}\n\n",
+    f"Summary:\n\n{LONG}  {LONG}  ",
+    "",
+]
+
+
+def _feed(text: str, size: int, holdback: int = 64) -> str:
+    stripper = ScaffoldStripper(holdback)
+    out = [stripper.feed(text[i:i + size]) for i in range(0, len(text), size)]
+    return "".join(out) + stripper.close()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_stripper_matches_batch_rules(text, size):
+    assert _feed(text, size) == strip_scaffold(text)
+
+
+def test_stripper_releases_early_and_drops_late_markers():
+    stripper = ScaffoldStripper(holdback=10)
+    assert stripper.feed("User attributes:\nname: x\n\nSumm") == ""
+    assert stripper.feed("ary: ") == ""
+    first = stripper.feed("Layla designs products")
+    assert first.startswith("Layla designs")
+    rest = stripper.feed(" in Lisbon. Summ") + stripper.feed("ary: More.") + stripper.close()
+    assert first + rest == "Layla designs products in Lisbon. More."
+
+
+RECORDS = [
+    {"first_name": f"P{i}", "role": "designer", "city": "Lisbon", "hobby": "climbing"}
+    for i in range(6)
+]
+
+
+def _agent(**backend_options) -> ProfileSummarizerAgent:
+    agent = ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.",
+        backend="fake", backend_options=backend_options,
+    )
+    for rec in RECORDS:
+        agent.append_input(rec)
+    return agent
+
+
+def test_fake_backend_streams_the_same_text():
+    fb = FakeBackend(stream_chunk_chars=5)
+    assert isinstance(fb, StreamingBackend)
+    prompt = "P\n\nUser attributes:\nfirst_name: Kai\nrole: PM\n\nSummary:"
+    chunks = list(fb.stream(prompt, temperature=0))
+    assert len(chunks) > 1 and "".join(chunks) == fb.generate(prompt, temperature=0)
+
+
+def test_process_stream_matches_process_with_lower_ttft():
+    expected = _agent().process()
+
+    agent = _agent(latency=0.4, stream_chunk_chars=8)
+    t0 = time.perf_counter()
+    pieces, first = [], None
+    for piece in agent.process_stream():
+        first = first if first is not None else time.perf_counter() - t0
+        pieces.append(piece)
+    total = time.perf_counter() - t0
+
+    assert "".join(pieces) == expected == agent.final_result()
+    assert len(pieces) > 1 and first < total / 3
+    assert not agent.inputs
+
+
+def test_aprocess_stream_and_groups():
+    agent = _agent(stream_chunk_chars=4)
+    agent.max_records_per_request = 2
+    expected = _agent().process()
+
+    async def collect():
+        return [p async for p in agent.aprocess_stream()]
+
+    assert "".join(asyncio.run(collect())) == expected
+
+
+def test_stubbed_call_model_and_cache():
+    agent = _agent()
+    agent._call_model = lambda block: "User attributes:\n...\n\nSummary: stubbed"
+    assert list(agent.process_stream()) == ["stubbed"]
+
+    cache = ResponseCache()
+    agent = _agent(stream_chunk_chars=4)
+    agent.cache = cache
+    first = "".join(agent.process_stream())
+    calls = agent._backend.calls
+    for rec in RECORDS:
+        agent.append_input(rec)
+    assert "".join(agent.process_stream()) == first
+    assert agent._backend.calls == calls and cache.hits == 1
+
+
+def test_stream_retries_only_before_first_piece():
+    agent = _agent(stream_chunk_chars=4)
+    real = agent._backend.stream
+    state = {"calls": 0}
+
+    def flaky(prompt, *, temperature):
+        state["calls"] += 1
+        if state["calls"] == 1:
+            raise ConnectionError("connection reset")
+        yield from real(prompt, temperature=temperature)
+
+    agent._backend.stream = flaky
+    assert "".join(agent.process_stream()) == _agent().process()
+    assert state["calls"] == 2
+
+
+def _stalling(agent, stall_after):
+    real = agent._backend.stream
+
+    def stream(prompt, *, temperature):
+        for i, chunk in enumerate(real(prompt, temperature=temperature)):
+            if i == stall_after:
+                time.sleep(1.0)
+            yield chunk
+
+    agent._backend.stream = stream
+
+
+def test_stalled_stream_hits_the_deadline():
+    agent = _agent(stream_chunk_chars=4)
+    agent.request_timeout, agent.batch_retries = 0.1, 0
+    _stalling(agent, stall_after=3)
+    t0 = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        "".join(agent.process_stream())
+    assert time.perf_counter() - t0 < 0.5
+
+    agent = _agent(stream_chunk_chars=4, latency=0.3)  # slow overall, steady chunks
+    agent.request_timeout = 0.1
+    assert "".join(agent.process_stream()) == _agent().process()
+
+    async def collect():
+        agent = _agent(stream_chunk_chars=4)
+        agent.request_timeout, agent.batch_retries = 0.1, 0
+        real = agent._backend.astream
+
+        async def stall(prompt, *, temperature):
+            async for chunk in real(prompt, temperature=temperature):
+                yield chunk
+                await asyncio.sleep(1.0)
+
+        agent._backend.astream = stall
+        return [p async for p in agent.aprocess_stream()]
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(collect())
+
+
+def test_stream_backs_off_on_transient_errors():
+    agent = _agent(stream_chunk_chars=4)
+    agent.backoff, agent.batch_retries = Backoff(retries=3, base=0.001, seed=1), 0
+    real = agent._backend.stream
+    state = {"calls": 0}
+
+    def throttled(prompt, *, temperature):
+        state["calls"] += 1
+        if state["calls"] <= 2:
+            raise RateLimitError("429")
+        yield from real(prompt, temperature=temperature)
+
+    agent._backend.stream = throttled
+    assert "".join(agent.process_stream()) == _agent().process()
+    assert state["calls"] == 3
@@ -0,0 +1,107 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from profile_summarizer_agent import (
+    ProfileSummarizerAgent,
+    iter_profiles_from_json,
+    iter_profiles_from_ndjson,
+)
+
+
+def _make_agent(**kw):
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    return ProfileSummarizerAgent(
+        temp=0.0,
+        model_name="models/gemini-1.5-flash-latest",
+        prompt="Summarise attributes.",
+        **kw,
+    )
+
+
+RECORDS = [
+    {"First_Name": " Layla ", "Hobbies": [" a ", "b "], "age": 28},
+    {"first_name": "Kai", "bio": "likes [brackets], {braces} and \"quotes\""},
+    {"first_name": "María", "score": 1234567},
+]
+EXPECTED = [
+    {"first_name": "Layla", "hobbies": ["a", "b"], "age": 28},
+    {"first_name": "Kai", "bio": "likes [brackets], {braces} and \"quotes\""},
+    {"first_name": "María", "score": 1234567},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_iter_json_array_across_chunk_boundaries(tmp_path: Path, chunk_size):
+    p = tmp_path / "arr.json"
+    p.write_text(json.dumps(RECORDS, indent=2, ensure_ascii=False), encoding="utf-8")
+    assert list(iter_profiles_from_json(p, chunk_size=chunk_size)) == EXPECTED
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 16])
+def test_iter_json_handles_ndjson_and_single_dict(tmp_path: Path, chunk_size):
+    nd = tmp_path / "recs.ndjson"
+    nd.write_text("\n".join(json.dumps(r) for r in RECORDS) + "\n", encoding="utf-8")
+    assert list(iter_profiles_from_json(nd, chunk_size=chunk_size)) == EXPECTED
+    assert list(iter_profiles_from_ndjson(nd)) == EXPECTED
+
+    single = tmp_path / "one.json"
+    single.write_text(json.dumps(RECORDS[0]), encoding="utf-8")
+    assert list(iter_profiles_from_json(single, chunk_size=chunk_size)) == EXPECTED[:1]
+
+
+def test_iter_json_empty_list_and_errors(tmp_path: Path):
+    p = tmp_path / "empty.json"
+    p.write_text(" [ ] ", encoding="utf-8")
+    assert list(iter_profiles_from_json(p)) == []
+
+    p.write_text('[{"a": 1} {"b": 2}]', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_profiles_from_json(p))
+
+    p.write_text('{"a": 1}\n[1, 2]\n', encoding="utf-8")
+    with pytest.raises(TypeError):
+        list(iter_profiles_from_json(p))
+
+    p.write_text('{"a": 1}\n\n"nope"\n', encoding="utf-8")
+    with pytest.raises(TypeError, match="Line 3"):
+        list(iter_profiles_from_ndjson(p))
+
+
+def test_append_input_from_ndjson(tmp_path: Path):
+    agent = _make_agent()
+    p = tmp_path / "recs.ndjson"
+    p.write_text("\n".join(json.dumps(r) for r in RECORDS), encoding="utf-8")
+    agent.append_input_from_ndjson(p, lower_keys=False)
+    assert agent.inputs[0]["First_Name"] == "Layla"
+    assert len(agent.inputs) == 3
+
+
+def test_batch_pipeline_consumes_stream_lazily(tmp_path: Path):
+    p = tmp_path / "many.ndjson"
+    p.write_text(
+        "\n".join(json.dumps({"name": f"p{i}"}) for i in range(50)), encoding="utf-8"
+    )
+    pulled = 0
+
+    def counting():
+        nonlocal pulled
+        for rec in iter_profiles_from_json(p, chunk_size=32):
+            pulled += 1
+            yield rec
+
+    seen = []
+
+    def fake(block):
+        seen.append(pulled)
+        return block.split(": ", 1)[1]
+
+    agent = _make_agent(max_records_per_request=1)
+    agent._call_model = fake  # type: ignore[attr-defined]
+    results = agent.process_records(counting(), concurrency=2)
+
+    assert [r.summary for r in results] == [f"p{i}" for i in range(50)]
+    # never more than a couple of records read ahead of the in-flight calls
+    assert all(n - i <= 4 for i, n in enumerate(seen))
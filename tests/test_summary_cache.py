@@ -0,0 +1,117 @@
+import os
+import time
+from pathlib import Path
+
+from profile_summarizer.summary_cache import ResponseCache
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def _make_agent(**kw):
+    os.environ.setdefault("GEMINI_API_KEY", "test-key")
+    return ProfileSummarizerAgent(
+        temp=0.0,
+        model_name="models/gemini-1.5-flash-latest",
+        prompt="Summarise attributes.",
+        **kw,
+    )
+
+
+def test_key_depends_on_every_component():
+    base = ResponseCache.make_key("m", 0.1, "p", "a: 1")
+    assert base == ResponseCache.make_key("m", 0.1, "p", "a: 1")
+    assert base != ResponseCache.make_key("m2", 0.1, "p", "a: 1")
+    assert base != ResponseCache.make_key("m", 0.2, "p", "a: 1")
+    assert base != ResponseCache.make_key("m", 0.1, "p2", "a: 1")
+    assert base != ResponseCache.make_key("m", 0.1, "p", "a: 2")
+
+
+def test_memory_lru_eviction_and_counters():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"      # a is now most recent
+    cache.set("c", "C")               # evicts b
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    cache = ResponseCache(ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.set("k", "v")
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("k") is None
+    assert cache.purge_expired() == 0  # already dropped on read
+
+
+def test_sqlite_backing_persists_and_trims(tmp_path: Path):
+    db = tmp_path / "cache.sqlite"
+    cache = ResponseCache(db, max_entries=1, max_disk_entries=2)
+    for k in "abc":
+        cache.set(k, k.upper())
+    assert len(cache) == 2
+    cache.close()
+
+    reopened = ResponseCache(db)
+    assert reopened.get("a") is None       # trimmed as least recently used
+    assert reopened.get("c") == "C"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_agent_cache_hit_skips_model(tmp_path: Path):
+    agent = _make_agent(cache=str(tmp_path / "c.sqlite"))
+    calls = []
+
+    def fake(block):
+        calls.append(block)
+        return "Summary: Layla rocks."
+
+    agent._call_model = fake  # type: ignore[attr-defined]
+    for _ in range(3):
+        agent.append_input({"first_name": "Layla"})
+        assert agent.process() == "Layla rocks."
+
+    assert len(calls) == 1
+    assert agent.cache.stats()["hits"] == 2
+
+
+def test_cache_key_changes_with_prompt():
+    agent = _make_agent(cache=ResponseCache())
+    calls = []
+    agent._call_model = lambda b: calls.append(b) or "x"  # type: ignore[attr-defined]
+    agent.append_input({"a": 1})
+    agent.process()
+    agent.base_prompt = "Different prompt"
+    agent.append_input({"a": 1})
+    agent.process()
+    assert len(calls) == 2
+
+
+def test_unsplittable_response_is_retried_and_not_cached():
+    cache = ResponseCache()
+    agent = _make_agent(cache=cache, max_records_per_request=2, batch_retries=2)
+    calls = []
+    agent._call_model = lambda b: calls.append(b) or "One paragraph."  # type: ignore[attr-defined]
+    results = agent.process_records([{"name": "A"}, {"name": "B"}])
+    assert [r.ok for r in results] == [False, False]
+    assert len(calls) == 3 and len(cache) == 0
+
+    agent._call_model = lambda b: calls.append(b) or "A.\n\nB."  # type: ignore[attr-defined]
+    results = agent.process_records([{"name": "A"}, {"name": "B"}])
+    assert [r.summary for r in results] == ["A.", "B."]
+    assert len(calls) == 4 and len(cache) == 1
+
+
+def test_retry_bypasses_a_stale_cached_response():
+    cache = ResponseCache()
+    agent = _make_agent(cache=cache, max_records_per_request=2, batch_retries=1)
+    block = agent._build_prompt_body([{"name": "A"}, {"name": "B"}])
+    cache.set(agent._cache_key(block), "Stale single paragraph.")
+    agent._call_model = lambda b: "A.\n\nB."  # type: ignore[attr-defined]
+    results = agent.process_records([{"name": "A"}, {"name": "B"}])
+    assert [r.summary for r in results] == ["A.", "B."]
+    assert cache.get(agent._cache_key(block)) == "A.\n\nB."
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+
+from profile_summarizer.summary_server import RequestCoalescer, SummaryServer
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+
+def _agent(**backend_options) -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.",
+        backend="fake", backend_options=backend_options, batch_retries=0,
+    )
+
+
+async def _request(port: int, method: str, path: str, body: bytes = b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: t\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+def test_coalescer_batches_concurrent_requests():
+    async def main():
+        agent = _agent(latency=0.01)
+        co = RequestCoalescer(agent, max_wait_ms=20, max_batch=4)
+        names = [f"P{i}" for i in range(10)]
+        out = await asyncio.gather(*(co.submit({"first_name": n}) for n in names))
+        return co, out
+
+    co, out = asyncio.run(main())
+    assert [s.split()[0].strip(",.") for s in out] == [f"P{i}" for i in range(10)]
+    assert co.stats()["upstream_calls"] == 3  # 4 + 4 + 2 (window flush)
+    assert co.stats()["requests"] == 10
+
+
+def test_lone_request_waits_at_most_the_window():
+    async def main():
+        co = RequestCoalescer(_agent(), max_wait_ms=30, max_batch=16)
+        t0 = time.perf_counter()
+        await co.submit({"first_name": "Solo"})
+        return time.perf_counter() - t0
+
+    assert 0.025 <= asyncio.run(main()) < 0.5
+
+
+def test_http_round_trip_and_errors():
+    async def main():
+        async with SummaryServer(_agent(latency=0.01), port=0, max_wait_ms=10) as server:
+            port = server.port
+            bodies = [json.dumps({" First_Name ": f" U{i} "}).encode() for i in range(6)]
+            ok = await asyncio.gather(*(_request(port, "POST", "/summarize", b) for b in bodies))
+            bad = await _request(port, "POST", "/summarize", b"{nope")
+            not_obj = await _request(port, "POST", "/summarize", b"[1]")
+            wrong = await _request(port, "GET", "/summarize")
+            missing = await _request(port, "GET", "/nowhere")
+            stats = await _request(port, "GET", "/stats")
+            return ok, bad, not_obj, wrong, missing, stats
+
+    ok, bad, not_obj, wrong, missing, stats = asyncio.run(main())
+    assert [s for s, _ in ok] == [200] * 6
+    assert [json.loads(p)["summary"].split()[0].strip(",.") for _, p in ok] == [
+        f"U{i}" for i in range(6)
+    ]
+    assert (bad[0], not_obj[0], wrong[0], missing[0]) == (400, 400, 405, 404)
+    co = json.loads(stats[1])["coalescer"]
+    assert co["requests"] == 6 and co["upstream_calls"] < 6
+
+
+def test_model_failure_is_502_for_the_whole_group():
+    async def main():
+        async with SummaryServer(_agent(error_rate=1.0), port=0, max_wait_ms=10) as server:
+            return await asyncio.gather(*(
+                _request(server.port, "POST", "/summarize", json.dumps({"name": n}).encode())
+                for n in "ab"
+            )), server.coalescer.stats()
+
+    responses, stats = asyncio.run(main())
+    assert [s for s, _ in responses] == [502, 502]
+    assert stats["failed"] == 2 and stats["upstream_calls"] == 1
+
+
+def test_planning_error_fails_waiting_requests_instead_of_hanging():
+    async def main():
+        agent = _agent()
+        agent.max_prompt_tokens = 2  # smaller than the prompt scaffold: planning raises
+        co = RequestCoalescer(agent, max_wait_ms=5)
+        return await asyncio.wait_for(
+            asyncio.gather(co.submit({"first_name": "Ana"}), return_exceptions=True), 1.0
+        ), co
+
+    (err,), co = asyncio.run(main())
+    assert isinstance(err, ValueError) and "max_prompt_tokens" in str(err)
+    assert co.stats()["failed"] == 1
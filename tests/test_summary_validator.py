@@ -0,0 +1,107 @@
+import re
+
+import pytest
+
+from profile_summarizer.metrics import Metrics
+from profile_summarizer.summary_validator import SummaryValidator
+from profile_summarizer_agent import (
+    ProfileSummarizerAgent,
+    ScaffoldStripper,
+    SummarySplitError,
+    strip_scaffold,
+)
+
+RECORDS = [{"first_name": n, "role": "engineer"} for n in ("Ana", "Ben", "Cy", "Dee")]
+
+
+def _agent(**kw) -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake", **kw
+    )
+
+
+def test_summary_marker_tolerates_space_before_colon():
+    assert strip_scaffold("echo\nSUMMARY :  Ana builds things.") == "Ana builds things."
+    stripper = ScaffoldStripper(holdback=4)
+    chunks = ["User attributes:\nx\n", "Summ", "ary", " ", ": Ana builds", " things."]
+    out = "".join(stripper.feed(c) for c in chunks) + stripper.close()
+    assert out == "Ana builds things."
+
+
+def test_rules_derived_from_record():
+    v = SummaryValidator(max_chars=40)
+    rec = {"first_name": "Ana María", "role": "engineer"}
+    assert v.check("Ana is a friendly engineer.", rec) == []
+    assert v.check("  ", rec) == ["empty"]
+    assert v.check("She is an engineer.", rec) == ["does not start with 'Ana'"]
+    assert v.check("Ana\nrole: engineer", rec) == ["echoes attribute 'role'"]
+    assert v.check("Ana " + "x" * 50, rec) == ["54 chars > 40"]
+    assert v.check("Ana one.\n\nAna two.", rec) == ["more than one paragraph"]
+
+
+def test_check_response_aligns_by_name_when_count_is_off():
+    v = SummaryValidator()
+    verdicts = v.check_response("Ana codes.\n\nCy paints.\n\nDee runs.", RECORDS)
+    assert verdicts == [
+        ("Ana codes.", []), (None, ["missing"]), ("Cy paints.", []), ("Dee runs.", []),
+    ]
+
+
+def _stub(agent, bad_first: set):
+    """Model stub: one paragraph per record; names in `bad_first` go wrong once."""
+    prompts = []
+
+    def call(block):
+        prompts.append(block)
+        names = re.findall(r"first_name: (\w+)", block)
+        paras = []
+        for n in names:
+            if n in bad_first:
+                bad_first.discard(n)
+                paras.append("Someone " + "very " * 40 + "long.")
+            else:
+                paras.append(f"{n} is an engineer.")
+        return "Summary: " + "\n\n".join(paras)
+
+    agent._call_model = call
+    return prompts
+
+
+def test_only_failing_records_are_rerequested():
+    m = Metrics()
+    agent = _agent(validator=SummaryValidator(), max_records_per_request=4, metrics=m)
+    prompts = _stub(agent, {"Ben", "Dee"})
+    results = agent.process_records(RECORDS, concurrency=1)
+
+    assert [r.summary for r in results] == [f"{n} is an engineer." for n in ("Ana", "Ben", "Cy", "Dee")]
+    assert len(prompts) == 2
+    assert re.findall(r"first_name: (\w+)", prompts[1]) == ["Ben", "Dee"]
+    assert m.counters["validation_failures"] == 2 and m.counters["retries"] == 1
+
+
+def test_retry_budget_keeps_best_effort_and_fails_missing():
+    agent = _agent(validator=SummaryValidator(), max_records_per_request=4, batch_retries=0)
+    _stub(agent, {"Ben"})
+    results = agent.process_records(RECORDS, concurrency=1)
+    assert all(r.ok for r in results)
+    assert results[1].summary.startswith("Someone")  # invalid, but out of retries
+    assert results[1].violations and not results[0].violations
+
+    agent = _agent(validator=SummaryValidator(), max_records_per_request=4, batch_retries=1)
+    agent._call_model = lambda block: "Ana is an engineer."
+    results = agent.process_records(RECORDS, concurrency=1)
+    assert [r.ok for r in results] == [True, False, False, False]
+    assert results[0].summary == "Ana is an engineer."
+
+
+def test_process_validates_summaries():
+    agent = _agent(validator=SummaryValidator(max_chars=5), batch_retries=1)
+    prompts = _stub(agent, set())
+    agent.append_input(RECORDS[0])
+    assert agent.process() == "Ana is an engineer."  # kept after the retry, but checked
+    assert len(prompts) == 2
+
+    agent._call_model = lambda block: "Summary:"  # nothing usable, even after the retry
+    agent.append_input(RECORDS[0])
+    with pytest.raises(SummarySplitError):
+        agent.process()
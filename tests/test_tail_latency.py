@@ -0,0 +1,195 @@
+import asyncio
+import time
+
+import pytest
+
+from profile_summarizer.metrics import Metrics
+from profile_summarizer.rate_control import (
+    Backoff, DeadlineExceeded, HedgePolicy, RateLimiter, RateLimitError, is_transient_error,
+)
+from profile_summarizer_agent import ProfileSummarizerAgent
+
+RECORDS = [{"first_name": f"P{i}"} for i in range(15)]
+# seed 0: two of these prompts draw a 0.4 s tail on the first call, none on the second
+HEAVY_TAIL = dict(latency=0.01, tail_prob=0.2, tail_latency=0.4, seed=0)
+
+
+def _agent(backend_options=None, **kw) -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.",
+        backend="fake", backend_options=backend_options or {}, **kw,
+    )
+
+
+def test_backoff_is_bounded_jittered_and_seeded():
+    a = Backoff(base=0.1, factor=2, max_delay=0.3, seed=7)
+    b = Backoff(base=0.1, factor=2, max_delay=0.3, seed=7)
+    delays = [a.delay(n) for n in range(6)]
+    assert delays == [b.delay(n) for n in range(6)]
+    assert all(0 <= d <= min(0.3, 0.1 * 2 ** n) for n, d in enumerate(delays))
+    assert is_transient_error(RateLimitError()) and is_transient_error(TimeoutError())
+    assert not is_transient_error(ValueError())
+
+
+def test_hedge_policy_threshold():
+    policy = HedgePolicy(0.9, min_samples=10, initial_delay=0.2, min_delay=0.01)
+    assert policy.delay() == 0.2
+    for i in range(10):
+        policy.record(i / 100)
+    assert policy.delay() == 0.09
+    with pytest.raises(ValueError):
+        HedgePolicy(1.5)
+
+
+def _latencies(agent: ProfileSummarizerAgent):
+    out = []
+    for rec in RECORDS:
+        agent.append_input(rec)
+        t0 = time.perf_counter()
+        agent.process()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def test_hedging_cuts_the_tail_of_a_heavy_tailed_backend():
+    plain = _latencies(_agent(HEAVY_TAIL))
+    m = Metrics()
+    hedged_agent = _agent(HEAVY_TAIL, hedge=HedgePolicy(initial_delay=0.05), metrics=m)
+    hedged = _latencies(hedged_agent)
+
+    assert max(plain) >= 0.4
+    assert max(hedged) < 0.25
+    assert m.counters["hedges"] == 2
+
+
+def test_async_hedging_matches_results():
+    async def run(agent):
+        t0 = time.perf_counter()
+        res = await agent.aprocess_many(RECORDS, concurrency=15)
+        return [r.summary for r in res], time.perf_counter() - t0
+
+    plain, slow = asyncio.run(run(_agent(HEAVY_TAIL)))
+    hedged, fast = asyncio.run(run(_agent(HEAVY_TAIL, hedge=HedgePolicy(initial_delay=0.05))))
+    assert plain == hedged
+    assert slow >= 0.4 and fast < 0.25
+
+
+def test_deadline_and_backoff():
+    agent = _agent(request_timeout=0.05)
+    agent._call_model = lambda block: time.sleep(0.5) or "late"
+    agent.append_input({"first_name": "Ana"})
+    agent.batch_retries = 0
+    t0 = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        agent.process()
+    assert time.perf_counter() - t0 < 0.3
+
+    calls = []
+
+    def flaky(block):
+        calls.append(block)
+        if len(calls) < 3:
+            raise RateLimitError("429")
+        return "Summary: ok"
+
+    m = Metrics()
+    agent = _agent(backoff=Backoff(retries=3, base=0.001, seed=1), metrics=m, batch_retries=0)
+    agent._call_model = flaky
+    agent.append_input({"first_name": "Ana"})
+    assert agent.process() == "ok" and m.counters["backoff_retries"] == 2
+
+    def buggy(block):
+        raise KeyError("bug")
+
+    agent._call_model = buggy
+    agent.append_input({"first_name": "Ana"})
+    with pytest.raises(KeyError):
+        agent.process()
+    assert m.counters["backoff_retries"] == 2
+
+
+def test_async_deadline():
+    agent = _agent({"latency": 0.5}, request_timeout=0.05, batch_retries=0)
+    res = asyncio.run(agent.aprocess_many([{"first_name": "Ana"}]))
+    assert isinstance(res[0].error, DeadlineExceeded)
+
+
+def test_further_hedges_are_spaced_by_the_threshold():
+    agent = _agent(
+        hedge=HedgePolicy(initial_delay=0.05, max_hedges=3), request_timeout=0.3,
+        batch_retries=0,
+    )
+    starts = []
+    agent._call_model = lambda block: starts.append(time.monotonic()) or time.sleep(0.5)
+    agent.append_input({"first_name": "Ana"})
+    with pytest.raises(DeadlineExceeded):
+        agent.process()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 4 and all(0.04 < g < 0.09 for g in gaps)
+
+
+def test_close_releases_the_hedge_pool():
+    with _agent(request_timeout=0.02, batch_retries=0) as agent:
+        agent._call_model = lambda block: time.sleep(0.2) or "late"
+        agent.append_input({"first_name": "Ana"})
+        with pytest.raises(DeadlineExceeded):
+            agent.process()
+        pool = agent._hedge_pool
+        assert pool is not None
+    assert agent._hedge_pool is None and pool._shutdown
+
+
+def test_hedges_and_backoff_retries_stay_within_rpm():
+    # 600 rpm with a 0.1 s burst: one request up front, then one every 0.1 s
+    agent = _agent(
+        hedge=HedgePolicy(initial_delay=0.01, max_hedges=3),
+        backoff=Backoff(retries=5, base=0.001, seed=1),
+        adaptive_concurrency=4, batch_retries=0, metrics=Metrics(),
+    )
+    granted, sent = [], []
+
+    class Recording(RateLimiter):
+        # budget is taken before a call reaches its worker thread, so time the grants
+        def acquire(self, tokens=0):
+            super().acquire(tokens)
+            granted.append(time.monotonic())
+
+        def try_acquire(self, tokens=0):
+            ok = super().try_acquire(tokens)
+            if ok:
+                granted.append(time.monotonic())
+            return ok
+
+    agent.rate_limiter = Recording(rpm=600, burst_seconds=0.1)
+
+    def flaky(block):
+        sent.append(time.monotonic())
+        if len(sent) <= 3:
+            raise RateLimitError("429")
+        time.sleep(0.05)
+        return "Summary: ok"
+
+    agent._call_model = flaky
+    agent.append_input({"first_name": "Ana"})
+    t0 = time.monotonic()
+    assert agent.process() == "ok"
+    elapsed = time.monotonic() - t0
+    assert len(sent) <= 1 + 10 * elapsed  # never ahead of the bucket
+    assert len(granted) == len(sent)
+    assert all(b - a > 0.08 for a, b in zip(granted, granted[1:])), [b - a for a, b in zip(sent, sent[1:])]
+    ctl = agent.concurrency_controller
+    assert ctl.throttled == 3 and ctl.limit < 4  # backoff-handled 429s reach AIMD
+    assert agent.metrics.counters["hedges_skipped"] >= 1
+
+
+def test_hedges_take_no_budget_they_cannot_get():
+    agent = _agent(
+        hedge=HedgePolicy(initial_delay=0.01, max_hedges=3), rpm=6, batch_retries=0,
+        metrics=Metrics(),
+    )
+    agent._call_model = lambda block: time.sleep(0.1) or "Summary: ok"
+    agent.append_input({"first_name": "Ana"})
+    assert agent.process() == "ok"
+    counters = agent.metrics.counters
+    assert counters["requests"] == 1 and counters["hedges_skipped"] == 3
+    assert "hedges" not in counters
@@ -0,0 +1,107 @@
+from typing import List
+
+import pytest
+
+from profile_summarizer.token_estimator import TokenEstimator, estimate_tokens, fit_record
+from profile_summarizer_agent import ProfileSummarizerAgent, plan_batches
+
+
+def test_heuristic_counts():
+    est = TokenEstimator()
+    assert est.count("") == 0
+    assert est.count("cat") == 1
+    assert est.count("elephant") == 2          # 8 chars / 4
+    assert est.count("hi, there!") == 5        # hi , the|re !
+    assert est.count("日本語") == 3            # 9 UTF-8 bytes / 3
+    assert est.count_many("cat", "cat") == 2
+    assert estimate_tokens("cat", "elephant") == 3
+
+
+def test_counts_are_memoized_and_calibration_resets_cache():
+    est = TokenEstimator()
+    est.count("repeat me")
+    est.count("repeat me")
+    assert est._cached_count.cache_info().hits == 1
+
+    scale = est.calibrate([("elephant", 4), ("cat", 2)])  # raw 3 -> true 6
+    assert scale == pytest.approx(2.0)
+    assert est.count("elephant") == 4
+    with pytest.raises(ValueError):
+        TokenEstimator(scale=0)
+
+
+def test_truncate_respects_budget_and_word_boundary():
+    est = TokenEstimator()
+    text = "alpha beta gamma delta epsilon zeta eta theta"
+    out = est.truncate(text, 6)
+    assert est.count(out) <= 6
+    assert out.endswith("...") and text.startswith(out[:-3])
+    assert out[:-3].split()[-1] in text.split()
+    assert est.truncate("short", 10) == "short"
+
+
+def test_fit_record_drops_low_priority_first():
+    est = TokenEstimator()
+
+    def measure(rec):
+        return est.count_many(*(f"{k}: {v}" for k, v in rec.items()))
+
+    rec = {"first_name": "Ana", "bio": "word " * 40, "city": "Lisbon", "age": 30}
+    assert fit_record(rec, 1000, measure=measure) is rec
+
+    fitted = fit_record(rec, 12, measure=measure, priority=["first_name", "city"])
+    assert "first_name" in fitted and "bio" not in fitted
+    assert measure(fitted) <= 12
+
+    only = fit_record({"bio": "word " * 40}, 10, measure=measure, estimator=est)
+    assert measure(only) <= 10 and only["bio"].endswith("...")
+
+
+def test_plan_batches_token_budget():
+    groups = list(
+        plan_batches(range(6), measure=lambda r: 1, count_tokens=lambda r: 4, max_tokens=9)
+    )
+    assert groups == [[0, 1], [2, 3], [4, 5]]
+
+
+def _agent(**kw) -> ProfileSummarizerAgent:
+    return ProfileSummarizerAgent(
+        temp=0.0, model_name="fake", prompt="Summarise attributes.", backend="fake", **kw
+    )
+
+
+def test_agent_preflight_keeps_every_prompt_within_budget():
+    agent = _agent(max_prompt_tokens=60, attribute_priority=["first_name"])
+    prompts: List[str] = []
+    agent._call_model = lambda block: prompts.append(agent._compose_prompt(block)) or "ok"
+
+    agent.append_input({"first_name": "Ana", "bio": "lorem ipsum " * 200})
+    for i in range(8):
+        agent.append_input({"first_name": f"P{i}", "city": "Porto"})
+    agent.process()
+
+    assert len(prompts) > 1
+    for prompt in prompts:
+        assert agent.token_estimator.count(prompt) <= 60
+    assert "first_name: Ana" in prompts[0]
+
+
+def test_agent_rejects_budget_smaller_than_scaffold():
+    agent = _agent(max_prompt_tokens=2)
+    agent.append_input({"a": "b"})
+    with pytest.raises(ValueError, match="max_prompt_tokens"):
+        agent.process()
+
+
+def test_fit_record_keeps_names_and_drops_longest_by_default():
+    est = TokenEstimator()
+
+    def measure(rec):
+        return est.count_many(*(f"{k}: {v}" for k, v in rec.items()))
+
+    rec = {"first_name": "Layla", "age": 28, "bio": "word " * 30, "city": "Lisbon"}
+    fitted = fit_record(rec, 12, measure=measure)
+    assert fitted["first_name"] == "Layla" and "bio" not in fitted
+
+    only = fit_record(rec, 4, measure=measure)
+    assert list(only) == ["first_name"]